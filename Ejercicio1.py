@@ -1,47 +1,24 @@
+import queue                          # Para recibir el resultado del hilo que procesa archivos
+import threading                      # Para procesar archivos sin congelar la ventana
 import tkinter as tk                   # Importa el módulo principal de Tkinter para interfaces gráficas
-from tkinter import ttk, messagebox    # Importa ttk para widgets modernos y messagebox para mostrar mensajes emergentes
-
-# ---------------------- FUNCIONES DE PROCESAMIENTO DE TEXTO ----------------------
-
-def invertir_palabras(frase):
-    """
-    Invierte el orden de las palabras en la frase.
-    Ejemplo: "Hola mundo bonito" -> "bonito mundo Hola"
-    """
-    palabras = frase.strip().split()   # Elimina espacios y separa la frase en palabras
-    pila = list(palabras)              # Crea una copia de la lista de palabras (simula una pila)
-    resultado = []
-    while pila:                        # Mientras la pila tenga elementos
-        resultado.append(pila.pop())   # Saca la última palabra y la agrega al resultado
-    return ' '.join(resultado)         # Une las palabras invertidas en una sola cadena
-
-def invertir_letras(frase):
-    """
-    Invierte las letras de cada palabra, pero mantiene el orden de las palabras.
-    Ejemplo: "Hola mundo" -> "aloH odnum"
-    """
-    return ' '.join([palabra[::-1] for palabra in frase.strip().split()])
-
-def invertir_completo(frase):
-    """
-    Invierte completamente la frase (letras y palabras).
-    Ejemplo: "Hola mundo" -> "odnum aloH"
-    """
-    palabras = invertir_palabras(frase)  # Invierte el orden de las palabras
-    return palabras[::-1]                # Invierte todos los caracteres de la frase resultante
+from tkinter import ttk, messagebox, filedialog  # ttk para widgets modernos, messagebox para mensajes y filedialog para elegir archivos
+
+# Lógica de procesamiento de texto (no depende de Tkinter)
+from nucleo.texto import (
+    invertir_palabras,
+    invertir_letras,
+    invertir_completo,
+    contar_palabras,
+    ordenar_alfabetico,
+    estadisticas_palabras,
+    formatear_estadisticas,
+    OPERACIONES_ARCHIVO,
+    procesar_archivo,
+)
 
-def contar_palabras(frase):
-    """
-    Cuenta el número de palabras en la frase.
-    """
-    return f"Número de palabras: {len(frase.strip().split())}"
+REVISAR_ARCHIVO_MS = 100   # Cada cuánto mira la interfaz si el hilo terminó con el archivo
 
-def ordenar_alfabetico(frase):
-    """
-    Ordena las palabras de la frase alfabéticamente (ignorando mayúsculas/minúsculas).
-    """
-    palabras = sorted(frase.strip().split(), key=lambda x: x.lower())
-    return ' '.join(palabras)
+avisos_archivo = None      # Cola con el resultado del archivo en proceso (None si no hay ninguno)
 
 # ---------------------- FUNCIÓN PRINCIPAL DE EJECUCIÓN ----------------------
 
@@ -66,76 +43,144 @@ def ejecutar():
         resultado = contar_palabras(frase)
     elif opcion == "Ordenar alfabéticamente":
         resultado = ordenar_alfabetico(frase)
+    elif opcion == "Estadísticas de palabras":
+        resultado = formatear_estadisticas(estadisticas_palabras(frase))
     else:
         resultado = "Opción no válida"
 
     resultado_var.set(resultado)                 # Muestra el resultado en la etiqueta de la interfaz
 
-# ---------------------- CONFIGURACIÓN DE LA INTERFAZ GRÁFICA ----------------------
+def ejecutar_archivo():
+    """
+    Pide un archivo de entrada y otro de salida, aplica la opción seleccionada
+    por bloques en otro hilo y muestra el rendimiento obtenido cuando termina.
+    """
+    global avisos_archivo
+    if avisos_archivo is not None:
+        messagebox.showwarning("Archivo en proceso", "Espera a que termine el archivo que se está procesando.")
+        return
 
-ventana = tk.Tk()                               # Crea la ventana principal
-ventana.title("🌀 Inversor de Frases Avanzado") # Título de la ventana
-ventana.geometry("600x400")                     # Tamaño de la ventana
-ventana.config(bg="#e8f0fe")                    # Color de fondo
-ventana.resizable(False, False)                 # No permite cambiar el tamaño
-
-# Título principal
-ttk.Label(
-    ventana,
-    text="Herramienta de Inversión de Texto",
-    font=("Arial", 16, "bold"),
-    background="#e8f0fe"
-).pack(pady=10)
-
-# Caja de entrada de texto multilínea
-entrada = tk.Text(
-    ventana,
-    font=("Arial", 12),
-    height=4,
-    width=60
-)
-entrada.pack(pady=10)
-
-# Etiqueta para seleccionar opción
-ttk.Label(
-    ventana,
-    text="Seleccione una opción:",
-    background="#e8f0fe"
-).pack()
-
-# Combobox con las opciones de acción
-opciones = ttk.Combobox(
-    ventana,
-    state="readonly",
-    font=("Arial", 12),
-    width=35
-)
-opciones['values'] = (
-    "Invertir palabras",
-    "Invertir letras de cada palabra",
-    "Invertir completamente",
-    "Contar palabras",
-    "Ordenar alfabéticamente"
-)
-opciones.current(0)    # Selecciona la primera opción por defecto
-opciones.pack(pady=5)
-
-# Botón para ejecutar la acción seleccionada
-ttk.Button(
-    ventana,
-    text="Ejecutar",
-    command=ejecutar
-).pack(pady=10)
-
-# Etiqueta para mostrar el resultado
-resultado_var = tk.StringVar()   # Variable para almacenar el resultado
-resultado_label = ttk.Label(
-    ventana,
-    textvariable=resultado_var,
-    font=("Arial", 12, "italic"),
-    background="#e8f0fe",
-    wraplength=500
-)
-resultado_label.pack(pady=20)
+    opcion = opciones.get()
+    if opcion not in OPERACIONES_ARCHIVO:
+        messagebox.showwarning("Opción no disponible", f"La opción '{opcion}' no está disponible para archivos.")
+        return
+
+    archivo_entrada = filedialog.askopenfilename(title="Archivo de entrada")
+    if not archivo_entrada:
+        return
+    archivo_salida = filedialog.asksaveasfilename(title="Archivo de salida", defaultextension=".txt")
+    if not archivo_salida:
+        return
+
+    avisos_archivo = queue.Queue()
+    resultado_var.set("Procesando archivo...")
+    threading.Thread(target=procesar_en_segundo_plano,
+                     args=(opcion, archivo_entrada, archivo_salida, avisos_archivo), daemon=True).start()
+    ventana.after(REVISAR_ARCHIVO_MS, revisar_archivo)
+
+def procesar_en_segundo_plano(opcion, archivo_entrada, archivo_salida, avisos):
+    """
+    Se ejecuta en un hilo aparte: procesa el archivo y deja en la cola 'avisos'
+    ("fin", estadísticas) o ("error", excepción).
+    """
+    try:
+        avisos.put(("fin", procesar_archivo(opcion, archivo_entrada, archivo_salida)))
+    except Exception as error:
+        # Cualquier fallo (archivo ilegible, disco lleno...) tiene que llegar a la interfaz
+        avisos.put(("error", error))
+
+def revisar_archivo():
+    """Muestra el resultado del hilo cuando termina; mientras tanto vuelve a mirar más tarde."""
+    global avisos_archivo
+    try:
+        tipo, dato = avisos_archivo.get_nowait()
+    except queue.Empty:
+        ventana.after(REVISAR_ARCHIVO_MS, revisar_archivo)
+        return
+    avisos_archivo = None
+    if tipo == "fin":
+        resultado_var.set(
+            f"Archivo procesado: {dato['bytes']} bytes en "
+            f"{dato['segundos']:.2f} s ({dato['mb_s']:.1f} MB/s)"
+        )
+    else:
+        resultado_var.set("")
+        messagebox.showerror("Error", f"No se pudo procesar el archivo:\n{dato}")
+
+# ---------------------- CONFIGURACIÓN DE LA INTERFAZ GRÁFICA ----------------------
 
-ventana.mainloop()   # Inicia el bucle principal de la interfaz gráfica
\ No newline at end of file
+if __name__ == "__main__":
+    ventana = tk.Tk()                               # Crea la ventana principal
+    ventana.title("🌀 Inversor de Frases Avanzado") # Título de la ventana
+    ventana.geometry("600x450")                     # Tamaño de la ventana
+    ventana.config(bg="#e8f0fe")                    # Color de fondo
+    ventana.resizable(False, False)                 # No permite cambiar el tamaño
+
+    # Título principal
+    ttk.Label(
+        ventana,
+        text="Herramienta de Inversión de Texto",
+        font=("Arial", 16, "bold"),
+        background="#e8f0fe"
+    ).pack(pady=10)
+
+    # Caja de entrada de texto multilínea
+    entrada = tk.Text(
+        ventana,
+        font=("Arial", 12),
+        height=4,
+        width=60
+    )
+    entrada.pack(pady=10)
+
+    # Etiqueta para seleccionar opción
+    ttk.Label(
+        ventana,
+        text="Seleccione una opción:",
+        background="#e8f0fe"
+    ).pack()
+
+    # Combobox con las opciones de acción
+    opciones = ttk.Combobox(
+        ventana,
+        state="readonly",
+        font=("Arial", 12),
+        width=35
+    )
+    opciones['values'] = (
+        "Invertir palabras",
+        "Invertir letras de cada palabra",
+        "Invertir completamente",
+        "Contar palabras",
+        "Ordenar alfabéticamente",
+        "Estadísticas de palabras"
+    )
+    opciones.current(0)    # Selecciona la primera opción por defecto
+    opciones.pack(pady=5)
+
+    # Botón para ejecutar la acción seleccionada
+    ttk.Button(
+        ventana,
+        text="Ejecutar",
+        command=ejecutar
+    ).pack(pady=10)
+
+    # Botón para aplicar la opción seleccionada a un archivo completo
+    ttk.Button(
+        ventana,
+        text="Procesar archivo...",
+        command=ejecutar_archivo
+    ).pack()
+
+    # Etiqueta para mostrar el resultado
+    resultado_var = tk.StringVar()   # Variable para almacenar el resultado
+    resultado_label = ttk.Label(
+        ventana,
+        textvariable=resultado_var,
+        font=("Arial", 12, "italic"),
+        background="#e8f0fe",
+        wraplength=500
+    )
+    resultado_label.pack(pady=20)
+
+    ventana.mainloop()   # Inicia el bucle principal de la interfaz gráfica
@@ -1,149 +1,27 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-# ---------------------- FUNCIÓN PARA VERIFICAR PARÉNTESIS ----------------------
-
-def verificar_balanceo_detallado(cadena):
-    """
-    Verifica si los paréntesis (), {}, [] están balanceados en la cadena.
-    Si hay un error, indica el tipo de paréntesis y la posición exacta (empezando en 1).
-    Devuelve: (balanceado: bool, mensaje: str, resumen: dict)
-    """
-    pila = []  # Lista que funcionará como pila para guardar los paréntesis de apertura y su posición
-    pares = {')': '(', '}': '{', ']': '['}  # Diccionario que indica qué apertura corresponde a cada cierre
-    resumen = {'(': 0, ')': 0, '{': 0, '}': 0, '[': 0, ']': 0}  # Diccionario para contar cada tipo de paréntesis
-
-    # Recorre cada carácter de la cadena junto con su índice
-    for i, char in enumerate(cadena):
-        # Si el carácter es un paréntesis de apertura
-        if char in '({[':
-            pila.append((char, i))    # Guarda el tipo de paréntesis y su posición en la pila
-            resumen[char] += 1        # Suma uno al contador de ese tipo de apertura
-        # Si el carácter es un paréntesis de cierre
-        elif char in ')}]':
-            resumen[char] += 1        # Suma uno al contador de ese tipo de cierre
-            if not pila:
-                # Si la pila está vacía, significa que hay un cierre sin apertura previa
-                return False, f"Error: paréntesis de cierre '{char}' sin apertura en posición {i+1}.", resumen
-            ultimo, pos_ultimo = pila[-1]  # Obtiene el último paréntesis de apertura pendiente y su posición
-            if ultimo != pares[char]:
-                # Si el tipo de apertura no coincide con el cierre, hay un error de correspondencia
-                return False, (
-                    f"Error: paréntesis de cierre '{char}' en posición {i+1} no coincide con "
-                    f"el de apertura '{ultimo}' en posición {pos_ultimo+1}."
-                ), resumen
-            pila.pop()  # Si coincide, elimina ese paréntesis de apertura de la pila
-
-    # Si al final quedan aperturas sin cerrar en la pila
-    if pila:
-        char, pos = pila[-1]  # Toma el primer paréntesis de apertura sin cerrar y su posición
-        return False, f"Error: paréntesis de apertura '{char}' sin cerrar en posición {pos+1}.", resumen
-
-    # Si no hubo errores, retorna que está balanceado
-    return True, "✅ Paréntesis balanceados correctamente.", resumen
-
-# ---------------------- FUNCIÓN PARA CORREGIR PARÉNTESIS AUTOMÁTICAMENTE ----------------------
-
-def corregir_parentesis(cadena):
-    """
-    Corrige la cadena agregando los paréntesis de cierre faltantes al final
-    y eliminando los de cierre que no tienen apertura correspondiente.
-    Devuelve la cadena corregida y balanceada.
-    """
-    pila = []       # Pila para guardar los paréntesis de apertura pendientes
-    resultado = []  # Lista para construir la cadena corregida
-    pares = {')': '(', '}': '{', ']': '['}      # Diccionario de cierre -> apertura
-    apertura = {'(': ')', '{': '}', '[': ']'}   # Diccionario de apertura -> cierre
-
-    # Recorre cada carácter de la cadena
-    for char in cadena:
-        if char in '({[':
-            pila.append(char)        # Guarda la apertura en la pila
-            resultado.append(char)   # Añade la apertura al resultado
-        elif char in ')}]':
-            # Si hay una apertura correspondiente en la pila y coincide con el cierre actual
-            if pila and pila[-1] == pares[char]:
-                pila.pop()           # Elimina la apertura de la pila
-                resultado.append(char)  # Añade el cierre al resultado
-            else:
-                # Si hay un cierre sin apertura, lo ignora (no lo añade al resultado)
-                continue
-        else:
-            resultado.append(char)   # Si no es paréntesis, lo añade al resultado
-
-    # Al final, agrega los cierres faltantes para cada apertura que quedó pendiente
-    while pila:
-        resultado.append(apertura[pila.pop()])
-    return ''.join(resultado)  # Devuelve la cadena corregida y balanceada
+from nucleo.parentesis import verificar_balanceo_detallado, corregir_parentesis, VerificadorDocumento  # Lógica sin Tkinter
 
-# ---------------------- INTERFAZ GRÁFICA ----------------------
+DEMORA_MS = 150                    # Espera tras la última tecla antes de verificar en vivo
+documento = VerificadorDocumento()  # Recuerda puntos de control para no recorrer todo el texto en cada edición
+pendiente = None                   # Verificación en vivo programada con after()
 
-ventana = tk.Tk()
-ventana.title("🧠 Analizador de Paréntesis Balanceados")
-ventana.geometry("650x450")
-ventana.config(bg="#f5f8fc")
-ventana.resizable(False, False)
-
-# Título principal
-ttk.Label(
-    ventana,
-    text="🔍 Verificador de Paréntesis ( ) [ ] { }",
-    font=("Arial", 16, "bold"),
-    background="#f5f8fc"
-).pack(pady=10)
-
-# Caja de entrada de texto
-entrada = tk.Text(
-    ventana,
-    font=("Arial", 12),
-    height=5,
-    width=70
-)
-entrada.pack(pady=10)
-
-# Botón para verificar
-ttk.Button(
-    ventana,
-    text="Verificar",
-    command=lambda: ejecutar_verificacion()
-).pack(pady=5)
-
-# Variables para mostrar resultados
-resultado_var = tk.StringVar()
-conteo_var = tk.StringVar()
-
-# Etiqueta de resultado principal
-resultado_label = ttk.Label(
-    ventana,
-    textvariable=resultado_var,
-    font=("Arial", 13, "italic"),
-    background="#f5f8fc"
-)
-resultado_label.pack(pady=10)
-
-# Etiqueta de conteo de paréntesis
-ttk.Label(
-    ventana,
-    text="📊 Conteo de Paréntesis:",
-    background="#f5f8fc",
-    font=("Arial", 12, "bold")
-).pack()
-conteo_label = ttk.Label(
-    ventana,
-    textvariable=conteo_var,
-    font=("Consolas", 11),
-    background="#f5f8fc"
-)
-conteo_label.pack(pady=5)
+# ---------------------- FUNCIONES DE LA INTERFAZ ----------------------
 
 # Función para mostrar resultado
 def ejecutar_verificacion():
-    texto = entrada.get("1.0", tk.END).strip()
-    if not texto:
+    # Mismo texto que la verificación en vivo (sin strip) para que las posiciones coincidan con el Text
+    texto = entrada.get("1.0", "end-1c")
+    if not texto.strip():
         messagebox.showwarning("Entrada vacía", "Por favor ingrese una expresión.")
         return
 
     balanceado, mensaje, resumen = verificar_balanceo_detallado(texto)
+    mostrar_resultado(balanceado, mensaje, resumen)
+
+# Función para mostrar el mensaje y el conteo de paréntesis
+def mostrar_resultado(balanceado, mensaje, resumen):
     resultado_var.set(mensaje)
     resultado_label.config(foreground="green" if balanceado else "red")
 
@@ -155,6 +33,28 @@ def ejecutar_verificacion():
     )
     conteo_var.set(resumen_text)
 
+# Función que se llama en cada modificación del texto: solo programa la verificación
+def programar_verificacion(event=None):
+    global pendiente
+    if not entrada.edit_modified():
+        return
+    entrada.edit_modified(False)       # Rearma el aviso de <<Modified>> para la siguiente edición
+    if pendiente is not None:
+        ventana.after_cancel(pendiente)
+    pendiente = ventana.after(DEMORA_MS, verificar_en_vivo)
+
+# Función para verificar en vivo y resaltar los paréntesis con error en el propio texto
+def verificar_en_vivo():
+    global pendiente
+    pendiente = None
+    texto = entrada.get("1.0", "end-1c")
+    balanceado, mensaje, resumen = documento.actualizar(texto)
+    mostrar_resultado(balanceado, mensaje, resumen)
+
+    entrada.tag_remove("error", "1.0", tk.END)
+    for pos in documento.marcas():
+        entrada.tag_add("error", f"1.0 + {pos} chars")
+
 # Función para copiar resultado
 def copiar_resultado():
     ventana.clipboard_clear()
@@ -171,13 +71,77 @@ def mostrar_correccion():
     corregido = corregir_parentesis(texto)
     messagebox.showinfo("Cadena Corregida", f"Expresión balanceada:\n{corregido}")
 
-# Botón copiar resultado
-ttk.Button(ventana, text="Copiar resultado", command=copiar_resultado).pack(pady=10)
+# ---------------------- INTERFAZ GRÁFICA ----------------------
+
+if __name__ == "__main__":
+    ventana = tk.Tk()
+    ventana.title("🧠 Analizador de Paréntesis Balanceados")
+    ventana.geometry("650x450")
+    ventana.config(bg="#f5f8fc")
+    ventana.resizable(False, False)
+
+    # Título principal
+    ttk.Label(
+        ventana,
+        text="🔍 Verificador de Paréntesis ( ) [ ] { }",
+        font=("Arial", 16, "bold"),
+        background="#f5f8fc"
+    ).pack(pady=10)
+
+    # Caja de entrada de texto
+    entrada = tk.Text(
+        ventana,
+        font=("Arial", 12),
+        height=5,
+        width=70
+    )
+    entrada.pack(pady=10)
+    entrada.tag_configure("error", background="#ffb3b3", foreground="#b00000")
+    entrada.bind("<<Modified>>", programar_verificacion)  # Verificación en vivo mientras se escribe
+
+    # Botón para verificar
+    ttk.Button(
+        ventana,
+        text="Verificar",
+        command=lambda: ejecutar_verificacion()
+    ).pack(pady=5)
+
+    # Variables para mostrar resultados
+    resultado_var = tk.StringVar()
+    conteo_var = tk.StringVar()
+
+    # Etiqueta de resultado principal
+    resultado_label = ttk.Label(
+        ventana,
+        textvariable=resultado_var,
+        font=("Arial", 13, "italic"),
+        background="#f5f8fc"
+    )
+    resultado_label.pack(pady=10)
+
+    # Etiqueta de conteo de paréntesis
+    ttk.Label(
+        ventana,
+        text="📊 Conteo de Paréntesis:",
+        background="#f5f8fc",
+        font=("Arial", 12, "bold")
+    ).pack()
+    conteo_label = ttk.Label(
+        ventana,
+        textvariable=conteo_var,
+        font=("Consolas", 11),
+        background="#f5f8fc"
+    )
+    conteo_label.pack(pady=5)
+
+    # Botón copiar resultado
+    ttk.Button(ventana, text="Copiar resultado", command=copiar_resultado).pack(pady=10)
+
+    # Botón para corregir paréntesis
+    ttk.Button(ventana, text="Corregir paréntesis", command=mostrar_correccion).pack(pady=5)
 
-# Botón para corregir paréntesis
-ttk.Button(ventana, text="Corregir paréntesis", command=mostrar_correccion).pack(pady=5)
+    ventana.mainloop()
 
-ventana.mainloop()
 
 
 '''
@@ -1,89 +1,126 @@
+import itertools
+import queue
+import threading
 import tkinter as tk
-from tkinter import messagebox, simpledialog, filedialog
-import random
-
-# ---------------------- CLASE PARA UNA CANCIÓN ----------------------
-class Cancion:
-    def __init__(self, nombre):
-        self.nombre = nombre         # Nombre de la canción
-        self.siguiente = None        # Referencia a la siguiente canción (lista doblemente enlazada)
-        self.anterior = None         # Referencia a la canción anterior
-
-# ---------------------- CLASE PARA LA LISTA DE REPRODUCCIÓN ----------------------
-class ListaReproduccion:
-    def __init__(self):
-        self.primera = None         # Primer nodo/canción de la lista
-        self.actual = None          # Canción que está sonando actualmente
-        self.modo_aleatorio = False # Indica si el modo aleatorio está activado
-
-    def agregar_cancion(self, nombre):
-        nueva = Cancion(nombre)     # Crea un nuevo nodo/canción
-        if not self.primera:
-            self.primera = self.actual = nueva  # Si la lista está vacía, es la primera y actual
+from tkinter import ttk, messagebox, simpledialog, filedialog
+
+# Lógica de la lista (no depende de Tkinter)
+from nucleo.reproduccion import ListaReproduccion, PosicionesLista, leer_canciones
+
+# Formatos que se ofrecen al guardar y cargar listas
+TIPOS_LISTA = [("Texto", "*.txt"), ("M3U", "*.m3u *.m3u8"), ("CSV", "*.csv"),
+               ("Lista binaria", "*.lrep"), ("Todos los archivos", "*.*")]
+
+LOTE_CARGA = 20_000        # Canciones que el hilo de carga agrega antes de avisar del progreso
+REVISAR_CARGA_MS = 50      # Cada cuánto mira la interfaz si hay avisos del hilo de carga
+FILAS_VISIBLES = 20        # Filas que dibuja la vista de la lista
+
+# ---------------------- CARGA EN SEGUNDO PLANO ----------------------
+def cargar_en_segundo_plano(archivo, avisos, cancelada):
+    """
+    Se ejecuta en un hilo aparte: crea una lista nueva con las canciones del archivo, por
+    lotes, y deja en la cola 'avisos' ("progreso", canciones), ("fin", lista) o
+    ("error", excepción). Si se activa 'cancelada' termina sin avisar.
+    La lista no la toca nadie más hasta que llega el aviso de fin.
+    """
+    lista = ListaReproduccion()
+    try:
+        canciones = leer_canciones(archivo)
+        while not cancelada.is_set():
+            lote = list(itertools.islice(canciones, LOTE_CARGA))
+            if not lote:
+                avisos.put(("fin", lista))
+                return
+            lista.agregar_canciones(lote)
+            avisos.put(("progreso", len(lista)))
+    except Exception as error:
+        # Cualquier fallo (csv.Error, un UnicodeDecodeError...) tiene que llegar a la
+        # interfaz: si el hilo muriera sin avisar, la ventana de progreso esperaría para siempre
+        avisos.put(("error", error))
+
+# ---------------------- VISTA DE LA LISTA (SOLO LAS FILAS VISIBLES) ----------------------
+class VistaLista:
+    """
+    Ventana con la lista de canciones que solo dibuja las filas visibles: la barra de
+    desplazamiento se maneja a mano y las canciones se piden por posición a un
+    PosicionesLista, así que abrirla o moverse por una lista enorme no la copia entera.
+    """
+    def __init__(self, interfaz):
+        self.interfaz = interfaz
+        self.posiciones = PosicionesLista(interfaz.lista)
+        self.inicio = 0               # Posición de la primera fila visible
+        self.nodos = []               # Canciones dibujadas ahora
+
+        self.ventana = tk.Toplevel(interfaz.root)
+        self.ventana.title("📜 Lista de reproducción")
+        self.ventana.configure(bg='#d0e1f9')
+        self.resumen = tk.Label(self.ventana, bg='#d0e1f9', fg='#003366', font=("Helvetica", 11))
+        self.resumen.pack(pady=5)
+        marco = tk.Frame(self.ventana)
+        marco.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        self.filas = tk.Listbox(marco, height=FILAS_VISIBLES, width=60, font=("Helvetica", 11),
+                                activestyle='none', exportselection=False)
+        self.barra = ttk.Scrollbar(marco, orient=tk.VERTICAL, command=self.desplazar)
+        self.filas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.barra.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # La Listbox nunca tiene más filas que las visibles: el desplazamiento lo hace la vista
+        self.filas.bind("<MouseWheel>", lambda e: self.mover(-1 if e.delta > 0 else 1, "units"))
+        self.filas.bind("<Button-4>", lambda e: self.mover(-1, "units"))
+        self.filas.bind("<Button-5>", lambda e: self.mover(1, "units"))
+        for tecla, cantidad, unidad in (("<Up>", -1, "units"), ("<Down>", 1, "units"),
+                                        ("<Prior>", -1, "pages"), ("<Next>", 1, "pages")):
+            self.filas.bind(tecla, lambda e, c=cantidad, u=unidad: self.mover(c, u))
+        self.filas.bind("<Double-Button-1>", self.reproducir)
+        self.dibujar()
+
+    def existe(self):
+        return bool(self.ventana.winfo_exists())
+
+    def usar(self, lista):
+        # La lista cambió de canciones (o es otra): las posiciones recordadas ya no valen
+        if lista is not self.posiciones.lista:
+            self.posiciones = PosicionesLista(lista)
         else:
-            temp = self.primera
-            while temp.siguiente:   # Busca el último nodo
-                temp = temp.siguiente
-            temp.siguiente = nueva  # Enlaza la nueva canción al final
-            nueva.anterior = temp   # Enlaza hacia atrás
-
-    def eliminar_cancion(self, nombre):
-        temp = self.primera
-        while temp:
-            if temp.nombre == nombre:
-                if temp.anterior:
-                    temp.anterior.siguiente = temp.siguiente  # Salta el nodo a eliminar
-                else:
-                    self.primera = temp.siguiente             # Si es la primera, actualiza la cabeza
-                if temp.siguiente:
-                    temp.siguiente.anterior = temp.anterior   # Ajusta el enlace hacia atrás
-                if self.actual == temp:
-                    self.actual = temp.siguiente or temp.anterior  # Cambia la actual si se elimina
-                return True
-            temp = temp.siguiente
-        return False
-
-    def siguiente_cancion(self):
-        if self.modo_aleatorio:
-            canciones = self.obtener_lista()
-            if canciones:
-                # Elige una canción aleatoria distinta de la actual
-                self.actual = random.choice([c for c in canciones if c != self.actual])
-        elif self.actual and self.actual.siguiente:
-            self.actual = self.actual.siguiente  # Avanza a la siguiente canción
-
-    def anterior_cancion(self):
-        if self.actual and self.actual.anterior:
-            self.actual = self.actual.anterior   # Retrocede a la canción anterior
+            self.posiciones.invalidar()
+        self.dibujar()
 
-    def repetir(self):
-        return self.actual.nombre if self.actual else "No hay canción."  # Devuelve el nombre de la actual
-
-    def buscar(self, nombre):
-        temp = self.primera
-        while temp:
-            if temp.nombre == nombre:
-                return True
-            temp = temp.siguiente
-        return False
-
-    def obtener_lista(self):
-        lista = []
-        temp = self.primera
-        while temp:
-            lista.append(temp)      # Agrega cada nodo/canción a la lista
-            temp = temp.siguiente
-        return lista
-
-    def guardar_lista(self, archivo):
-        with open(archivo, 'w') as f:
-            for cancion in self.obtener_lista():
-                f.write(cancion.nombre + '\n')  # Guarda cada canción en una línea
-
-    def cargar_lista(self, archivo):
-        with open(archivo, 'r') as f:
-            for linea in f:
-                self.agregar_cancion(linea.strip())  # Agrega cada línea como canción
+    def desplazar(self, accion, cantidad, unidad=None):
+        # Órdenes de la barra de desplazamiento: ("moveto", fracción) o ("scroll", n, unidad)
+        if accion == "moveto":
+            self.inicio = int(float(cantidad) * len(self.posiciones.lista))
+            self.dibujar()
+        else:
+            self.mover(int(cantidad), unidad)
+
+    def mover(self, cantidad, unidad):
+        self.inicio += cantidad * (FILAS_VISIBLES if unidad == "pages" else 1)
+        self.dibujar()
+        return "break"
+
+    def dibujar(self):
+        lista = self.posiciones.lista
+        total = len(lista)
+        self.inicio = max(0, min(self.inicio, total - FILAS_VISIBLES))
+        self.nodos = self.posiciones.ventana(self.inicio, FILAS_VISIBLES)
+        self.filas.delete(0, tk.END)
+        self.filas.insert(tk.END, *(f"{self.inicio + i + 1}. {nodo.nombre}" for i, nodo in enumerate(self.nodos)))
+        for i, nodo in enumerate(self.nodos):
+            if nodo is lista.actual:
+                self.filas.itemconfig(i, background='#88c9bf')
+        if total:
+            self.barra.set(self.inicio / total, (self.inicio + len(self.nodos)) / total)
+            self.resumen.config(text=f"{total} canciones")
+        else:
+            self.barra.set(0, 1)
+            self.resumen.config(text="La lista está vacía.")
+
+    def reproducir(self, event=None):
+        # Doble clic: la canción de la fila pasa a ser la actual
+        seleccion = self.filas.curselection()
+        if seleccion and seleccion[0] < len(self.nodos):
+            self.posiciones.lista.actual = self.nodos[seleccion[0]]
+            self.interfaz.actualizar_etiqueta()
 
 # ---------------------- CLASE PARA LA INTERFAZ GRÁFICA ----------------------
 class Interfaz:
@@ -94,6 +131,8 @@ class Interfaz:
         self.root.configure(bg='#d0e1f9')                       # Color de fondo
 
         self.lista = ListaReproduccion()                        # Instancia de la lista de reproducción
+        self.vista = None                                       # Ventana de la lista, si está abierta
+        self.carga = None                                       # (cola de avisos, evento de cancelar, ventana de progreso)
 
         # Etiqueta que muestra la canción actual
         self.etiqueta = tk.Label(root, text="🎶 Canción actual: Ninguna", font=("Helvetica", 14), bg='#d0e1f9', fg='#003366')
@@ -118,17 +157,22 @@ class Interfaz:
             b = tk.Button(root, text=texto, command=comando, width=30, bg='#88c9bf', fg='black', font=("Helvetica", 12, "bold"))
             b.pack(pady=3)
 
-    def actualizar_etiqueta(self):
-        # Actualiza la etiqueta con el nombre de la canción actual
+    def actualizar_etiqueta(self, cambio_canciones=False):
+        # Actualiza la etiqueta con el nombre de la canción actual (y la vista de la lista, si está abierta)
         actual = self.lista.actual.nombre if self.lista.actual else "Ninguna"
         self.etiqueta.config(text=f"🎶 Canción actual: {actual}")
+        if self.vista is not None and self.vista.existe():
+            if cambio_canciones:
+                self.vista.usar(self.lista)
+            else:
+                self.vista.dibujar()
 
     def agregar(self):
         # Pide al usuario el nombre de la canción y la agrega a la lista
         nombre = simpledialog.askstring("Agregar", "Nombre de la canción:")
         if nombre:
             self.lista.agregar_cancion(nombre)
-            self.actualizar_etiqueta()
+            self.actualizar_etiqueta(cambio_canciones=True)
 
     def eliminar(self):
         # Pide el nombre de la canción a eliminar y la elimina si existe
@@ -138,7 +182,7 @@ class Interfaz:
                 messagebox.showinfo("Éxito", "Canción eliminada.")
             else:
                 messagebox.showwarning("Error", "Canción no encontrada.")
-            self.actualizar_etiqueta()
+            self.actualizar_etiqueta(cambio_canciones=True)
 
     def siguiente(self):
         # Pasa a la siguiente canción (o aleatoria si está activado)
@@ -163,36 +207,88 @@ class Interfaz:
         messagebox.showinfo("Modo Aleatorio", f"Modo aleatorio {estado}.")
 
     def buscar(self):
-        # Busca una canción por nombre y muestra si está o no
+        # Busca canciones por parte del nombre (o parecidas, si hay errores) y muestra las mejores
         nombre = simpledialog.askstring("Buscar", "Nombre de la canción a buscar:")
         if nombre:
-            encontrado = self.lista.buscar(nombre)
-            msg = "encontrada ✅" if encontrado else "no está ❌"
-            messagebox.showinfo("Buscar", f"La canción {msg}.")
+            resultados = (self.lista.buscar_texto(nombre, "subcadena", limite=10)
+                          or self.lista.buscar_texto(nombre, "aproximada", limite=10))
+            if resultados:
+                lineas = [f"{cancion} ({len(nodos)})" if len(nodos) > 1 else cancion for cancion, nodos in resultados]
+                messagebox.showinfo("Buscar", "Canciones encontradas ✅:\n" + "\n".join(lineas))
+            else:
+                messagebox.showinfo("Buscar", "La canción no está ❌.")
 
     def mostrar_lista(self):
-        # Muestra todas las canciones de la lista en un mensaje
-        canciones = [c.nombre for c in self.lista.obtener_lista()]
-        if canciones:
-            messagebox.showinfo("Lista", "\n".join(canciones))
+        # Abre la vista de la lista (o la trae al frente si ya está abierta)
+        if self.vista is not None and self.vista.existe():
+            self.vista.ventana.lift()
         else:
-            messagebox.showinfo("Lista", "La lista está vacía.")
+            self.vista = VistaLista(self)
 
     def guardar(self):
-        # Permite guardar la lista de canciones en un archivo de texto
-        archivo = filedialog.asksaveasfilename(defaultextension=".txt")
+        # Permite guardar la lista de canciones (el formato depende de la extensión elegida)
+        archivo = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=TIPOS_LISTA)
         if archivo:
             self.lista.guardar_lista(archivo)
             messagebox.showinfo("Guardar", "Lista guardada exitosamente.")
 
     def cargar(self):
-        # Permite cargar una lista de canciones desde un archivo de texto
-        archivo = filedialog.askopenfilename()
-        if archivo:
-            self.lista = ListaReproduccion()  # Reinicia la lista
-            self.lista.cargar_lista(archivo)
-            self.actualizar_etiqueta()
-            messagebox.showinfo("Cargar", "Lista cargada correctamente.")
+        # Permite cargar una lista de canciones en texto, M3U/M3U8, CSV o binario. La carga
+        # se hace en otro hilo; mientras tanto se puede seguir usando la lista anterior
+        if self.carga is not None:
+            messagebox.showwarning("Cargar", "Ya se está cargando una lista.")
+            return
+        archivo = filedialog.askopenfilename(filetypes=TIPOS_LISTA)
+        if not archivo:
+            return
+        avisos, cancelada = queue.Queue(), threading.Event()
+
+        progreso = tk.Toplevel(self.root)
+        progreso.title("📂 Cargando lista")
+        progreso.configure(bg='#d0e1f9')
+        progreso.transient(self.root)
+        progreso.protocol("WM_DELETE_WINDOW", self.cancelar_carga)
+        self.progreso_var = tk.StringVar(value="Leyendo el archivo...")
+        tk.Label(progreso, textvariable=self.progreso_var, bg='#d0e1f9', font=("Helvetica", 12)).pack(padx=20, pady=10)
+        barra = ttk.Progressbar(progreso, mode="indeterminate", length=250)
+        barra.pack(padx=20)
+        barra.start(15)
+        tk.Button(progreso, text="Cancelar", command=self.cancelar_carga, bg='#88c9bf').pack(pady=10)
+
+        self.carga = (avisos, cancelada, progreso)
+        threading.Thread(target=cargar_en_segundo_plano, args=(archivo, avisos, cancelada), daemon=True).start()
+        self.root.after(REVISAR_CARGA_MS, self.revisar_carga)
+
+    def revisar_carga(self):
+        # Atiende los avisos del hilo de carga sin bloquear la ventana
+        if self.carga is None:
+            return                                     # Cancelada
+        avisos, _, progreso = self.carga
+        try:
+            while True:
+                tipo, dato = avisos.get_nowait()
+                if tipo == "progreso":
+                    self.progreso_var.set(f"{dato} canciones cargadas...")
+                    continue
+                self.carga = None
+                progreso.destroy()
+                if tipo == "fin":
+                    self.lista = dato
+                    self.actualizar_etiqueta(cambio_canciones=True)
+                    messagebox.showinfo("Cargar", f"Lista cargada correctamente ({len(dato)} canciones).")
+                else:
+                    messagebox.showerror("Cargar", f"No se pudo cargar la lista:\n{dato}")
+                return
+        except queue.Empty:
+            self.root.after(REVISAR_CARGA_MS, self.revisar_carga)
+
+    def cancelar_carga(self):
+        # Avisa al hilo para que pare; la lista a medio cargar se descarta
+        if self.carga is not None:
+            _, cancelada, progreso = self.carga
+            cancelada.set()
+            self.carga = None
+            progreso.destroy()
 
 # ---------------------- INICIO DE LA APLICACIÓN ----------------------
 if __name__ == "__main__":
@@ -6,52 +6,12 @@ import tkinter as tk  # Biblioteca principal para crear interfaces gráficas en
 from tkinter import ttk  # Widgets modernos (como botones estilizados)
 from tkinter import messagebox  # Para mostrar mensajes emergentes al usuario
 from tkinter import simpledialog  # Para solicitar entradas mediante cuadros emergentes
-import heapq  # Proporciona una estructura de datos tipo heap para implementar la cola de prioridad
+from nucleo.prioridad import crear_cola, FilasOrdenadas  # Lógica de la cola de prioridad (no depende de Tkinter)
 
-# ===============================
-# LÓGICA DE LA COLA DE PRIORIDAD
-# ===============================
-
-class ColaPrioridad:
-    def __init__(self):
-        self.cola = []      # Lista principal que almacena tuplas (prioridad, nombre) como heap
-        self.historial = [] # Lista para guardar los elementos que han sido desencolados
-
-    def encolar(self, nombre, prioridad):
-        heapq.heappush(self.cola, (prioridad, nombre))  # Inserta el elemento en el heap según prioridad
-
-    def desencolar(self):
-        if self.cola:
-            elemento = heapq.heappop(self.cola)  # Extrae el elemento con mayor prioridad (menor número)
-            self.historial.append(elemento)       # Lo agrega al historial de desencolados
-            return elemento
-        return None
-
-    def buscar(self, nombre):
-        # Busca un elemento por nombre (ignorando mayúsculas/minúsculas)
-        for i, (p, n) in enumerate(self.cola):
-            if n.lower() == nombre.lower():
-                return (i + 1, p)  # Devuelve la posición (empezando en 1) y la prioridad
-        return None
-
-    def editar(self, nombre, nueva_prioridad):
-        # Busca el elemento y cambia su prioridad
-        for i, (p, n) in enumerate(self.cola):
-            if n.lower() == nombre.lower():
-                self.cola[i] = (nueva_prioridad, n)  # Cambia la prioridad
-                heapq.heapify(self.cola)             # Reorganiza el heap para mantener la propiedad
-                return True
-        return False
-
-    def vaciar(self):
-        self.cola.clear()  # Elimina todos los elementos de la cola
-
-    def obtener_estadisticas(self):
-        # Calcula estadísticas: total de elementos, menor prioridad, promedio de prioridades
-        if not self.cola:
-            return (0, "N/A", "N/A")
-        prioridades = [p for p, _ in self.cola]
-        return (len(self.cola), min(prioridades), sum(prioridades) / len(prioridades))
+# Prioridades habituales: con este rango la cola usa cubetas (a igual prioridad sale antes
+# el que llegó antes). Las prioridades mayores se siguen aceptando.
+PRIORIDAD_MAXIMA = 100
+LINEAS_HISTORIAL = 1000  # Líneas que guarda el cuadro del historial (el resto queda en el Historial de la cola)
 
 # ===============================
 # INTERFAZ GRÁFICA ESTÉTICA
@@ -63,7 +23,8 @@ class InterfazColaPrioridad:
         self.root.title("🧺 Cola de Prioridad - Interfaz Estética")
         self.root.configure(bg="#fff5e6")  # Fondo cálido
 
-        self.cola = ColaPrioridad()        # Instancia de la lógica de la cola
+        self.cola = crear_cola(prioridad_maxima=PRIORIDAD_MAXIMA)  # Instancia de la lógica de la cola
+        self.filas = FilasOrdenadas()      # Qué fila de la lista visual ocupa cada elemento
 
         fuente = ("Segoe UI", 10)          # Fuente base para los widgets
 
@@ -116,24 +77,30 @@ class InterfazColaPrioridad:
     # FUNCIONES DE LA INTERFAZ
     # ===============================
 
-    def actualizar_lista(self):
-        """Actualiza visualmente la lista de elementos actuales en la cola"""
-        self.lista.delete(0, tk.END)
-        for prioridad, nombre in sorted(self.cola.cola):
-            self.lista.insert(tk.END, f"{nombre} (Prioridad: {prioridad})")
+    def insertar_fila(self, clave):
+        """Inserta solo la fila del elemento, en su lugar según el orden de salida"""
+        self.lista.insert(self.filas.insertar(clave), self.filas.texto(clave))
 
+    def quitar_fila(self, clave):
+        """Borra solo la fila del elemento"""
+        self.lista.delete(self.filas.quitar(clave))
+
+    def actualizar_estadisticas(self):
+        """Muestra las estadísticas (la cola las mantiene al día, no se recalculan)"""
         total, min_p, prom = self.cola.obtener_estadisticas()
         if total:
             self.stats_label.config(text=f"Estadísticas: Total={total}, Mayor={min_p}, Promedio={prom:.2f}")
         else:
             self.stats_label.config(text="Estadísticas: Total=0, Mayor=N/A, Promedio=N/A")
 
-    def actualizar_historial(self):
-        """Muestra el historial de elementos desencolados"""
+    def agregar_al_historial(self, elemento):
+        """Añade al historial visible solo la línea del elemento desencolado"""
+        prioridad, nombre = elemento
         self.historial.config(state="normal")
-        self.historial.delete("1.0", tk.END)
-        for prioridad, nombre in self.cola.historial:
-            self.historial.insert(tk.END, f"{nombre} (Prioridad: {prioridad})\n")
+        self.historial.insert(tk.END, f"{nombre} (Prioridad: {prioridad})\n")
+        if int(self.historial.index("end-1c").split(".")[0]) > LINEAS_HISTORIAL + 1:
+            self.historial.delete("1.0", "2.0")      # Se descarta la línea más antigua
+        self.historial.see(tk.END)
         self.historial.config(state="disabled")
 
     def encolar(self):
@@ -145,16 +112,17 @@ class InterfazColaPrioridad:
             messagebox.showwarning("Datos inválidos", "Por favor, completa correctamente los campos.")
             return
 
-        self.cola.encolar(nombre, int(prioridad))
-        self.actualizar_lista()
+        self.insertar_fila(self.cola.encolar(nombre, int(prioridad)))
+        self.actualizar_estadisticas()
 
     def desencolar(self):
         """Elimina el elemento con mayor prioridad"""
         elemento = self.cola.desencolar()
         if elemento:
             messagebox.showinfo("Elemento desencolado", f"{elemento[1]} fue eliminado.")
-            self.actualizar_lista()
-            self.actualizar_historial()
+            self.lista.delete(self.filas.quitar_primera())
+            self.actualizar_estadisticas()
+            self.agregar_al_historial(elemento)
         else:
             messagebox.showinfo("Cola vacía", "No hay elementos para desencolar.")
 
@@ -171,7 +139,9 @@ class InterfazColaPrioridad:
     def vaciar_cola(self):
         """Elimina todos los elementos de la cola"""
         self.cola.vaciar()
-        self.actualizar_lista()
+        self.filas.vaciar()
+        self.lista.delete(0, tk.END)
+        self.actualizar_estadisticas()
 
     def editar(self):
         """Permite cambiar la prioridad de un elemento existente"""
@@ -182,9 +152,13 @@ class InterfazColaPrioridad:
 
         nueva = simpledialog.askinteger("Editar Prioridad", f"Nueva prioridad para {nombre}:")
         if nueva is not None:
-            if self.cola.editar(nombre, nueva):
+            cambio = self.cola.cambiar_prioridad(nombre, nueva)
+            if cambio:
+                anterior, nueva_clave = cambio
+                self.quitar_fila(anterior)
+                self.insertar_fila(nueva_clave)
+                self.actualizar_estadisticas()
                 messagebox.showinfo("Actualizado", f"Prioridad de {nombre} modificada.")
-                self.actualizar_lista()
             else:
                 messagebox.showerror("No encontrado", f"{nombre} no está en la cola.")
 
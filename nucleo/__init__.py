@@ -0,0 +1,12 @@
+"""
+Lógica de los cinco ejercicios sin ninguna dependencia de Tkinter.
+
+    nucleo.texto         Ejercicio 1: transformaciones de texto
+    nucleo.parentesis    Ejercicio 2: paréntesis balanceados
+    nucleo.reproduccion  Ejercicio 3: lista de reproducción doblemente enlazada
+    nucleo.prioridad     Ejercicio 4: cola de prioridad
+    nucleo.enlazada      Ejercicio 5: lista enlazada simple
+
+Los submódulos no se importan aquí para que cada programa cargue solo lo que usa.
+Uso por línea de comandos: python -m nucleo --help
+"""
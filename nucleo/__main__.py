@@ -0,0 +1,413 @@
+# ---------------------- LÍNEA DE COMANDOS PARA PROCESAR ARCHIVOS POR LOTES ----------------------
+#
+# python -m nucleo <comando> archivo1 archivo2 ...
+#
+# Cada comando importa solo el módulo de nucleo que necesita, y ninguno importa Tkinter,
+# así que el arranque es rápido aunque se procesen muchos archivos en cada invocación.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Nombres cortos de las operaciones del Ejercicio 1
+ALIAS_TEXTO = {
+    "invertir-palabras": "Invertir palabras",
+    "invertir-letras": "Invertir letras de cada palabra",
+    "invertir-completo": "Invertir completamente",
+    "contar": "Contar palabras",
+    "ordenar": "Ordenar alfabéticamente",
+    "estadisticas": "Estadísticas de palabras",
+}
+
+TAMANO_FRAGMENTO = 1 << 16       # Caracteres leídos de cada vez al verificar paréntesis
+FRAGMENTOS_POR_CONTROL = 64      # Cada cuántos fragmentos se guarda el punto de control
+
+MODULOS = ["texto", "parentesis", "reproduccion", "prioridad", "enlazada"]
+
+# ---------------------- COMANDOS ----------------------
+
+def comando_texto(args):
+    from nucleo.texto import procesar_archivo
+
+    opcion = ALIAS_TEXTO[args.operacion]
+    for archivo in args.archivos:
+        base = os.path.basename(archivo) if args.salida else archivo
+        salida = os.path.join(args.salida or "", f"{base}.{args.operacion}.txt")
+        estadisticas = procesar_archivo(opcion, archivo, salida)
+        print(f"{archivo} -> {salida}: {estadisticas['bytes']} bytes en "
+              f"{estadisticas['segundos']:.2f} s ({estadisticas['mb_s']:.1f} MB/s)")
+    return 0
+
+def _expandir_rutas(rutas):
+    """
+    Sustituye cada carpeta por los archivos que contiene (recursivamente), sin las
+    versiones corregidas que escribió una ejecución anterior con --corregir.
+    """
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            for carpeta, _, archivos in os.walk(ruta):
+                for archivo in sorted(archivos):
+                    if not os.path.splitext(archivo)[0].endswith(".corregido"):
+                        yield os.path.join(carpeta, archivo)
+        else:
+            yield ruta
+
+def comando_parentesis(args):
+    from nucleo.parentesis import VerificadorIncremental
+
+    if args.reporte:
+        from nucleo.parentesis import validar_lote
+
+        total = validar_lote(_expandir_rutas(args.archivos), args.reporte,
+                             procesos=args.procesos, corregir=args.corregir)
+        print(f"{total['archivos']} archivos, {total['con_errores']} con errores, "
+              f"{total['segundos']:.2f} s ({total['archivos_s']:.0f} archivos/s) -> {args.reporte}")
+        return 1 if total['con_errores'] else 0
+
+    if args.estado and len(args.archivos) != 1:
+        print("--estado solo se puede usar con una única entrada.", file=sys.stderr)
+        return 2
+
+    errores = 0
+    for archivo in args.archivos:
+        if args.estado and os.path.exists(args.estado):
+            verificador = VerificadorIncremental.cargar(args.estado)   # Continúa tras un reinicio
+        else:
+            verificador = VerificadorIncremental()
+        saltar = verificador.posicion   # Caracteres ya verificados antes del punto de control
+
+        f = sys.stdin if archivo == "-" else open(archivo, 'r', encoding='utf-8')
+        try:
+            fragmentos = 0
+            while (fragmento := f.read(TAMANO_FRAGMENTO)):
+                if saltar:
+                    omitidos = min(saltar, len(fragmento))
+                    fragmento = fragmento[omitidos:]
+                    saltar -= omitidos
+                if verificador.feed(fragmento):
+                    break                                   # El primer error ya se conoce
+                fragmentos += 1
+                if args.estado and fragmentos % FRAGMENTOS_POR_CONTROL == 0:
+                    verificador.guardar(args.estado)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+        balanceado, mensaje, _ = verificador.finalizar()
+        print(f"{archivo}: {mensaje}")
+        errores += not balanceado
+        if args.estado and os.path.exists(args.estado):
+            os.remove(args.estado)                          # La verificación terminó
+    return 1 if errores else 0
+
+def comando_canciones(args):
+    from nucleo.reproduccion import ListaPersistente, ListaReproduccion, ListaReproduccionCompacta
+
+    if args.persistente:
+        clase = ListaPersistente
+    else:
+        clase = ListaReproduccionCompacta if args.compacta else ListaReproduccion
+    for archivo in args.archivos:
+        lista = clase()
+        lista.cargar_lista(archivo)
+        linea = f"{archivo}: {len(lista)} canciones"
+        if args.buscar is not None:
+            linea += ", " + ("encontrada" if lista.buscar(args.buscar) else "no encontrada") + f" '{args.buscar}'"
+        print(linea)
+    return 0
+
+def comando_prioridad(args):
+    from nucleo.prioridad import crear_cola
+
+    for archivo in args.archivos:
+        cola = crear_cola(args.motor, args.prioridad_maxima)
+        with open(archivo, 'r', encoding='utf-8') as f:
+            for linea in f:
+                if linea.strip():
+                    nombre, prioridad = linea.rsplit(',', 1)   # Formato: nombre,prioridad
+                    cola.encolar(nombre.strip(), int(prioridad))
+        print(f"{archivo}:")
+        while (elemento := cola.desencolar()) is not None:
+            print(f"  {elemento[1]} (Prioridad: {elemento[0]})")
+    return 0
+
+def comando_enlazada(args):
+    from nucleo.enlazada import LinkedList
+
+    for archivo in args.archivos:
+        lista = LinkedList()
+        with open(archivo, 'r', encoding='utf-8') as f:
+            for valor in f.read().split():
+                lista.append(int(valor))
+        if args.buscar is None:
+            print(f"{archivo}: {lista.mostrar_lista()}")
+        else:
+            posiciones = lista.buscar(args.buscar)
+            print(f"{archivo}: {args.buscar} en posiciones {posiciones}" if posiciones
+                  else f"{archivo}: {args.buscar} no está en la lista")
+    return 0
+
+# ---------------------- BENCHMARKS ----------------------
+
+def medir_arranque(repeticiones=5):
+    """
+    Mide el tiempo de arranque en frío de cada módulo de nucleo: lanza un intérprete nuevo
+    que solo lo importa y resta lo que tarda un intérprete vacío. También comprueba que
+    ningún módulo importa Tkinter.
+    Devuelve: dict {modulo: milisegundos (mediana)}.
+    """
+    def medir(codigo):
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            proceso = subprocess.run([sys.executable, "-c", codigo], cwd=raiz)
+            tiempos.append(time.perf_counter() - inicio)
+            if proceso.returncode:
+                raise RuntimeError(f"El código '{codigo}' importó Tkinter o falló.")
+        return statistics.median(tiempos) * 1000
+
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    base = medir("pass")
+    resultados = {}
+    for modulo in MODULOS:
+        codigo = f"import sys, nucleo.{modulo}; sys.exit('tkinter' in sys.modules)"
+        resultados[modulo] = max(0.0, medir(codigo) - base)
+    return resultados
+
+def benchmark_arranque(args):
+    resultados = medir_arranque()
+    for modulo, ms in resultados.items():
+        print(f"nucleo.{modulo:<14} {ms:7.1f} ms")
+    return resultados
+
+def benchmark_tuberia(args):
+    import random
+    from nucleo.texto import comparar_tuberias
+
+    generador = random.Random(0)
+    vocabulario = ["hola", "Mundo", "adiós", "Python", "pila", "Cola", "texto", "árbol"]
+    frases = [' '.join(generador.choices(vocabulario, k=30)) for _ in range(2000)]
+    resultados = {}
+    for operaciones, ingenuo, fusionado in comparar_tuberias(frases):
+        nombre = " + ".join(operaciones)
+        print(f"{nombre:<65} ingenuo {ingenuo * 1000:7.1f} ms  fusionado {fusionado * 1000:7.1f} ms")
+        resultados[nombre] = {"ingenuo_ms": ingenuo * 1000, "fusionado_ms": fusionado * 1000}
+    return resultados
+
+def benchmark_parentesis(args):
+    from nucleo.parentesis import comparar_escaneo
+
+    resultados = {}
+    for densidad, por_caracter, verificar, corregir in comparar_escaneo():
+        print(f"densidad {densidad:<6} carácter a carácter {por_caracter * 1000:7.1f} ms  "
+              f"verificar {verificar * 1000:7.1f} ms  corregir {corregir * 1000:7.1f} ms")
+        resultados[str(densidad)] = {"por_caracter_ms": por_caracter * 1000,
+                                     "verificar_ms": verificar * 1000, "corregir_ms": corregir * 1000}
+    return resultados
+
+def benchmark_reparacion(args):
+    from nucleo.parentesis import comparar_limite_exacto, comparar_reparacion
+
+    resultados = {}
+    for errores, voraz, ediciones_voraz, minimo, ediciones_minimo, exacta, exceso in comparar_reparacion():
+        calidad = "exacta" if exacta else f"aproximada, al menos {exceso} de más" if exceso else "aproximada"
+        print(f"{errores:>5} errores  voraz {voraz * 1000:7.1f} ms {ediciones_voraz:6} ediciones  "
+              f"mínima {minimo * 1000:7.1f} ms {ediciones_minimo:6} ediciones "
+              f"({calidad})")
+        resultados[str(errores)] = {"voraz_ms": voraz * 1000, "ediciones_voraz": ediciones_voraz,
+                                    "minimo_ms": minimo * 1000, "ediciones_minimo": ediciones_minimo,
+                                    "exacta": exacta, "exceso": exceso}
+    for parentesis, segundos, exacta in comparar_limite_exacto():
+        print(f"peor residuo de {parentesis:>4} paréntesis  mínima {segundos * 1000:7.1f} ms "
+              f"({'exacta' if exacta else 'aproximada'})")
+        resultados[f"peor_residuo_{parentesis}"] = {"minimo_ms": segundos * 1000, "exacta": exacta}
+    return resultados
+
+def benchmark_aleatorio(args):
+    from nucleo.reproduccion import comparar_aleatorio
+
+    original, precalculado = comparar_aleatorio()
+    print(f"salto aleatorio original {original * 1e6:9.1f} µs  precalculado {precalculado * 1e6:7.2f} µs")
+    return {"original_us": original * 1e6, "precalculado_us": precalculado * 1e6}
+
+def benchmark_almacenamiento(args):
+    from nucleo.reproduccion import comparar_almacenamiento
+
+    resultados = comparar_almacenamiento()
+    for clase, medidas in resultados.items():
+        print(f"{clase:<26} {medidas['bytes_por_cancion']:6.1f} bytes/canción  "
+              f"agregar {medidas['agregar_s']:9.0f}/s  buscar {medidas['buscar_s']:9.0f}/s  "
+              f"siguiente {medidas['siguiente_s']:9.0f}/s  eliminar {medidas['eliminar_s']:9.0f}/s")
+    return resultados
+
+def benchmark_busqueda(args):
+    from nucleo.reproduccion import OBJETIVO_BUSQUEDA_MS, comparar_busqueda
+
+    resultados = comparar_busqueda()
+    print(f"{'crear_indice':<14} {resultados['crear_indice_ms'] / 1000:8.1f} s")
+    for caso, medidas in resultados["consultas"].items():
+        cumple = "sí" if medidas["p99_ms"] < OBJETIVO_BUSQUEDA_MS else "no"
+        print(f"{caso:<14} media {medidas['media_ms']:7.3f} ms  p50 {medidas['p50_ms']:7.3f} ms  "
+              f"p99 {medidas['p99_ms']:7.3f} ms  p99 < {OBJETIVO_BUSQUEDA_MS:g} ms: {cumple}")
+    for medida in ("agregar_ms", "quitar_ms", "recorrido_lineal_ms"):
+        print(f"{medida.removesuffix('_ms'):<14} {resultados[medida]:8.3f} ms")
+    return resultados
+
+def benchmark_formatos(args):
+    from nucleo.reproduccion import comparar_formatos
+
+    resultados = comparar_formatos()
+    for formato, medidas in resultados.items():
+        guardar = f"{medidas['guardar_s']:6.2f} s" if medidas['guardar_s'] is not None else "     -  "
+        print(f"{formato:<14} guardar {guardar}  cargar {medidas['cargar_s']:6.2f} s  {medidas['bytes']:>11} bytes")
+    return resultados
+
+def benchmark_diario(args):
+    from nucleo.reproduccion import comparar_diario
+
+    resultados = comparar_diario()
+    for estrategia, medidas in resultados.items():
+        linea = (f"{estrategia:<12} ediciones {medidas['ediciones_s']:6.2f} s  "
+                 f"{medidas['bytes_escritos']:>12} bytes  amplificación {medidas['amplificacion']:8.1f}x")
+        if "recuperar_s" in medidas:
+            linea += f"  recuperar {medidas['recuperar_s']:.2f} s"
+        print(linea)
+    return resultados
+
+def benchmark_copias(args):
+    from nucleo.reproduccion import comparar_copias
+
+    resultados = comparar_copias()
+    for estrategia, medidas in resultados.items():
+        print(f"{estrategia:<18} {medidas['ms_por_copia']:10.3f} ms/copia  "
+              f"{medidas['bytes_por_copia']:>14,.0f} bytes/copia")
+    return resultados
+
+def benchmark_edicion(args):
+    from nucleo.prioridad import comparar_edicion
+
+    resultados = comparar_edicion()
+    for version, medidas in resultados.items():
+        print(f"{version:<10} " + "  ".join(f"{operacion[:-3]} {ms:10.4f} ms" for operacion, ms in medidas.items()))
+    return resultados
+
+def benchmark_motores(args):
+    from nucleo.prioridad import comparar_motores
+
+    resultados = comparar_motores()
+    for ancho, medidas in resultados.items():
+        print(f"prioridades 0..{ancho - 1:<9} heap {medidas['heap_us']:7.2f} µs  "
+              f"cubetas {medidas['cubetas_us']:7.2f} µs  auto: {medidas['auto']}")
+    return resultados
+
+def benchmark_historial(args):
+    from nucleo.prioridad import comparar_historial
+
+    resultados = comparar_historial()
+    for entradas, medidas in resultados.items():
+        linea = (f"{entradas:>9} entradas  lista {medidas['lista_bytes'] / 2**20:8.1f} MiB "
+                 f"refresco {medidas['lista_refresco_ms']:8.2f} ms  historial {medidas['historial_bytes'] / 2**20:6.2f} MiB "
+                 f"refresco {medidas['historial_refresco_ms']:6.3f} ms")
+        if "pagina_ms" in medidas:
+            linea += f"  página antigua {medidas['pagina_ms']:.3f} ms"
+        print(linea)
+    return resultados
+
+def benchmark_concurrencia(args):
+    from nucleo.prioridad import comparar_concurrencia
+
+    resultados = comparar_concurrencia()
+    for variante, por_segundo in resultados.items():
+        print(f"{variante:<32} {por_segundo:12,.0f} elementos/s")
+    return resultados
+
+BENCHMARKS = {
+    "arranque": benchmark_arranque,
+    "tuberia": benchmark_tuberia,
+    "parentesis": benchmark_parentesis,
+    "reparacion": benchmark_reparacion,
+    "aleatorio": benchmark_aleatorio,
+    "almacenamiento": benchmark_almacenamiento,
+    "busqueda": benchmark_busqueda,
+    "formatos": benchmark_formatos,
+    "diario": benchmark_diario,
+    "copias": benchmark_copias,
+    "edicion": benchmark_edicion,
+    "motores": benchmark_motores,
+    "historial": benchmark_historial,
+    "concurrencia": benchmark_concurrencia,
+}
+
+def comando_benchmark(args):
+    resultados = BENCHMARKS[args.nombre](args)
+    if args.registro:
+        # Se añade una línea por ejecución para poder seguir la evolución en el tiempo
+        with open(args.registro, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                                "benchmark": args.nombre, "resultados": resultados},
+                               ensure_ascii=False) + "\n")
+    return 0
+
+# ---------------------- PROGRAMA PRINCIPAL ----------------------
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="python -m nucleo",
+                                     description="Procesa archivos por lotes con la lógica de los ejercicios.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    p = comandos.add_parser("texto", help="Ejercicio 1: transforma archivos de texto")
+    p.add_argument("operacion", choices=ALIAS_TEXTO)
+    p.add_argument("archivos", nargs="+")
+    p.add_argument("--salida", help="carpeta para los resultados (por defecto, junto a cada archivo)")
+    p.set_defaults(funcion=comando_texto)
+
+    p = comandos.add_parser("parentesis", help="Ejercicio 2: verifica el balanceo de paréntesis")
+    p.add_argument("archivos", nargs="+", help="archivos a verificar ('-' para la entrada estándar)")
+    p.add_argument("--estado", help="punto de control JSON: si existe se continúa desde él "
+                                    "(la entrada se vuelve a leer desde el principio y se salta lo ya verificado)")
+    p.add_argument("--reporte", help="modo por lotes: verifica en paralelo (las carpetas se recorren) "
+                                     "y escribe un reporte JSON-lines")
+    p.add_argument("--procesos", type=int, help="procesos del modo por lotes (por defecto, uno por núcleo)")
+    p.add_argument("--corregir", action="store_true",
+                   help="modo por lotes: escribe junto a cada archivo con errores su versión corregida")
+    p.set_defaults(funcion=comando_parentesis)
+
+    p = comandos.add_parser("canciones", help="Ejercicio 3: carga listas de reproducción")
+    p.add_argument("archivos", nargs="+")
+    p.add_argument("--buscar", help="nombre de una canción a buscar en cada lista")
+    almacenamiento = p.add_mutually_exclusive_group()
+    almacenamiento.add_argument("--compacta", action="store_true",
+                                help="guarda las canciones en arrays en lugar de un objeto por canción (menos memoria)")
+    almacenamiento.add_argument("--persistente", action="store_true",
+                                help="guarda las canciones en un árbol persistente (ListaPersistente, copias en O(1))")
+    p.set_defaults(funcion=comando_canciones)
+
+    p = comandos.add_parser("prioridad", help="Ejercicio 4: desencola archivos con líneas 'nombre,prioridad'")
+    p.add_argument("archivos", nargs="+")
+    p.add_argument("--motor", choices=("auto", "heap", "cubetas"), default="auto",
+                   help="heap (empates por nombre) o cubetas (empates por orden de llegada); "
+                        "auto elige cubetas si se indica una --prioridad-maxima pequeña")
+    p.add_argument("--prioridad-maxima", type=int, help="mayor prioridad esperada")
+    p.set_defaults(funcion=comando_prioridad)
+
+    p = comandos.add_parser("enlazada", help="Ejercicio 5: carga archivos de enteros en una lista enlazada")
+    p.add_argument("archivos", nargs="+")
+    p.add_argument("--buscar", type=int, help="valor a buscar en cada lista")
+    p.set_defaults(funcion=comando_enlazada)
+
+    p = comandos.add_parser("benchmark", help="ejecuta un benchmark")
+    p.add_argument("nombre", choices=BENCHMARKS)
+    p.add_argument("--registro", help="archivo JSON-lines donde se añaden los resultados")
+    p.set_defaults(funcion=comando_benchmark)
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    return args.funcion(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# Lógica del Ejercicio 5 (lista enlazada simple), sin dependencias de Tkinter
+
+# ---------------------- NODO DE LA LISTA ENLAZADA ----------------------
+class Node:
+    def __init__(self, data):
+        self.data = data      # Guarda el valor del nodo
+        self.next = None      # Apunta al siguiente nodo (None si es el último)
+
+# ---------------------- LISTA ENLAZADA SIMPLE ----------------------
+class LinkedList:
+    def __init__(self):
+        self.head = None      # Referencia al primer nodo de la lista
+
+    def append(self, data):
+        # Agrega un nuevo nodo al final de la lista
+        new_node = Node(data)
+        if not self.head:
+            self.head = new_node   # Si la lista está vacía, el nuevo nodo es la cabeza
+        else:
+            current = self.head
+            while current.next:    # Recorre hasta el último nodo
+                current = current.next
+            current.next = new_node  # Enlaza el nuevo nodo al final
+
+    def buscar(self, valor):
+        # Busca todas las posiciones donde aparece el valor en la lista
+        posiciones = []
+        current = self.head
+        index = 0
+        while current:
+            if current.data == valor:
+                posiciones.append(index)
+            current = current.next
+            index += 1
+        return posiciones
+
+    def mostrar_lista(self):
+        # Devuelve un string con todos los valores de la lista enlazada
+        elementos = []
+        actual = self.head
+        while actual:
+            elementos.append(str(actual.data))
+            actual = actual.next
+        return " → ".join(elementos) if elementos else "Vacía"
+
+    def eliminar(self, valor):
+        # Elimina el primer nodo que contenga el valor dado
+        actual = self.head
+        anterior = None
+        while actual:
+            if actual.data == valor:
+                if anterior:
+                    anterior.next = actual.next  # Elimina nodo intermedio o final
+                else:
+                    self.head = actual.next      # Elimina el primer nodo
+                return True
+            anterior = actual
+            actual = actual.next
+        return False
+
+    def vaciar(self):
+        # Elimina todos los nodos de la lista
+        self.head = None
+
+# ---------------------- FUNCIÓN AUXILIAR PARA VALIDAR ENTEROS ----------------------
+def es_entero(valor):
+    """Devuelve True si el valor es un número entero (positivo o negativo)."""
+    try:
+        int(valor)
+        return True
+    except ValueError:
+        return False
@@ -0,0 +1,812 @@
+# Lógica del Ejercicio 2 (paréntesis balanceados), sin dependencias de Tkinter
+
+import itertools
+import json
+import os
+import random
+import re
+import time
+import timeit
+
+# Expresión que localiza solo los paréntesis: el resto del texto se salta sin pasar por Python
+_PARENTESIS = re.compile(r'[(){}\[\]]')
+_DENSIDAD_MAXIMA = 0.1   # Fracción de paréntesis a partir de la cual conviene recorrer carácter a carácter
+
+def _recorrer_parentesis(cadena):
+    """
+    Devuelve pares (posición, carácter) que incluyen todos los paréntesis de la cadena.
+    Con pocos paréntesis salta directamente de uno a otro con la expresión regular; con
+    muchos, recorrer todos los caracteres sale más barato que crear un objeto por coincidencia.
+    Contar los paréntesis con str.count() es casi gratis comparado con cualquiera de los dos.
+    """
+    if sum(map(cadena.count, '(){}[]')) > len(cadena) * _DENSIDAD_MAXIMA:
+        return enumerate(cadena)
+    return ((coincidencia.start(), coincidencia.group()) for coincidencia in _PARENTESIS.finditer(cadena))
+
+# ---------------------- FUNCIÓN PARA VERIFICAR PARÉNTESIS ----------------------
+
+def verificar_balanceo_detallado(cadena):
+    """
+    Verifica si los paréntesis (), {}, [] están balanceados en la cadena.
+    Si hay un error, indica el tipo de paréntesis y la posición exacta (empezando en 1).
+    Devuelve: (balanceado: bool, mensaje: str, resumen: dict)
+    """
+    pila = []  # Lista que funcionará como pila para guardar los paréntesis de apertura y su posición
+    pares = {')': '(', '}': '{', ']': '['}  # Diccionario que indica qué apertura corresponde a cada cierre
+    resumen = {'(': 0, ')': 0, '{': 0, '}': 0, '[': 0, ']': 0}  # Diccionario para contar cada tipo de paréntesis
+
+    # Recorre los paréntesis de la cadena junto con su índice, saltándose el resto del texto
+    for i, char in _recorrer_parentesis(cadena):
+        # Si el carácter es un paréntesis de apertura
+        if char in '({[':
+            pila.append((char, i))    # Guarda el tipo de paréntesis y su posición en la pila
+            resumen[char] += 1        # Suma uno al contador de ese tipo de apertura
+        # Si el carácter es un paréntesis de cierre
+        elif char in ')}]':
+            resumen[char] += 1        # Suma uno al contador de ese tipo de cierre
+            if not pila:
+                # Si la pila está vacía, significa que hay un cierre sin apertura previa
+                return False, f"Error: paréntesis de cierre '{char}' sin apertura en posición {i+1}.", resumen
+            ultimo, pos_ultimo = pila[-1]  # Obtiene el último paréntesis de apertura pendiente y su posición
+            if ultimo != pares[char]:
+                # Si el tipo de apertura no coincide con el cierre, hay un error de correspondencia
+                return False, (
+                    f"Error: paréntesis de cierre '{char}' en posición {i+1} no coincide con "
+                    f"el de apertura '{ultimo}' en posición {pos_ultimo+1}."
+                ), resumen
+            pila.pop()  # Si coincide, elimina ese paréntesis de apertura de la pila
+
+    # Si al final quedan aperturas sin cerrar en la pila
+    if pila:
+        char, pos = pila[-1]  # Toma el primer paréntesis de apertura sin cerrar y su posición
+        return False, f"Error: paréntesis de apertura '{char}' sin cerrar en posición {pos+1}.", resumen
+
+    # Si no hubo errores, retorna que está balanceado
+    return True, "✅ Paréntesis balanceados correctamente.", resumen
+
+# ---------------------- PERFIL DE PROFUNDIDAD DE LOS PARÉNTESIS ----------------------
+
+def _numpy():
+    """Devuelve el módulo numpy, o None si no está instalado (solo se importa cuando hace falta)"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def perfil_profundidad(cadena):
+    """
+    Analiza la profundidad de anidamiento de los paréntesis de la cadena.
+    Devuelve un dict con:
+      'balanceado', 'mensaje', 'resumen': lo mismo que verificar_balanceo_detallado()
+      'profundidad': profundidad total tras cada carácter (un arreglo de numpy si está instalado)
+      'profundidad_maxima', 'posicion_maxima': mayor profundidad y dónde se alcanza por primera vez
+      'por_tipo': para '(', '[' y '{', un dict {'maxima', 'posicion'} contando solo ese tipo
+    Las posiciones empiezan en 1, como en los mensajes. Si numpy está instalado el cálculo
+    se hace con operaciones vectorizadas; si no, con un recorrido en Python.
+    """
+    np = _numpy()
+    if np is None:
+        return _perfil_python(cadena)
+    return _perfil_numpy(np, cadena)
+
+def _perfil_python(cadena):
+    balanceado, mensaje, resumen = verificar_balanceo_detallado(cadena)
+    delta = {'(': 1, '[': 1, '{': 1, ')': -1, ']': -1, '}': -1}
+    apertura = {'(': '(', ')': '(', '[': '[', ']': '[', '{': '{', '}': '{'}
+    profundidad = []
+    total = maxima = 0
+    posicion_maxima = None
+    por_tipo = {'(': {'maxima': 0, 'posicion': None}, '[': {'maxima': 0, 'posicion': None},
+                '{': {'maxima': 0, 'posicion': None}}
+    actual = {'(': 0, '[': 0, '{': 0}
+    for i, char in enumerate(cadena):
+        if char in delta:
+            total += delta[char]
+            tipo = apertura[char]
+            actual[tipo] += delta[char]
+            if total > maxima:
+                maxima, posicion_maxima = total, i + 1
+            if actual[tipo] > por_tipo[tipo]['maxima']:
+                por_tipo[tipo] = {'maxima': actual[tipo], 'posicion': i + 1}
+        profundidad.append(total)
+    return {
+        'balanceado': balanceado, 'mensaje': mensaje, 'resumen': resumen,
+        'profundidad': profundidad, 'profundidad_maxima': maxima,
+        'posicion_maxima': posicion_maxima, 'por_tipo': por_tipo,
+    }
+
+def _perfil_numpy(np, cadena):
+    simbolos = '()[]{}'                                  # Ordenados por código, para searchsorted
+    codigos_parentesis = np.array([ord(c) for c in simbolos], dtype=np.uint32)
+    # Un código por carácter; con 'surrogatepass' un sustituto suelto ('\ud800') también
+    # da su código en vez de lanzar UnicodeEncodeError
+    codigos = np.frombuffer(cadena.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+    posiciones = np.flatnonzero(np.isin(codigos, codigos_parentesis))
+    clase = np.searchsorted(codigos_parentesis, codigos[posiciones])    # 0..5 según 'simbolos'
+    es_apertura = clase % 2 == 0
+    tipo = clase // 2                                                     # 0 '()', 1 '[]', 2 '{}'
+    delta = np.where(es_apertura, 1, -1)
+
+    # Profundidad total en cada carácter y solo en los paréntesis
+    cambios = np.zeros(len(codigos), dtype=np.int64)
+    cambios[posiciones] = delta
+    profundidad = np.cumsum(cambios)
+    profundidad_parentesis = np.cumsum(delta)
+
+    # Nivel de cada paréntesis: una apertura abre el nivel al que sube y un cierre cierra el nivel
+    # del que baja. Ordenando de forma estable por nivel, cada cierre queda justo después de la
+    # apertura que cierra, así que los errores de tipo se ven sin recorrer una pila.
+    nivel = np.where(es_apertura, profundidad_parentesis, profundidad_parentesis + 1)
+    orden = np.argsort(nivel, kind='stable')
+    cierres = np.flatnonzero(~es_apertura[orden][1:]) + 1                # Índices en 'orden'
+    cierres = cierres[nivel[orden][cierres - 1] == nivel[orden][cierres]]
+    cierre = orden[cierres]
+    pareja = orden[cierres - 1]
+    distintos = (tipo[cierre] != tipo[pareja]) | ~es_apertura[pareja]
+
+    # Primer error: un cierre que deja la profundidad negativa o que no coincide con su apertura
+    negativos = np.flatnonzero(profundidad_parentesis < 0)
+    sin_apertura = negativos[0] if len(negativos) else len(posiciones)
+    no_coinciden = cierre[distintos]
+    no_coinciden = no_coinciden[no_coinciden < sin_apertura]
+    primer_error = min(sin_apertura, no_coinciden.min() if len(no_coinciden) else len(posiciones))
+
+    # Conteo con bincount hasta el error incluido, igual que verificar_balanceo_detallado()
+    conteo = np.bincount(clase[:primer_error + 1], minlength=6)
+    resumen = {c: int(conteo[simbolos.index(c)]) for c in '(){}[]'}
+
+    if primer_error < len(posiciones):
+        char = simbolos[clase[primer_error]]
+        pos = posiciones[primer_error] + 1
+        if primer_error == sin_apertura:
+            balanceado, mensaje = False, f"Error: paréntesis de cierre '{char}' sin apertura en posición {pos}."
+        else:
+            apertura = pareja[np.flatnonzero(cierre == primer_error)[0]]
+            balanceado, mensaje = False, (
+                f"Error: paréntesis de cierre '{char}' en posición {pos} no coincide con "
+                f"el de apertura '{simbolos[clase[apertura]]}' en posición {posiciones[apertura] + 1}."
+            )
+    elif len(posiciones) and profundidad_parentesis[-1] > 0:
+        # La última apertura sin cerrar es la última que abrió el nivel más profundo que quedó abierto
+        abiertas = np.flatnonzero(es_apertura & (nivel == profundidad_parentesis[-1]))
+        ultima = abiertas[-1]
+        balanceado, mensaje = False, (
+            f"Error: paréntesis de apertura '{simbolos[clase[ultima]]}' sin cerrar en posición {posiciones[ultima] + 1}."
+        )
+    else:
+        balanceado, mensaje = True, "✅ Paréntesis balanceados correctamente."
+
+    por_tipo = {}
+    for t, char in enumerate('([{'):
+        del_tipo = tipo == t
+        profundidad_tipo = np.cumsum(delta[del_tipo])
+        if len(profundidad_tipo) and profundidad_tipo.max() > 0:
+            k = int(np.argmax(profundidad_tipo))
+            por_tipo[char] = {'maxima': int(profundidad_tipo[k]), 'posicion': int(posiciones[del_tipo][k]) + 1}
+        else:
+            por_tipo[char] = {'maxima': 0, 'posicion': None}
+
+    maxima = int(profundidad_parentesis.max()) if len(posiciones) else 0
+    return {
+        'balanceado': balanceado, 'mensaje': mensaje, 'resumen': resumen,
+        'profundidad': profundidad,
+        'profundidad_maxima': max(maxima, 0),
+        'posicion_maxima': int(posiciones[np.argmax(profundidad_parentesis)]) + 1 if maxima > 0 else None,
+        'por_tipo': por_tipo,
+    }
+
+# ---------------------- FUNCIÓN PARA CORREGIR PARÉNTESIS AUTOMÁTICAMENTE ----------------------
+
+def corregir_parentesis(cadena):
+    """
+    Corrige la cadena agregando los paréntesis de cierre faltantes al final
+    y eliminando los de cierre que no tienen apertura correspondiente.
+    Devuelve la cadena corregida y balanceada.
+    """
+    pila = []       # Pila para guardar los paréntesis de apertura pendientes
+    resultado = []  # Lista para construir la cadena corregida
+    pares = {')': '(', '}': '{', ']': '['}      # Diccionario de cierre -> apertura
+    apertura = {'(': ')', '{': '}', '[': ']'}   # Diccionario de apertura -> cierre
+
+    anterior = 0    # Inicio del texto que todavía no se copió al resultado
+
+    # Recorre los paréntesis de la cadena, saltándose el resto del texto
+    for i, char in _recorrer_parentesis(cadena):
+        if char in '({[':
+            pila.append(char)        # Guarda la apertura en la pila
+        elif char in ')}]':
+            # Si hay una apertura correspondiente en la pila y coincide con el cierre actual
+            if pila and pila[-1] == pares[char]:
+                pila.pop()           # Elimina la apertura de la pila
+                continue
+            # Si hay un cierre sin apertura, copia el texto anterior y se salta el cierre
+            resultado.append(cadena[anterior:i])
+            anterior = i + 1
+    resultado.append(cadena[anterior:])  # Copia el resto del texto de una vez
+
+    # Al final, agrega los cierres faltantes para cada apertura que quedó pendiente
+    while pila:
+        resultado.append(apertura[pila.pop()])
+    return ''.join(resultado)  # Devuelve la cadena corregida y balanceada
+
+# ---------------------- REPARACIÓN CON EL MÍNIMO NÚMERO DE EDICIONES ----------------------
+#
+# Cada paréntesis que se queda sin pareja cuesta exactamente una edición (se elimina, o se
+# inserta su cierre), así que reparar con el mínimo de ediciones equivale a emparejar bien
+# anidados el mayor número posible de paréntesis. Las parejas que ya se cierran directamente
+# (sin nada pendiente en medio) están en alguna solución óptima, de modo que una pasada con
+# pila deja solo el residuo conflictivo, que se resuelve con la tabla exacta si no pasa de
+# LIMITE_EXACTO paréntesis. La tabla cuesta O(k²) memoria y O(k³) tiempo, así que un residuo
+# más largo se alinea racha a racha en memoria acotada: ese camino es aproximado (puede hacer
+# más ediciones de las mínimas) y reparar_parentesis() lo indica en su resultado.
+
+LIMITE_EXACTO = 320          # Residuo máximo para la tabla exacta (peor caso ~0.5 s, ver comparar_limite_exacto)
+LIMITE_DIFERENCIAS = 64      # Ediciones máximas que se buscan al alinear una racha de cierres
+_CIERRE_DE = {'(': ')', '{': '}', '[': ']'}
+_APERTURA_DE = {')': '(', '}': '{', ']': '['}
+
+def _reducir(indices, chars, pareja):
+    """
+    Empareja con una pila los paréntesis que se cierran directamente y anota las parejas.
+    Devuelve: lista de índices que quedaron sin pareja, en orden.
+    """
+    pila = []
+    for t in indices:
+        char = chars[t]
+        if char in _APERTURA_DE and pila and chars[pila[-1]] == _APERTURA_DE[char]:
+            abierto = pila.pop()
+            pareja[abierto] = t
+            pareja[t] = abierto
+        else:
+            pila.append(t)
+    return pila
+
+def _emparejar_exacto(tramo, chars, pareja):
+    """
+    Empareja de forma óptima los paréntesis del tramo (índices de chars) con la tabla de
+    intervalos: mejor[i][j] es el máximo de parejas bien anidadas en tramo[i:j].
+    Usa O(k²) memoria y O(k³) tiempo en el peor caso para un tramo de k paréntesis.
+    """
+    k = len(tramo)
+    tipos = [chars[t] for t in tramo]
+    cierres = {c: [j for j in range(k) if tipos[j] == c] for c in ')}]'}
+    mejor = [[0] * (k + 1) for _ in range(k + 2)]
+
+    for i in range(k - 1, -1, -1):
+        fila = mejor[i]
+        siguiente = mejor[i + 1]
+        candidatos = [m for m in cierres.get(_CIERRE_DE.get(tipos[i]), ()) if m > i]
+        for j in range(i + 1, k + 1):
+            valor = siguiente[j]                       # tramo[i] se queda sin pareja
+            for m in candidatos:
+                if m >= j:
+                    break
+                valor = max(valor, 1 + siguiente[m] + mejor[m + 1][j])   # tramo[i] con tramo[m]
+            fila[j] = valor
+
+    # Reconstruye las parejas elegidas
+    intervalos = [(0, k)]
+    while intervalos:
+        i, j = intervalos.pop()
+        if j - i < 2:
+            continue
+        if mejor[i][j] == mejor[i + 1][j]:
+            intervalos.append((i + 1, j))
+            continue
+        for m in cierres[_CIERRE_DE[tipos[i]]]:
+            if i < m < j and mejor[i][j] == 1 + mejor[i + 1][m] + mejor[m + 1][j]:
+                pareja[tramo[i]] = tramo[m]
+                pareja[tramo[m]] = tramo[i]
+                intervalos.append((i + 1, m))
+                intervalos.append((m + 1, j))
+                break
+
+def _alinear_cierres(cierres, pila, chars, pareja):
+    """
+    Empareja una racha de cierres con las aperturas pendientes de la pila (de la cima hacia
+    abajo) con el algoritmo O(ND) de Myers: saltarse un cierre (se elimina) o una apertura
+    (queda encerrada y se le inserta su cierre) cuesta una edición, y se busca el camino con
+    menos ediciones que consume toda la racha. Con pocos errores es casi lineal. Si hacen falta
+    más de LIMITE_DIFERENCIAS ediciones, la racha se empareja con la pila sin más.
+    Quita de la pila las aperturas emparejadas y las que quedaron encerradas.
+    """
+    n = len(cierres)
+    m = len(pila)
+
+    def avanzar(x, y):
+        # Sigue la diagonal mientras el cierre x corresponda a la apertura y (contando desde la cima)
+        while x < n and y < m and chars[pila[m - 1 - y]] == _APERTURA_DE[chars[cierres[x]]]:
+            x += 1
+            y += 1
+        return x
+
+    anterior = {1: (0, None, 0)}    # Diagonal k = x - y -> (x alcanzado, diagonal previa, x al empezar la diagonal)
+    trazas = []
+    for d in range(LIMITE_DIFERENCIAS + 1):
+        actual = {}
+        for k in range(-d, d + 1, 2):
+            abajo = anterior.get(k + 1)       # Saltarse una apertura
+            derecha = anterior.get(k - 1)     # Saltarse un cierre
+            if abajo and (not derecha or abajo[0] >= derecha[0] + 1):
+                x, previa = abajo[0], k + 1
+            elif derecha:
+                x, previa = derecha[0] + 1, k - 1
+            else:
+                continue
+            if x > n or x - k > m:
+                continue
+            actual[k] = (avanzar(x, x - k), previa, x)
+            if actual[k][0] == n:
+                trazas.append(actual)
+                return _aplicar_alineacion(trazas, k, cierres, pila, pareja)
+        trazas.append(actual)
+        anterior = actual
+
+    # Demasiados errores juntos: cada cierre solo se empareja con la cima si coincide
+    for t in cierres:
+        if pila and chars[pila[-1]] == _APERTURA_DE[chars[t]]:
+            abierto = pila.pop()
+            pareja[abierto] = t
+            pareja[t] = abierto
+
+def _aplicar_alineacion(trazas, k, cierres, pila, pareja):
+    """Recorre hacia atrás el camino que encontró _alinear_cierres() y anota las parejas."""
+    m = len(pila)
+    profundidad = 0                   # Aperturas de la pila que quedan emparejadas o encerradas
+    for d in range(len(trazas) - 1, -1, -1):
+        fin, previa, inicio = trazas[d][k]
+        for x in range(inicio, fin):  # Diagonal: cada cierre con su apertura
+            abierto = pila[m - 1 - (x - k)]
+            pareja[abierto] = cierres[x]
+            pareja[cierres[x]] = abierto
+            profundidad = max(profundidad, x - k + 1)
+        k = previa
+    del pila[m - profundidad:]
+
+def _emparejar_residuo(residuo, chars, pareja):
+    """
+    Empareja el residuo que dejó la pila. Si es corto se usa la tabla exacta; si no, se
+    recorre manteniendo las aperturas pendientes y cada racha de cierres se alinea con ellas,
+    sin garantía de emparejar el máximo posible.
+    Devuelve: True si el emparejamiento es óptimo.
+    """
+    # Los cierres del principio y las aperturas del final no tienen con quién emparejarse
+    inicio = next((p for p, t in enumerate(residuo) if chars[t] in _CIERRE_DE), len(residuo))
+    fin = next((p + 1 for p in range(len(residuo) - 1, inicio - 1, -1)
+                if chars[residuo[p]] in _APERTURA_DE), inicio)
+    medio = residuo[inicio:fin]
+    if len(medio) <= LIMITE_EXACTO:
+        _emparejar_exacto(medio, chars, pareja)
+        return True
+
+    pila = []
+    for es_cierre, racha in itertools.groupby(medio, key=lambda t: chars[t] in _APERTURA_DE):
+        if es_cierre:
+            _alinear_cierres(list(racha), pila, chars, pareja)
+        else:
+            pila.extend(racha)
+    return False
+
+def reparar_parentesis(cadena):
+    """
+    Repara la cadena con inserciones y eliminaciones de paréntesis, el mínimo número posible
+    salvo que el residuo conflictivo pase de LIMITE_EXACTO paréntesis (ver 'exacta').
+    Los cierres sobrantes se eliminan y, para cada apertura sin pareja, se inserta su cierre
+    justo antes del cierre del paréntesis que la contiene (o al final si no la contiene ninguno).
+    Devuelve: (cadena corregida, ediciones, exacta) donde cada edición es ('eliminar', posición,
+    paréntesis) o ('insertar', posición, paréntesis), con posiciones de la cadena original
+    empezando en 0, y 'exacta' es False si la reparación es aproximada y puede sobrar alguna
+    edición. Cada inserción va delante del carácter que ocupa esa posición.
+    """
+    posiciones = []
+    chars = []
+    for i, char in _recorrer_parentesis(cadena):
+        if char in '(){}[]':
+            posiciones.append(i)
+            chars.append(char)
+    pareja = [-1] * len(chars)    # Índice del paréntesis emparejado con cada uno, o -1
+
+    residuo = _reducir(range(len(chars)), chars, pareja)
+    exacta = _emparejar_residuo(residuo, chars, pareja)
+
+    # Ediciones en orden de posición
+    ediciones = []
+    ambitos = [[]]                # Aperturas sin pareja dentro de cada pareja abierta
+    for t, char in enumerate(chars):
+        otro = pareja[t]
+        if otro < 0:
+            if char in _CIERRE_DE:
+                ambitos[-1].append(char)
+            else:
+                ediciones.append(('eliminar', posiciones[t], char))
+        elif otro > t:
+            ambitos.append([])
+        else:
+            for apertura in reversed(ambitos.pop()):
+                ediciones.append(('insertar', posiciones[t], _CIERRE_DE[apertura]))
+    for apertura in reversed(ambitos.pop()):
+        ediciones.append(('insertar', len(cadena), _CIERRE_DE[apertura]))
+
+    # Aplica las ediciones copiando el texto intermedio en trozos
+    partes = []
+    anterior = 0
+    for tipo, pos, char in ediciones:
+        partes.append(cadena[anterior:pos])
+        if tipo == 'eliminar':
+            anterior = pos + 1
+        else:
+            partes.append(char)
+            anterior = pos
+    partes.append(cadena[anterior:])
+    return ''.join(partes), ediciones, exacta
+
+# ---------------------- VERIFICACIÓN INCREMENTAL POR FRAGMENTOS ----------------------
+
+class VerificadorIncremental:
+    """
+    Verifica el balanceo de un texto que llega por fragmentos (por ejemplo, desde una tubería).
+    Solo guarda la pila de aperturas pendientes, el conteo de paréntesis y la posición global,
+    así que la memoria no depende del tamaño total del texto. Los mensajes y posiciones son
+    los mismos que daría verificar_balanceo_detallado() con el texto completo.
+    El estado se puede guardar en JSON para continuar una verificación larga tras un reinicio.
+    """
+    pares = {')': '(', '}': '{', ']': '['}
+
+    def __init__(self):
+        self.pila = []          # Aperturas pendientes como pares (paréntesis, posición)
+        self.posicion = 0       # Cantidad de caracteres procesados hasta ahora
+        self.resumen = {'(': 0, ')': 0, '{': 0, '}': 0, '[': 0, ']': 0}
+        self.error = None       # Mensaje del primer error encontrado
+        self.posiciones_error = []  # Posiciones (desde 0) de los paréntesis que causan el error
+
+    def feed(self, fragmento):
+        """
+        Procesa el siguiente fragmento del texto.
+        Devuelve el mensaje del primer error en cuanto aparece (también en las llamadas
+        siguientes, que ya no procesan nada), o None si de momento todo está bien.
+        """
+        if self.error:
+            return self.error
+        pila = self.pila
+        resumen = self.resumen
+        base = self.posicion
+        for i, char in _recorrer_parentesis(fragmento):
+            i += base
+            if char in '({[':
+                pila.append((char, i))
+                resumen[char] += 1
+            elif char in ')}]':
+                resumen[char] += 1
+                if not pila:
+                    self.error = f"Error: paréntesis de cierre '{char}' sin apertura en posición {i+1}."
+                    self.posiciones_error = [i]
+                elif pila[-1][0] != self.pares[char]:
+                    ultimo, pos_ultimo = pila[-1]
+                    self.error = (
+                        f"Error: paréntesis de cierre '{char}' en posición {i+1} no coincide con "
+                        f"el de apertura '{ultimo}' en posición {pos_ultimo+1}."
+                    )
+                    self.posiciones_error = [pos_ultimo, i]
+                else:
+                    pila.pop()
+                    continue
+                self.posicion = i + 1
+                return self.error
+        self.posicion += len(fragmento)
+        return None
+
+    def finalizar(self):
+        """
+        Indica que el texto terminó.
+        Devuelve: (balanceado: bool, mensaje: str, resumen: dict), igual que verificar_balanceo_detallado()
+        """
+        if self.error:
+            return False, self.error, self.resumen
+        if self.pila:
+            char, pos = self.pila[-1]
+            return False, f"Error: paréntesis de apertura '{char}' sin cerrar en posición {pos+1}.", self.resumen
+        return True, "✅ Paréntesis balanceados correctamente.", self.resumen
+
+    def marcas(self):
+        """Devuelve las posiciones (desde 0) de los paréntesis que habría que resaltar"""
+        if self.error:
+            return list(self.posiciones_error)
+        if self.pila:
+            return [self.pila[-1][1]]     # La apertura sin cerrar que indica finalizar()
+        return []
+
+    def copiar(self):
+        """Devuelve un verificador independiente con el mismo estado"""
+        copia = VerificadorIncremental()
+        copia.pila = list(self.pila)
+        copia.posicion = self.posicion
+        copia.resumen = dict(self.resumen)
+        copia.error = self.error
+        copia.posiciones_error = list(self.posiciones_error)
+        return copia
+
+    def estado(self):
+        """Devuelve el estado como un dict que se puede convertir a JSON"""
+        return {
+            'pila': [[char, pos] for char, pos in self.pila],
+            'posicion': self.posicion,
+            'resumen': dict(self.resumen),
+            'error': self.error,
+            'posiciones_error': list(self.posiciones_error),
+        }
+
+    @classmethod
+    def desde_estado(cls, estado):
+        """Crea un verificador que continúa desde un estado devuelto por estado()"""
+        verificador = cls()
+        verificador.pila = [(char, pos) for char, pos in estado['pila']]
+        verificador.posicion = estado['posicion']
+        verificador.resumen = dict(estado['resumen'])
+        verificador.error = estado['error']
+        verificador.posiciones_error = list(estado.get('posiciones_error', []))
+        return verificador
+
+    def guardar(self, archivo):
+        """Guarda el estado en un archivo JSON (un punto de control)"""
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump(self.estado(), f, ensure_ascii=False)
+
+    @classmethod
+    def cargar(cls, archivo):
+        """Crea un verificador a partir de un punto de control guardado con guardar()"""
+        with open(archivo, 'r', encoding='utf-8') as f:
+            return cls.desde_estado(json.load(f))
+
+# ---------------------- VERIFICACIÓN DE UN DOCUMENTO QUE SE EDITA ----------------------
+
+INTERVALO_CONTROL = 4096   # Caracteres entre dos puntos de control del documento
+
+def _prefijo_comun(a, b):
+    """Longitud del prefijo común de dos cadenas, comparando trozos (búsqueda binaria)"""
+    bajo, alto = 0, min(len(a), len(b))
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if a[bajo:medio] == b[bajo:medio]:
+            bajo = medio
+        else:
+            alto = medio - 1
+    return bajo
+
+class VerificadorDocumento:
+    """
+    Verifica un documento que se va editando sin volver a recorrerlo desde el principio.
+    Guarda una copia del estado del verificador cada 'intervalo' caracteres; tras una edición
+    en la posición k solo se recorre desde el último punto de control anterior a k.
+    """
+    def __init__(self, intervalo=INTERVALO_CONTROL):
+        self.intervalo = intervalo
+        self.texto = ''
+        self.controles = [VerificadorIncremental()]   # controles[i]: estado en la posición i * intervalo
+        self.verificador = VerificadorIncremental()
+
+    def actualizar(self, texto, desde=None):
+        """
+        Verifica la nueva versión del documento. 'desde' es la primera posición que cambió;
+        si no se indica, se calcula comparando con la versión anterior.
+        Devuelve: (balanceado, mensaje, resumen), igual que verificar_balanceo_detallado()
+        """
+        if desde is None:
+            desde = _prefijo_comun(self.texto, texto)
+        indice = min(desde // self.intervalo, len(self.controles) - 1)
+        del self.controles[indice + 1:]                # Los controles posteriores ya no valen
+        verificador = self.controles[indice].copiar()
+
+        inicio = indice * self.intervalo
+        while inicio < len(texto) and not verificador.feed(texto[inicio:inicio + self.intervalo]):
+            inicio += self.intervalo
+            if inicio < len(texto):
+                self.controles.append(verificador.copiar())
+        self.texto = texto
+        self.verificador = verificador
+        return verificador.finalizar()
+
+    def marcas(self):
+        """Posiciones (desde 0) de los paréntesis que causan el error actual"""
+        return self.verificador.marcas()
+
+# ---------------------- VALIDACIÓN DE MUCHOS ARCHIVOS EN PARALELO ----------------------
+
+def validar_archivo(ruta, corregir=False):
+    """
+    Verifica un archivo y, si 'corregir' es True y no está balanceado, escribe la versión
+    corregida junto a él (plantilla.html -> plantilla.corregido.html).
+    Devuelve: dict con 'archivo', 'balanceado', 'mensaje', 'posicion' (del primer error,
+    empezando en 1, o None), 'resumen' y 'corregido' (ruta escrita o None).
+    """
+    with open(ruta, 'r', encoding='utf-8') as f:
+        texto = f.read()
+    verificador = VerificadorIncremental()
+    verificador.feed(texto)
+    balanceado, mensaje, resumen = verificador.finalizar()
+    marcas = verificador.marcas()   # La última marca es el paréntesis donde se detecta el error
+    registro = {
+        'archivo': ruta,
+        'balanceado': balanceado,
+        'mensaje': mensaje,
+        'posicion': marcas[-1] + 1 if marcas else None,
+        'resumen': resumen,
+        'corregido': None,
+    }
+    if corregir and not balanceado:
+        base, extension = os.path.splitext(ruta)
+        registro['corregido'] = f"{base}.corregido{extension}"
+        with open(registro['corregido'], 'w', encoding='utf-8') as f:
+            f.write(corregir_parentesis(texto))
+    return registro
+
+def _validar_archivo_seguro(ruta, corregir):
+    """Como validar_archivo(), pero un archivo ilegible no detiene todo el lote"""
+    try:
+        return validar_archivo(ruta, corregir)
+    except (OSError, UnicodeDecodeError) as error:
+        return {'archivo': ruta, 'balanceado': False, 'mensaje': f"Error al leer el archivo: {error}",
+                'posicion': None, 'resumen': None, 'corregido': None}
+
+def validar_lote(rutas, reporte, procesos=None, corregir=False, tamano_lote=64):
+    """
+    Verifica muchos archivos repartiéndolos entre un grupo de procesos en lotes de
+    'tamano_lote' archivos. Cada resultado se escribe en cuanto llega como una línea JSON
+    del archivo 'reporte' (en el mismo orden que 'rutas'), y al final se añade una línea
+    'total' con el tiempo empleado y los archivos por segundo.
+    Devuelve: dict con 'archivos', 'con_errores', 'segundos' y 'archivos_s'.
+    """
+    from concurrent.futures import ProcessPoolExecutor   # Solo hace falta en el modo por lotes
+
+    inicio = time.perf_counter()
+    archivos = con_errores = 0
+    with open(reporte, 'w', encoding='utf-8') as salida, ProcessPoolExecutor(max_workers=procesos) as pool:
+        resultados = pool.map(_validar_archivo_seguro, rutas, itertools.repeat(corregir), chunksize=tamano_lote)
+        for registro in resultados:
+            salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            archivos += 1
+            con_errores += not registro['balanceado']
+        segundos = time.perf_counter() - inicio
+        total = {
+            'archivos': archivos,
+            'con_errores': con_errores,
+            'segundos': segundos,
+            'archivos_s': archivos / segundos if segundos > 0 else float('inf'),
+        }
+        salida.write(json.dumps({'total': total}) + "\n")
+    return total
+
+# ---------------------- BENCHMARK DEL RECORRIDO POR SALTOS ----------------------
+
+def _verificar_por_caracter(cadena):
+    """Recorrido original carácter a carácter (solo se usa como referencia en el benchmark)"""
+    pila = []
+    pares = {')': '(', '}': '{', ']': '['}
+    resumen = {'(': 0, ')': 0, '{': 0, '}': 0, '[': 0, ']': 0}
+    for i, char in enumerate(cadena):
+        if char in '({[':
+            pila.append((char, i))
+            resumen[char] += 1
+        elif char in ')}]':
+            resumen[char] += 1
+            if not pila or pila[-1][0] != pares[char]:
+                return False, i, resumen
+            pila.pop()
+    return not pila, None, resumen
+
+def generar_texto(longitud, densidad, semilla=0):
+    """
+    Genera un texto balanceado de 'longitud' caracteres en el que una fracción
+    'densidad' son paréntesis y el resto letras y espacios.
+    """
+    generador = random.Random(semilla)
+    cantidad = int(longitud * densidad) // 2 * 2   # Número par de paréntesis
+    cierres = {'(': ')', '{': '}', '[': ']'}
+    parentesis = []
+    pila = []
+    while len(parentesis) + len(pila) < cantidad:
+        if pila and generador.random() < 0.5:
+            parentesis.append(cierres[pila.pop()])
+        else:
+            pila.append(generador.choice('({['))
+            parentesis.append(pila[-1])
+    while pila:
+        parentesis.append(cierres[pila.pop()])
+
+    letras = generador.choices('abcdefghij ', k=longitud - len(parentesis))
+    posiciones = sorted(generador.sample(range(longitud), len(parentesis)))
+    # Se intercalan los paréntesis en las posiciones elegidas, rellenando con letras el resto
+    texto = []
+    usadas = 0
+    anterior = 0
+    for pos, char in zip(posiciones, parentesis):
+        texto.extend(letras[usadas:usadas + pos - anterior])
+        usadas += pos - anterior
+        texto.append(char)
+        anterior = pos + 1
+    texto.extend(letras[usadas:])
+    return ''.join(texto)
+
+def comparar_escaneo(longitud=1_000_000, densidades=(0.001, 0.01, 0.05, 0.2, 0.5), repeticiones=3):
+    """
+    Compara el recorrido carácter a carácter con el recorrido por saltos de
+    verificar_balanceo_detallado() y corregir_parentesis() para varias densidades de paréntesis.
+    Devuelve: lista de (densidad, segundos_por_caracter, segundos_verificar, segundos_corregir).
+    """
+    resultados = []
+    for densidad in densidades:
+        texto = generar_texto(longitud, densidad)
+        por_caracter = min(timeit.repeat(lambda: _verificar_por_caracter(texto), number=1, repeat=repeticiones))
+        verificar = min(timeit.repeat(lambda: verificar_balanceo_detallado(texto), number=1, repeat=repeticiones))
+        corregir = min(timeit.repeat(lambda: corregir_parentesis(texto), number=1, repeat=repeticiones))
+        resultados.append((densidad, por_caracter, verificar, corregir))
+    return resultados
+
+# ---------------------- BENCHMARK DE LA REPARACIÓN MÍNIMA ----------------------
+
+def _ediciones_voraces(cadena):
+    """Número de ediciones que hace corregir_parentesis() (cierres eliminados más cierres añadidos)"""
+    pila = []
+    eliminados = 0
+    for _, char in _recorrer_parentesis(cadena):
+        if char in _CIERRE_DE:
+            pila.append(char)
+        elif char in _APERTURA_DE:
+            if pila and pila[-1] == _APERTURA_DE[char]:
+                pila.pop()
+            else:
+                eliminados += 1
+    return eliminados + len(pila)
+
+def estropear_texto(texto, errores, semilla=0):
+    """Cambia 'errores' paréntesis del texto, elegidos al azar, por otros paréntesis distintos."""
+    generador = random.Random(semilla)
+    posiciones = [coincidencia.start() for coincidencia in _PARENTESIS.finditer(texto)]
+    caracteres = list(texto)
+    for pos in generador.sample(posiciones, min(errores, len(posiciones))):
+        caracteres[pos] = generador.choice('(){}[]'.replace(caracteres[pos], ''))
+    return ''.join(caracteres)
+
+def residuo_peor_caso(parentesis):
+    """
+    Cadena de 'parentesis' paréntesis (un número par) que _reducir() no puede simplificar y
+    en la que cada apertura tiene la mitad de los cierres como candidatos: "((([)))]". Es el
+    caso más lento de la tabla exacta, así que sirve para medir cuánto cuesta LIMITE_EXACTO.
+    """
+    mitad = parentesis // 2
+    return "(" * (mitad - 1) + "[" + ")" * (mitad - 1) + "]"
+
+def comparar_limite_exacto(tamanos=None, repeticiones=3):
+    """
+    Mide reparar_parentesis() con el residuo de peor caso de varios tamaños, por defecto la
+    mitad de LIMITE_EXACTO y el propio límite (el residuo más largo que usa la tabla exacta).
+    Devuelve: lista de (paréntesis, segundos, exacta).
+    """
+    resultados = []
+    for parentesis in tamanos or (LIMITE_EXACTO // 2, LIMITE_EXACTO):
+        texto = residuo_peor_caso(parentesis)
+        segundos = min(timeit.repeat(lambda: reparar_parentesis(texto), number=1, repeat=repeticiones))
+        resultados.append((parentesis, segundos, reparar_parentesis(texto)[2]))
+    return resultados
+
+def comparar_reparacion(longitud=1_000_000, densidad=0.05, errores=(1, 10, 100, 1000), repeticiones=3):
+    """
+    Compara corregir_parentesis() (voraz) con reparar_parentesis() (mínimo de ediciones) sobre
+    un texto balanceado en el que se estropean cada vez más paréntesis.
+    Cada paréntesis cambiado se arregla con dos ediciones, así que el mínimo no pasa de
+    2 * errores: 'exceso' es lo que reparar_parentesis() se pasa de esa cota, una cota inferior
+    de las ediciones que sobran cuando la reparación no es exacta (0 si no se puede asegurar nada).
+    Devuelve: lista de (errores, segundos_voraz, ediciones_voraz, segundos_minimo, ediciones_minimo,
+    exacta, exceso).
+    """
+    base = generar_texto(longitud, densidad)
+    resultados = []
+    for cantidad in errores:
+        texto = estropear_texto(base, cantidad)
+        voraz = min(timeit.repeat(lambda: corregir_parentesis(texto), number=1, repeat=repeticiones))
+        minimo = min(timeit.repeat(lambda: reparar_parentesis(texto), number=1, repeat=repeticiones))
+        _, ediciones, exacta = reparar_parentesis(texto)
+        resultados.append((cantidad, voraz, _ediciones_voraces(texto), minimo, len(ediciones),
+                           exacta, max(0, len(ediciones) - 2 * cantidad)))
+    return resultados
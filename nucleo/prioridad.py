@@ -0,0 +1,1031 @@
+# ===============================
+# BIBLIOTECAS NECESARIAS
+# ===============================
+
+import bisect
+import heapq   # Heap de respaldo de ColaCubetas y versión anterior en el benchmark
+import itertools
+import json
+import math
+import os
+import random
+import threading
+import time
+from array import array
+from collections import deque
+
+# ===============================
+# HISTORIAL DE DESENCOLADOS
+# ===============================
+
+CAPACIDAD_HISTORIAL = 1000   # Elementos recientes que el historial guarda en memoria
+
+class Historial:
+    """
+    Historial de desencolados con memoria acotada. Los últimos 'capacidad' elementos están
+    en un búfer circular. Los anteriores se añaden al final de un archivo en bloques de
+    'paso' elementos, una línea JSON por elemento (si no se indica archivo, se usa uno
+    temporal). Un índice guarda dónde empieza cada bloque, así que cualquier tramo antiguo
+    se lee con un seek y unas pocas líneas.
+    Se usa como una lista a la que solo se añade: append(), len(), historial[i] e iteración.
+    """
+    def __init__(self, capacidad=CAPACIDAD_HISTORIAL, archivo=None, paso=256):
+        if capacidad < 1:
+            raise ValueError("La capacidad del historial debe ser al menos 1")
+        self.capacidad = capacidad
+        self.paso = paso
+        self.anillo = [None] * capacidad   # Elemento i en la casilla i % capacidad
+        self.total = 0                     # Elementos añadidos desde el principio
+        self.en_disco = 0                  # Los elementos 0 .. en_disco - 1 están en el archivo
+        self.pendientes = []               # Los siguientes, que ya salieron del búfer y esperan a completar un bloque
+        self.archivo = archivo
+        self.registro = None               # Archivo abierto; se crea con el primer elemento que sale del búfer
+        self.indice = array('Q')           # Posición en el archivo de los elementos 0, paso, 2 * paso...
+        self.codificar = json.JSONEncoder(ensure_ascii=False).encode
+
+    def __len__(self):
+        return self.total
+
+    def append(self, elemento):
+        casilla = self.total % self.capacidad
+        if self.total >= self.capacidad:
+            self.pendientes.append(self.anillo[casilla])   # El más antiguo del búfer sale de él
+            if len(self.pendientes) == self.paso:
+                self._volcar()
+        self.anillo[casilla] = elemento
+        self.total += 1
+
+    def _volcar(self):
+        # Escribe el bloque de pendientes de una vez, al final del archivo
+        if self.registro is None:
+            if self.archivo is None:
+                import tempfile
+                self.registro = tempfile.TemporaryFile()
+            else:
+                self.registro = open(self.archivo, 'w+b')
+        self.indice.append(self.registro.tell())
+        codificar = self.codificar
+        self.registro.write(''.join([codificar(elemento) + '\n' for elemento in self.pendientes]).encode('utf-8'))
+        self.en_disco += len(self.pendientes)
+        self.pendientes = []
+
+    def _leer_disco(self, inicio, cantidad):
+        # Elementos inicio .. inicio + cantidad - 1 del archivo (todos deben estar en él)
+        registro = self.registro
+        registro.flush()
+        bloque = inicio // self.paso
+        registro.seek(self.indice[bloque])
+        elementos = []
+        for numero, linea in enumerate(registro, bloque * self.paso):
+            if numero >= inicio:
+                elementos.append(tuple(json.loads(linea)))
+                if len(elementos) == cantidad:
+                    break
+        registro.seek(0, os.SEEK_END)          # Las escrituras siguen al final
+        return elementos
+
+    def pagina(self, inicio, cantidad):
+        """Devuelve: lista con los elementos inicio .. inicio + cantidad - 1 que existan (el 0 es el más antiguo)."""
+        fin = min(inicio + cantidad, self.total)
+        inicio = max(inicio, 0)
+        if fin <= inicio:
+            return []
+        elementos = []
+        if inicio < self.en_disco:
+            elementos = self._leer_disco(inicio, min(fin, self.en_disco) - inicio)
+            inicio = self.en_disco
+        fuera = self.en_disco + len(self.pendientes)   # Primer elemento que sigue en el búfer
+        if inicio < min(fin, fuera):
+            elementos.extend(self.pendientes[inicio - self.en_disco:min(fin, fuera) - self.en_disco])
+            inicio = fuera
+        elementos.extend(self.anillo[i % self.capacidad] for i in range(inicio, fin))
+        return elementos
+
+    def recientes(self, cantidad):
+        """Devuelve: los últimos 'cantidad' elementos, del más antiguo al más reciente."""
+        return self.pagina(self.total - cantidad, cantidad)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.total
+        if not 0 <= i < self.total:
+            raise IndexError("Posición fuera del historial")
+        return self.pagina(i, 1)[0]
+
+    def __iter__(self):
+        for inicio in range(0, self.total, 16 * self.paso):
+            yield from self.pagina(inicio, 16 * self.paso)
+
+    def cerrar(self):
+        if self.registro is not None:
+            self.registro.close()
+            self.registro = None
+
+# ===============================
+# LÓGICA DE LA COLA DE PRIORIDAD
+# ===============================
+
+class ColaPrioridad:
+    """
+    Heap binario indexado: además del heap, guarda en qué casilla está cada elemento y qué
+    elementos tiene cada nombre, así que buscar, editar (subir o bajar la prioridad) y
+    eliminar por nombre cuestan O(log n) en vez de recorrer y reordenar toda la cola.
+    """
+    def __init__(self, historial=None):
+        self.cola = []      # Lista principal que almacena tuplas (prioridad, nombre) como heap
+        self.historial = Historial() if historial is None else historial  # Elementos desencolados
+        self.ids = []       # Identificador del elemento de cada casilla del heap (paralela a self.cola)
+        self.casilla = {}   # Identificador -> casilla del heap en la que está
+        self.por_nombre = {}  # Nombre en minúsculas -> {identificador: None} (un nombre puede repetirse)
+        self.siguiente_id = 0
+        self.suma = 0         # Suma de las prioridades en la cola
+        self.histograma = {}  # Prioridad -> cuántos elementos la tienen
+
+    def __len__(self):
+        return len(self.cola)
+
+    # ===============================
+    # MANTENIMIENTO DEL HEAP INDEXADO
+    # ===============================
+
+    def _subir(self, i):
+        # Sube el elemento de la casilla i mientras sea menor que su padre (como heapq)
+        cola, ids, casilla = self.cola, self.ids, self.casilla
+        elemento, ident = cola[i], ids[i]
+        while i:
+            padre = (i - 1) >> 1
+            if not elemento < cola[padre]:
+                break
+            cola[i] = cola[padre]
+            ids[i] = ids[padre]
+            casilla[ids[i]] = i
+            i = padre
+        cola[i] = elemento
+        ids[i] = ident
+        casilla[ident] = i
+
+    def _bajar(self, i):
+        # Baja el elemento de la casilla i. Como heapq, lleva el hueco hasta una hoja por el
+        # hijo menor (una comparación por nivel) y luego sube el elemento lo que haga falta
+        cola, ids, casilla = self.cola, self.ids, self.casilla
+        elemento, ident = cola[i], ids[i]
+        total = len(cola)
+        inicio = i
+        hijo = 2 * i + 1
+        while hijo < total:
+            derecho = hijo + 1
+            if derecho < total and not cola[hijo] < cola[derecho]:
+                hijo = derecho
+            cola[i] = cola[hijo]
+            ids[i] = ids[hijo]
+            casilla[ids[i]] = i
+            i = hijo
+            hijo = 2 * i + 1
+        while i > inicio:
+            padre = (i - 1) >> 1
+            if not elemento < cola[padre]:
+                break
+            cola[i] = cola[padre]
+            ids[i] = ids[padre]
+            casilla[ids[i]] = i
+            i = padre
+        cola[i] = elemento
+        ids[i] = ident
+        casilla[ident] = i
+
+    def _quitar(self, i):
+        # Quita el elemento de la casilla i poniendo el último en su lugar
+        cola, ids = self.cola, self.ids
+        elemento, ident = cola[i], ids[i]
+        ultimo, ultimo_id = cola.pop(), ids.pop()
+        if i < len(cola):
+            cola[i] = ultimo
+            ids[i] = ultimo_id
+            if ultimo < elemento:
+                self._subir(i)
+            else:
+                self._bajar(i)
+        del self.casilla[ident]
+        self.suma -= elemento[0]
+        _contar(self.histograma, elemento[0], -1)
+        clave = elemento[1].lower()
+        grupo = self.por_nombre[clave]
+        del grupo[ident]
+        if not grupo:
+            del self.por_nombre[clave]
+        return elemento
+
+    def _encontrar(self, nombre):
+        # Casilla del elemento con ese nombre (sin distinguir mayúsculas) que saldría primero
+        grupo = self.por_nombre.get(nombre.lower())
+        if not grupo:
+            return None
+        return min((self.casilla[ident] for ident in grupo), key=self.cola.__getitem__)
+
+    def _rango(self, i):
+        # Posición en la que saldría el elemento: 1 + los elementos menores que él. Solo se
+        # visitan esos elementos y sus hijos (O(rango)); si resultan ser muchos, sale más
+        # barato compararlos todos de una pasada
+        cola = self.cola
+        objetivo = cola[i]
+        total = len(cola)
+        limite = max(64, total >> 6)
+        menores = 0
+        pendientes = [0]
+        while pendientes:
+            j = pendientes.pop()
+            if j < total and cola[j] < objetivo:
+                menores += 1
+                if menores > limite:
+                    return sum(map(objetivo.__gt__, cola)) + 1
+                pendientes.append(2 * j + 1)
+                pendientes.append(2 * j + 2)
+        return menores + 1
+
+    # ===============================
+    # OPERACIONES DE LA COLA
+    # ===============================
+
+    def encolar(self, nombre, prioridad):
+        ident = self.siguiente_id
+        self.siguiente_id += 1
+        self.cola.append((prioridad, nombre))  # Inserta el elemento en el heap según prioridad
+        self.ids.append(ident)
+        self.por_nombre.setdefault(nombre.lower(), {})[ident] = None
+        self.suma += prioridad
+        _contar(self.histograma, prioridad, 1)
+        self._subir(len(self.cola) - 1)
+        return (prioridad, nombre)  # Clave de orden del elemento (ver FilasOrdenadas)
+
+    def desencolar(self):
+        if self.cola:
+            elemento = self._quitar(0)       # Extrae el elemento con mayor prioridad (menor número)
+            self.historial.append(elemento)  # Lo agrega al historial de desencolados
+            return elemento
+        return None
+
+    def buscar(self, nombre):
+        # Busca un elemento por nombre (ignorando mayúsculas/minúsculas)
+        i = self._encontrar(nombre)
+        if i is None:
+            return None
+        return (self._rango(i), self.cola[i][0])  # Devuelve el orden de salida (empezando en 1) y la prioridad
+
+    def prioridad_de(self, nombre):
+        # Prioridad del elemento con ese nombre que saldría primero, sin calcular su posición
+        i = self._encontrar(nombre)
+        return None if i is None else self.cola[i][0]
+
+    def editar(self, nombre, nueva_prioridad):
+        # Cambia la prioridad del elemento; devuelve True si estaba en la cola
+        return self.cambiar_prioridad(nombre, nueva_prioridad) is not None
+
+    def cambiar_prioridad(self, nombre, nueva_prioridad):
+        # Como editar(), pero devuelve (clave de orden anterior, clave nueva) o None si no está
+        i = self._encontrar(nombre)
+        if i is None:
+            return None
+        anterior = self.cola[i]
+        nuevo = self.cola[i] = (nueva_prioridad, anterior[1])
+        self.suma += nueva_prioridad - anterior[0]
+        _contar(self.histograma, anterior[0], -1)
+        _contar(self.histograma, nueva_prioridad, 1)
+        if nuevo < anterior:
+            self._subir(i)         # Sube la prioridad: el elemento sube en el heap
+        else:
+            self._bajar(i)
+        return (anterior, nuevo)
+
+    def eliminar(self, nombre):
+        # Quita el elemento sin desencolarlo (no pasa al historial)
+        i = self._encontrar(nombre)
+        if i is None:
+            return None
+        return self._quitar(i)  # Devuelve la tupla (prioridad, nombre) eliminada
+
+    def elementos(self):
+        # Elementos (prioridad, nombre) en el orden en que saldrían
+        return sorted(self.cola)
+
+    def vaciar(self):
+        self.cola.clear()  # Elimina todos los elementos de la cola
+        self.ids.clear()
+        self.casilla.clear()
+        self.por_nombre.clear()
+        self.suma = 0
+        self.histograma.clear()
+
+    def obtener_estadisticas(self):
+        # Estadísticas en O(1): total de elementos, menor prioridad (la de la cima) y promedio
+        if not self.cola:
+            return (0, "N/A", "N/A")
+        return (len(self.cola), self.cola[0][0], self.suma / len(self.cola))
+
+def _contar(histograma, prioridad, cambio):
+    # Suma 'cambio' a los elementos con esa prioridad y la quita del histograma si no queda ninguno
+    total = histograma.get(prioridad, 0) + cambio
+    if total:
+        histograma[prioridad] = total
+    else:
+        del histograma[prioridad]
+
+# ===============================
+# MOTOR DE CUBETAS PARA PRIORIDADES PEQUEÑAS
+# ===============================
+
+PRIORIDAD_MAXIMA = 255        # Cubetas por defecto de ColaCubetas (prioridades 0..255)
+LIMITE_CUBETAS = 1 << 16      # Rango más ancho para el que crear_cola("auto") elige cubetas
+MOTORES = ("auto", "heap", "cubetas")
+
+class ColaCubetas:
+    """
+    Cola de prioridad para prioridades enteras en un rango pequeño: una cubeta FIFO (deque)
+    por prioridad y un cursor en la menor cubeta que puede tener elementos, así que encolar
+    y desencolar cuestan O(1) amortizado y, a igual prioridad, sale antes el que llegó
+    antes. Las prioridades fuera de 0..prioridad_maxima (o no enteras) van a un heap de
+    respaldo. Tiene la misma interfaz que ColaPrioridad, salvo el atributo cola.
+
+    Editar o eliminar no saca al elemento de su cubeta: solo deja de estar vivo y se
+    descarta al llegar a él (o al reconstruir las cubetas si hay demasiados descartados).
+    """
+    def __init__(self, prioridad_maxima=PRIORIDAD_MAXIMA, historial=None):
+        if prioridad_maxima < 0:
+            raise ValueError("La prioridad máxima no puede ser negativa")
+        self.prioridad_maxima = prioridad_maxima
+        self.cubetas = [None] * (prioridad_maxima + 1)  # Prioridad -> deque de identificadores
+        self.conteo = [0] * (prioridad_maxima + 1)      # Elementos vivos de cada cubeta
+        self.minimo = prioridad_maxima + 1              # Por debajo de aquí no hay elementos vivos
+        self.respaldo = []                              # Heap de (prioridad, identificador) fuera de rango
+        self.vivos = {}                                 # Identificador -> (prioridad, nombre)
+        self.por_nombre = {}                            # Nombre en minúsculas -> {identificador: None}
+        self.historial = Historial() if historial is None else historial  # Elementos desencolados
+        self.siguiente_id = 0                           # Creciente: también decide el orden FIFO
+        self.descartados = 0                            # Identificadores que quedan en cubetas o respaldo sin estar vivos
+        self.suma = 0                                   # Suma de las prioridades en la cola
+        self.histograma = {}                            # Prioridad -> cuántos elementos la tienen
+
+    def __len__(self):
+        return len(self.vivos)
+
+    def _cubeta(self, prioridad):
+        # Índice de la cubeta de la prioridad, o None si va al respaldo. Todo valor igual a un
+        # entero del rango (3.0, True...) usa la cubeta de ese entero: así en el respaldo nunca
+        # hay prioridades empatadas con una cubeta y se respeta el orden FIFO entre ellas
+        if type(prioridad) is not int:
+            try:
+                entera = int(prioridad)
+            except (TypeError, ValueError, OverflowError):
+                return None
+            if entera != prioridad:
+                return None
+            prioridad = entera
+        return prioridad if 0 <= prioridad <= self.prioridad_maxima else None
+
+    def _agregar(self, nombre, prioridad):
+        ident = self.siguiente_id
+        self.siguiente_id += 1
+        self.vivos[ident] = (prioridad, nombre)
+        self.por_nombre.setdefault(nombre.lower(), {})[ident] = None
+        self.suma += prioridad
+        _contar(self.histograma, prioridad, 1)
+        indice = self._cubeta(prioridad)
+        if indice is not None:
+            cubeta = self.cubetas[indice]
+            if cubeta is None:
+                cubeta = self.cubetas[indice] = deque()
+            cubeta.append(ident)
+            self.conteo[indice] += 1
+            if indice < self.minimo:
+                self.minimo = indice
+        else:
+            heapq.heappush(self.respaldo, (prioridad, ident))
+        return ident
+
+    def _olvidar(self, ident):
+        # Deja de considerar vivo el elemento; sigue en su cubeta o en el respaldo
+        elemento = self.vivos.pop(ident)
+        self.suma -= elemento[0]
+        _contar(self.histograma, elemento[0], -1)
+        clave = elemento[1].lower()
+        grupo = self.por_nombre[clave]
+        del grupo[ident]
+        if not grupo:
+            del self.por_nombre[clave]
+        return elemento
+
+    def _primero(self):
+        # (identificador, cubeta o None si está en el respaldo) del que sale ahora, o (None, None)
+        conteo, tope, vivos = self.conteo, self.prioridad_maxima, self.vivos
+        minimo = self.minimo
+        while minimo <= tope and not conteo[minimo]:
+            minimo += 1
+        self.minimo = minimo
+        respaldo = self.respaldo
+        while respaldo and respaldo[0][1] not in vivos:
+            heapq.heappop(respaldo)
+            self.descartados -= 1
+        if respaldo and (minimo > tope or respaldo[0][0] < minimo):
+            return respaldo[0][1], None
+        if minimo > tope:
+            return None, None
+        cubeta = self.cubetas[minimo]
+        while cubeta[0] not in vivos:
+            cubeta.popleft()
+            self.descartados -= 1
+        return cubeta[0], minimo
+
+    def _descartar(self, ident):
+        # Quita un elemento que no tiene por qué ser el primero
+        elemento = self._olvidar(ident)
+        indice = self._cubeta(elemento[0])
+        if indice is not None:
+            self.conteo[indice] -= 1
+        self.descartados += 1
+        if self.descartados > len(self.vivos) + 1024:
+            self._reconstruir()
+        return elemento
+
+    def _reconstruir(self):
+        # Saca de las cubetas y del respaldo los identificadores que ya no están vivos
+        vivos = self.vivos
+        for prioridad, cubeta in enumerate(self.cubetas):
+            if cubeta:
+                cubeta = deque(ident for ident in cubeta if ident in vivos)
+                self.cubetas[prioridad] = cubeta or None
+        self.respaldo = [entrada for entrada in self.respaldo if entrada[1] in vivos]
+        heapq.heapify(self.respaldo)
+        self.descartados = 0
+
+    def _encontrar(self, nombre):
+        # Identificador del elemento con ese nombre (sin distinguir mayúsculas) que saldría primero
+        grupo = self.por_nombre.get(nombre.lower())
+        if not grupo:
+            return None
+        return min(grupo, key=lambda ident: (self.vivos[ident][0], ident))
+
+    def encolar(self, nombre, prioridad):
+        return (prioridad, self._agregar(nombre, prioridad), nombre)  # Clave de orden del elemento
+
+    def desencolar(self):
+        ident, prioridad = self._primero()
+        if ident is None:
+            return None
+        if prioridad is None:
+            heapq.heappop(self.respaldo)
+        else:
+            self.cubetas[prioridad].popleft()
+            self.conteo[prioridad] -= 1
+        elemento = self._olvidar(ident)
+        self.historial.append(elemento)
+        return elemento
+
+    def buscar(self, nombre):
+        # Devuelve (orden de salida empezando en 1, prioridad); cuesta O(rango + cubeta + respaldo)
+        ident = self._encontrar(nombre)
+        if ident is None:
+            return None
+        prioridad = self.vivos[ident][0]
+        vivos = self.vivos
+        indice = self._cubeta(prioridad)
+        if indice is not None:
+            antes = sum(self.conteo[:indice])
+            for otro in self.cubetas[indice]:
+                if otro == ident:
+                    break
+                antes += otro in vivos
+        else:
+            # En el respaldo no hay enteros del rango: las cubetas anteriores son las menores que ceil()
+            antes = sum(self.conteo[:max(0, min(self.prioridad_maxima + 1, math.ceil(prioridad)))])
+        objetivo = (prioridad, ident)
+        antes += sum(1 for entrada in self.respaldo if entrada < objetivo and entrada[1] in vivos)
+        return (antes + 1, prioridad)
+
+    def prioridad_de(self, nombre):
+        ident = self._encontrar(nombre)
+        return None if ident is None else self.vivos[ident][0]
+
+    def editar(self, nombre, nueva_prioridad):
+        # El elemento pasa al final de los que tienen la nueva prioridad
+        return self.cambiar_prioridad(nombre, nueva_prioridad) is not None
+
+    def cambiar_prioridad(self, nombre, nueva_prioridad):
+        # Como editar(), pero devuelve (clave de orden anterior, clave nueva) o None si no está
+        ident = self._encontrar(nombre)
+        if ident is None:
+            return None
+        prioridad, nombre_original = self._descartar(ident)
+        nuevo = self._agregar(nombre_original, nueva_prioridad)
+        return ((prioridad, ident, nombre_original), (nueva_prioridad, nuevo, nombre_original))
+
+    def eliminar(self, nombre):
+        ident = self._encontrar(nombre)
+        if ident is None:
+            return None
+        return self._descartar(ident)
+
+    def elementos(self):
+        # Elementos (prioridad, nombre) en el orden en que saldrían
+        vivos = self.vivos
+        en_cubetas = ((prioridad, ident) for prioridad, cubeta in enumerate(self.cubetas) if cubeta
+                      for ident in cubeta if ident in vivos)
+        en_respaldo = sorted(entrada for entrada in self.respaldo if entrada[1] in vivos)
+        return [vivos[ident] for _, ident in heapq.merge(en_cubetas, en_respaldo)]
+
+    def vaciar(self):
+        self.cubetas = [None] * (self.prioridad_maxima + 1)
+        self.conteo = [0] * (self.prioridad_maxima + 1)
+        self.minimo = self.prioridad_maxima + 1
+        self.respaldo = []
+        self.vivos.clear()
+        self.por_nombre.clear()
+        self.descartados = 0
+        self.suma = 0
+        self.histograma.clear()
+
+    def obtener_estadisticas(self):
+        # Estadísticas en O(1) amortizado: total, menor prioridad (la del primero que sale) y promedio
+        if not self.vivos:
+            return (0, "N/A", "N/A")
+        ident, _ = self._primero()
+        return (len(self.vivos), self.vivos[ident][0], self.suma / len(self.vivos))
+
+# ===============================
+# MODELO DE LA LISTA VISUAL
+# ===============================
+
+class FilasOrdenadas:
+    """
+    Modelo de una lista visual de la cola en orden de salida. Guarda, ordenadas, las claves
+    de orden que devuelven encolar() y cambiar_prioridad() ((prioridad, nombre) en el heap,
+    (prioridad, llegada, nombre) en las cubetas) y dice en qué fila insertar o borrar en
+    cada cambio, para no ordenar ni redibujar la cola entera.
+    """
+    def __init__(self):
+        self.claves = []
+
+    def __len__(self):
+        return len(self.claves)
+
+    def insertar(self, clave):
+        # Devuelve: fila en la que hay que insertar el elemento
+        fila = bisect.bisect_right(self.claves, clave)
+        self.claves.insert(fila, clave)
+        return fila
+
+    def quitar(self, clave):
+        # Devuelve: fila en la que estaba el elemento
+        fila = bisect.bisect_left(self.claves, clave)
+        if fila == len(self.claves) or self.claves[fila] != clave:
+            raise ValueError("La clave no está en la lista")
+        del self.claves[fila]
+        return fila
+
+    def quitar_primera(self):
+        del self.claves[0]
+        return 0
+
+    def vaciar(self):
+        self.claves.clear()
+
+    @staticmethod
+    def texto(clave):
+        # Texto de la fila: la prioridad es lo primero de la clave y el nombre lo último
+        return f"{clave[-1]} (Prioridad: {clave[0]})"
+
+def crear_cola(motor="auto", prioridad_maxima=None, historial=None):
+    """
+    Crea una cola con el motor pedido: "heap" (ColaPrioridad, para cualquier prioridad),
+    "cubetas" (ColaCubetas con prioridades 0..prioridad_maxima) o "auto", que elige
+    cubetas si se sabe que las prioridades no pasan de 'prioridad_maxima' y ese rango
+    es pequeño (menos de LIMITE_CUBETAS) y, si no, el heap. 'historial' es el Historial
+    de desencolados (por defecto, uno nuevo con la capacidad CAPACIDAD_HISTORIAL).
+    """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: {motor} (opciones: {', '.join(MOTORES)})")
+    if motor == "auto":
+        motor = "cubetas" if prioridad_maxima is not None and 0 <= prioridad_maxima < LIMITE_CUBETAS else "heap"
+    if motor == "heap":
+        return ColaPrioridad(historial)
+    return ColaCubetas(PRIORIDAD_MAXIMA if prioridad_maxima is None else prioridad_maxima, historial)
+
+# ===============================
+# COLAS PARA VARIOS HILOS Y PARA ASYNCIO
+# ===============================
+
+class ColaConcurrente:
+    """
+    Envuelve una cola (ColaPrioridad o ColaCubetas; por defecto, un heap nuevo) para usarla
+    desde varios hilos: todas las operaciones van bajo un cerrojo y desencolar() puede
+    esperar a que haya elementos. encolar_varios() y desencolar_varios() mueven un lote con
+    una sola toma del cerrojo. Tras cerrar(), encolar lanza ValueError y desencolar
+    devuelve lo que quede y después None (o una lista vacía), así que los hilos
+    consumidores pueden terminar con: while (tarea := cola.desencolar()) is not None.
+    """
+    def __init__(self, cola=None):
+        self.cola = ColaPrioridad() if cola is None else cola
+        self.condicion = threading.Condition()
+        self.cerrada = False
+
+    def __len__(self):
+        with self.condicion:
+            return len(self.cola)
+
+    def encolar(self, nombre, prioridad):
+        with self.condicion:
+            if self.cerrada:
+                raise ValueError("La cola está cerrada")
+            clave = self.cola.encolar(nombre, prioridad)
+            self.condicion.notify()
+            return clave
+
+    def encolar_varios(self, elementos):
+        # 'elementos': pares (nombre, prioridad). Devuelve: cuántos se encolaron
+        with self.condicion:
+            if self.cerrada:
+                raise ValueError("La cola está cerrada")
+            encolar = self.cola.encolar
+            cantidad = 0
+            for nombre, prioridad in elementos:
+                encolar(nombre, prioridad)
+                cantidad += 1
+            self.condicion.notify(cantidad)
+            return cantidad
+
+    def _esperar(self, bloquear, espera):
+        # Con el cerrojo tomado: True si hay elementos (esperándolos si se pide)
+        if bloquear:
+            self.condicion.wait_for(lambda: len(self.cola) or self.cerrada, espera)
+        return len(self.cola) > 0
+
+    def desencolar(self, bloquear=True, espera=None):
+        # Devuelve el siguiente elemento, o None si pasa 'espera' segundos o la cola está cerrada y vacía
+        with self.condicion:
+            if not self._esperar(bloquear, espera):
+                return None
+            return self.cola.desencolar()
+
+    def desencolar_varios(self, maximo, bloquear=True, espera=None):
+        # Espera a que haya al menos un elemento y devuelve hasta 'maximo' (lista vacía si no hay)
+        with self.condicion:
+            if not self._esperar(bloquear, espera):
+                return []
+            desencolar = self.cola.desencolar
+            return [desencolar() for _ in range(min(maximo, len(self.cola)))]
+
+    def cerrar(self, descartar=False):
+        # Despierta a todos los que esperan; con 'descartar' se tiran los elementos pendientes
+        with self.condicion:
+            self.cerrada = True
+            if descartar:
+                self.cola.vaciar()
+            self.condicion.notify_all()
+
+    def buscar(self, nombre):
+        with self.condicion:
+            return self.cola.buscar(nombre)
+
+    def prioridad_de(self, nombre):
+        with self.condicion:
+            return self.cola.prioridad_de(nombre)
+
+    def editar(self, nombre, nueva_prioridad):
+        with self.condicion:
+            return self.cola.editar(nombre, nueva_prioridad)
+
+    def eliminar(self, nombre):
+        with self.condicion:
+            return self.cola.eliminar(nombre)
+
+    def obtener_estadisticas(self):
+        with self.condicion:
+            return self.cola.obtener_estadisticas()
+
+class ColaAsincrona:
+    """
+    La misma idea para asyncio, dentro de un único bucle de eventos: encolar() no espera
+    nunca (la cola no tiene límite) y 'await desencolar()' suspende la tarea hasta que
+    haya un elemento, sin hilos ni cerrojos. cerrar() se comporta como en ColaConcurrente.
+    """
+    def __init__(self, cola=None):
+        self.cola = ColaPrioridad() if cola is None else cola
+        self.esperando = deque()   # Futuros de las tareas que esperan un elemento
+        self.cerrada = False
+
+    def __len__(self):
+        return len(self.cola)
+
+    def _despertar(self, cantidad):
+        while cantidad and self.esperando:
+            futuro = self.esperando.popleft()
+            if not futuro.done():
+                futuro.set_result(None)
+                cantidad -= 1
+
+    def encolar(self, nombre, prioridad):
+        if self.cerrada:
+            raise ValueError("La cola está cerrada")
+        clave = self.cola.encolar(nombre, prioridad)
+        self._despertar(1)
+        return clave
+
+    def encolar_varios(self, elementos):
+        if self.cerrada:
+            raise ValueError("La cola está cerrada")
+        cantidad = 0
+        for nombre, prioridad in elementos:
+            self.cola.encolar(nombre, prioridad)
+            cantidad += 1
+        self._despertar(cantidad)
+        return cantidad
+
+    async def _esperar(self, espera):
+        # True si hay elementos, esperando como mucho 'espera' segundos (None: sin límite)
+        import asyncio
+
+        bucle = asyncio.get_running_loop()
+        limite = None if espera is None else bucle.time() + espera
+        while not len(self.cola) and not self.cerrada:
+            restante = None if limite is None else limite - bucle.time()
+            if restante is not None and restante <= 0:
+                return False
+            futuro = bucle.create_future()
+            self.esperando.append(futuro)
+            try:
+                await asyncio.wait_for(futuro, restante)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+                if futuro.done() and not futuro.cancelled():
+                    self._despertar(1)        # Nos despertaron pero nos vamos: el aviso pasa a otra tarea
+                elif futuro in self.esperando:
+                    self.esperando.remove(futuro)
+                if isinstance(error, asyncio.CancelledError):
+                    raise
+                return False
+        return len(self.cola) > 0
+
+    async def desencolar(self, espera=None):
+        if not await self._esperar(espera):
+            return None
+        return self.cola.desencolar()
+
+    async def desencolar_varios(self, maximo, espera=None):
+        if not await self._esperar(espera):
+            return []
+        desencolar = self.cola.desencolar
+        return [desencolar() for _ in range(min(maximo, len(self.cola)))]
+
+    def cerrar(self, descartar=False):
+        self.cerrada = True
+        if descartar:
+            self.cola.vaciar()
+        self._despertar(len(self.esperando))
+
+# ===============================
+# BENCHMARK DE LA EDICIÓN DE PRIORIDADES
+# ===============================
+
+def _buscar_con_recorrido(cola, nombre):
+    # Versión anterior de ColaPrioridad.buscar(): recorre el heap
+    for i, (p, n) in enumerate(cola):
+        if n.lower() == nombre.lower():
+            return (i + 1, p)
+    return None
+
+def _editar_con_heapify(cola, nombre, nueva_prioridad):
+    # Versión anterior de ColaPrioridad.editar(): recorre el heap y lo reordena entero
+    for i, (p, n) in enumerate(cola):
+        if n.lower() == nombre.lower():
+            cola[i] = (nueva_prioridad, n)
+            heapq.heapify(cola)
+            return True
+    return False
+
+def comparar_edicion(elementos=1_000_000, ediciones=10_000, ediciones_heapify=20, semilla=0):
+    """
+    Compara buscar y editar del heap indexado con la versión anterior (recorrido y
+    heapify de toda la cola). Lo que recorre la cola entera (las dos operaciones de la
+    versión anterior y calcular el orden de salida en buscar()) solo se mide
+    'ediciones_heapify' veces. En el heap indexado se mide también prioridad_de(), que
+    encuentra el elemento sin calcular su orden de salida.
+    Devuelve: dict {versión: {operación_ms: milisegundos por operación}}.
+    """
+    aleatorio = random.Random(semilla)
+    nombres = [f"Tarea {i}" for i in range(elementos)]
+    prioridades = [aleatorio.randrange(elementos) for _ in range(elementos)]
+
+    def medir(operaciones):
+        medidas = {}
+        for operacion, (funcion, cantidad) in operaciones.items():
+            elegidos = aleatorio.sample(nombres, cantidad)
+            nuevas = [aleatorio.randrange(elementos) for _ in range(cantidad)]
+            inicio = time.perf_counter()
+            for nombre, prioridad in zip(elegidos, nuevas):
+                funcion(nombre, prioridad)
+            medidas[f"{operacion}_ms"] = (time.perf_counter() - inicio) * 1000 / cantidad
+        return medidas
+
+    heap = list(zip(prioridades, nombres))
+    heapq.heapify(heap)
+    resultados = {"heapify": medir({
+        "buscar": (lambda nombre, _: _buscar_con_recorrido(heap, nombre), ediciones_heapify),
+        "editar": (lambda nombre, prioridad: _editar_con_heapify(heap, nombre, prioridad), ediciones_heapify)})}
+    del heap
+
+    cola = ColaPrioridad()
+    for nombre, prioridad in zip(nombres, prioridades):
+        cola.encolar(nombre, prioridad)
+    resultados["indexado"] = medir({
+        "prioridad_de": (lambda nombre, _: cola.prioridad_de(nombre), ediciones),
+        "buscar": (lambda nombre, _: cola.buscar(nombre), ediciones_heapify),
+        "editar": (cola.editar, ediciones)})
+    return resultados
+
+# ===============================
+# BENCHMARK DE LOS MOTORES
+# ===============================
+
+def comparar_motores(elementos=200_000, anchos=(16, 256, 4096, 65_536, 1_000_000), semilla=0):
+    """
+    Encola 'elementos' con prioridades al azar en 0..ancho-1 y los desencola todos, con el
+    heap y con las cubetas (con una cubeta por prioridad posible), para cada ancho.
+    Devuelve: dict {ancho: {'heap_us', 'cubetas_us', 'auto'}} con microsegundos por
+    elemento (encolar + desencolar) y el motor que elegiría crear_cola("auto").
+    """
+    aleatorio = random.Random(semilla)
+    nombres = [f"Tarea {i}" for i in range(elementos)]
+    resultados = {}
+    for ancho in anchos:
+        prioridades = [aleatorio.randrange(ancho) for _ in range(elementos)]
+        medidas = {}
+        for motor, cola in (("heap", ColaPrioridad()), ("cubetas", ColaCubetas(ancho - 1))):
+            inicio = time.perf_counter()
+            for nombre, prioridad in zip(nombres, prioridades):
+                cola.encolar(nombre, prioridad)
+            while cola.desencolar() is not None:
+                pass
+            medidas[f"{motor}_us"] = (time.perf_counter() - inicio) * 1e6 / elementos
+        medidas["auto"] = type(crear_cola("auto", ancho - 1)).__name__
+        resultados[ancho] = medidas
+    return resultados
+
+# ===============================
+# BENCHMARK DEL HISTORIAL
+# ===============================
+
+def comparar_historial(entradas=2_000_000, puntos=(10_000, 100_000, 1_000_000, 2_000_000),
+                       capacidad=CAPACIDAD_HISTORIAL, paginas=100, carpeta=None, semilla=0):
+    """
+    Añade 'entradas' elementos al historial como una lista (lo de antes) y como Historial.
+    En cada punto mide la memoria ocupada (tracemalloc) y lo que cuesta refrescar el cuadro
+    del historial: antes, el texto de todo el historial; ahora, solo la línea nueva. Para el
+    Historial mide también lo que tarda en leer del archivo una página de 50 elementos antiguos.
+    Devuelve: dict {entradas: {medida: valor}}.
+    """
+    import tempfile
+    import tracemalloc
+
+    aleatorio = random.Random(semilla)
+    resultados = {punto: {} for punto in puntos}
+    with tempfile.TemporaryDirectory(dir=carpeta) as temporal:
+        # Dos pasadas por estrategia: una mide la memoria y otra, sin tracemalloc, los tiempos
+        for estrategia, memoria in itertools.product(("lista", "historial"), (True, False)):
+            if memoria:
+                tracemalloc.start()
+            historial = [] if estrategia == "lista" else Historial(capacidad, os.path.join(temporal, 'historial.log'))
+            for i in range(1, entradas + 1):
+                historial.append((i % 100, f"Tarea {i}"))
+                if i not in resultados:
+                    continue
+                medidas = resultados[i]
+                if memoria:
+                    medidas[f"{estrategia}_bytes"] = tracemalloc.get_traced_memory()[0]
+                    continue
+                inicio = time.perf_counter()
+                if estrategia == "lista":
+                    "".join(f"{nombre} (Prioridad: {prioridad})\n" for prioridad, nombre in historial)
+                else:
+                    "".join(f"{nombre} (Prioridad: {prioridad})\n" for prioridad, nombre in historial.recientes(1))
+                medidas[f"{estrategia}_refresco_ms"] = (time.perf_counter() - inicio) * 1000
+                if estrategia == "historial" and historial.en_disco:
+                    inicio = time.perf_counter()
+                    for _ in range(paginas):
+                        historial.pagina(aleatorio.randrange(historial.en_disco), 50)
+                    medidas["pagina_ms"] = (time.perf_counter() - inicio) * 1000 / paginas
+            if memoria:
+                tracemalloc.stop()
+            if estrategia == "historial":
+                historial.cerrar()
+            del historial
+    return resultados
+
+# ===============================
+# BENCHMARK DE CONCURRENCIA
+# ===============================
+
+def comparar_concurrencia(elementos=200_000, combinaciones=((1, 1), (4, 4), (8, 2)), lotes=(1, 64), semilla=0):
+    """
+    Reparte 'elementos' entre N productores que encolan y M consumidores que desencolan hasta
+    que la cola se cierra, con hilos (ColaConcurrente), con tareas de asyncio (ColaAsincrona)
+    y, como referencia, con hilos y queue.PriorityQueue. Las prioridades van de 0 a 999, así
+    que las dos colas usan el motor de cubetas. Los productores encolan de uno en uno o por
+    lotes y los consumidores desencolan igual.
+    Devuelve: dict {"variante NxM lote L": elementos por segundo}.
+    """
+    import asyncio
+    import queue
+
+    aleatorio = random.Random(semilla)
+    todos = [(f"Tarea {i}", aleatorio.randrange(1000)) for i in range(elementos)]
+    resultados = {}
+
+    def con_hilos(productores, consumidores, lote):
+        cola = ColaConcurrente(crear_cola("auto", 999))
+        partes = [todos[i::productores] for i in range(productores)]
+
+        def producir(parte):
+            if lote == 1:
+                for nombre, prioridad in parte:
+                    cola.encolar(nombre, prioridad)
+            else:
+                for i in range(0, len(parte), lote):
+                    cola.encolar_varios(parte[i:i + lote])
+
+        def consumir():
+            if lote == 1:
+                while cola.desencolar() is not None:
+                    pass
+            else:
+                while cola.desencolar_varios(lote):
+                    pass
+
+        hilos_consumidores = [threading.Thread(target=consumir) for _ in range(consumidores)]
+        hilos_productores = [threading.Thread(target=producir, args=(parte,)) for parte in partes]
+        inicio = time.perf_counter()
+        for hilo in hilos_consumidores + hilos_productores:
+            hilo.start()
+        for hilo in hilos_productores:
+            hilo.join()
+        cola.cerrar()
+        for hilo in hilos_consumidores:
+            hilo.join()
+        return elementos / (time.perf_counter() - inicio)
+
+    def con_priority_queue(productores, consumidores):
+        cola = queue.PriorityQueue()
+        partes = [todos[i::productores] for i in range(productores)]
+
+        def producir(parte):
+            for nombre, prioridad in parte:
+                cola.put((prioridad, nombre))
+
+        def consumir():
+            while cola.get()[0] != math.inf:   # Marca de fin
+                pass
+
+        hilos_consumidores = [threading.Thread(target=consumir) for _ in range(consumidores)]
+        hilos_productores = [threading.Thread(target=producir, args=(parte,)) for parte in partes]
+        inicio = time.perf_counter()
+        for hilo in hilos_consumidores + hilos_productores:
+            hilo.start()
+        for hilo in hilos_productores:
+            hilo.join()
+        for _ in range(consumidores):
+            cola.put((math.inf, ""))
+        for hilo in hilos_consumidores:
+            hilo.join()
+        return elementos / (time.perf_counter() - inicio)
+
+    async def con_asyncio(productores, consumidores, lote):
+        cola = ColaAsincrona(crear_cola("auto", 999))
+        partes = [todos[i::productores] for i in range(productores)]
+
+        async def producir(parte):
+            for i in range(0, len(parte), lote):
+                if lote == 1:
+                    cola.encolar(*parte[i])
+                else:
+                    cola.encolar_varios(parte[i:i + lote])
+                if not i % (64 * lote):
+                    await asyncio.sleep(0)      # Cede el turno de vez en cuando, como un productor real
+
+        async def consumir():
+            if lote == 1:
+                while await cola.desencolar() is not None:
+                    pass
+            else:
+                while await cola.desencolar_varios(lote):
+                    pass
+
+        inicio = time.perf_counter()
+        tareas = [asyncio.create_task(consumir()) for _ in range(consumidores)]
+        await asyncio.gather(*(producir(parte) for parte in partes))
+        cola.cerrar()
+        await asyncio.gather(*tareas)
+        return elementos / (time.perf_counter() - inicio)
+
+    for productores, consumidores in combinaciones:
+        for lote in lotes:
+            resultados[f"hilos {productores}x{consumidores} lote {lote}"] = con_hilos(productores, consumidores, lote)
+            resultados[f"asyncio {productores}x{consumidores} lote {lote}"] = asyncio.run(
+                con_asyncio(productores, consumidores, lote))
+        resultados[f"PriorityQueue {productores}x{consumidores} lote 1"] = con_priority_queue(productores, consumidores)
+    return resultados
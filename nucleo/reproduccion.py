@@ -0,0 +1,2097 @@
+# Lógica del Ejercicio 3 (lista de reproducción), sin dependencias de Tkinter
+
+import bisect
+import collections
+import csv
+import gc
+import heapq
+import io
+import itertools
+import mmap
+import operator
+import os
+import random
+import struct
+import threading
+import time
+import unicodedata
+from array import array
+
+def _pausar_recolector():
+    """
+    Pausa el recolector de ciclos mientras se crean muchos nodos sin basura que recoger.
+    gc es de todo el proceso, así que desde otro hilo (la carga en segundo plano del
+    Ejercicio 3) no se toca: cambiaría el recolector del hilo de la interfaz.
+    Devuelve: True si lo pausó y hay que volver a activarlo con gc.enable().
+    """
+    if threading.current_thread() is not threading.main_thread() or not gc.isenabled():
+        return False
+    gc.disable()
+    return True
+
+# ---------------------- CLASE PARA UNA CANCIÓN ----------------------
+class Cancion:
+    def __init__(self, nombre):
+        self.nombre = nombre         # Nombre de la canción
+        self.siguiente = None        # Referencia a la siguiente canción (lista doblemente enlazada)
+        self.anterior = None         # Referencia a la canción anterior
+
+# ---------------------- CLASE PARA EL ORDEN ALEATORIO ----------------------
+class OrdenAleatorio:
+    """
+    Permutación aleatoria de las canciones que se genera a medida que se avanza (Fisher–Yates
+    perezoso): nodos[:generadas] es el historial de la ronda en el orden en que sonaron y el
+    resto son las canciones que aún no han salido. Avanzar, retroceder, agregar y quitar
+    canciones cuestan O(1) amortizado.
+    """
+
+    def __init__(self, canciones=(), semilla=None):
+        self.aleatorio = random.Random(semilla)   # Con semilla, el orden es reproducible
+        self.nodos = list(canciones)
+        self.posicion = {nodo: i for i, nodo in enumerate(self.nodos)}   # Nodo -> índice en nodos
+        self.generadas = 0          # Canciones ya sorteadas en esta ronda
+        self.cursor = -1            # Índice en nodos de la canción actual del historial
+        self.huecos = 0             # Canciones quitadas del historial (quedan como None)
+
+    def _intercambiar(self, i, j):
+        self.nodos[i], self.nodos[j] = self.nodos[j], self.nodos[i]
+        self.posicion[self.nodos[i]] = i
+        self.posicion[self.nodos[j]] = j
+
+    def _compactar(self):
+        """Quita los huecos del historial y vuelve a calcular los índices."""
+        generadas = sum(1 for nodo in self.nodos[:self.generadas] if nodo is not None)
+        cursor = sum(1 for nodo in self.nodos[:self.cursor + 1] if nodo is not None) - 1
+        self.nodos = [nodo for nodo in self.nodos if nodo is not None]
+        self.posicion = {nodo: i for i, nodo in enumerate(self.nodos)}
+        self.generadas, self.cursor, self.huecos = generadas, cursor, 0
+
+    def _sortear(self):
+        """Saca una canción de las que aún no han salido y la añade al historial."""
+        j = self.aleatorio.randrange(self.generadas, len(self.nodos))
+        self._intercambiar(self.generadas, j)
+        self.generadas += 1
+        self.cursor = self.generadas - 1
+        return self.nodos[self.cursor]
+
+    def _sortear_nodo(self, nodo):
+        """Añade 'nodo' al historial como si hubiera salido en el sorteo."""
+        self._intercambiar(self.generadas, self.posicion[nodo])
+        self.generadas += 1
+        self.cursor = self.generadas - 1
+
+    def siguiente(self, actual=None):
+        """
+        Devuelve la siguiente canción: la que seguía en el historial si antes se retrocedió o,
+        si no, una nueva sorteada distinta de 'actual'. Cuando ya salieron todas empieza otra
+        ronda. Devuelve None si no hay ninguna otra canción.
+        """
+        # Avanza por el historial saltándose las canciones quitadas
+        while self.cursor + 1 < self.generadas:
+            self.cursor += 1
+            if self.nodos[self.cursor] is not None:
+                return self.nodos[self.cursor]
+
+        if len(self.nodos) - self.huecos < 2:
+            return None
+        if self.generadas == len(self.nodos):
+            # Nueva ronda: la canción actual cuenta como ya sonada para no repetirla enseguida
+            self._compactar()
+            self.generadas = self.cursor = 0
+            if actual in self.posicion:
+                self._intercambiar(0, self.posicion[actual])
+                self.generadas = 1
+        elif actual in self.posicion and self.posicion[actual] >= self.generadas:
+            self._sortear_nodo(actual)           # La que está sonando ya no debe salir después
+        if self.generadas == len(self.nodos):
+            return self.siguiente(actual)
+        return self._sortear()
+
+    def anterior(self):
+        """Devuelve la canción anterior del historial, o None si no hay ninguna."""
+        i = self.cursor - 1
+        while i >= 0 and self.nodos[i] is None:
+            i -= 1
+        if i < 0:
+            return None
+        self.cursor = i
+        return self.nodos[i]
+
+    def agregar(self, nodo):
+        """La canción nueva se suma a las que aún no han salido."""
+        self.posicion[nodo] = len(self.nodos)
+        self.nodos.append(nodo)
+
+    def quitar(self, nodo):
+        i = self.posicion.pop(nodo)
+        if i >= self.generadas:
+            # No ha salido: se cambia por la última y se recorta la lista
+            ultimo = self.nodos.pop()
+            if ultimo is not nodo:
+                self.nodos[i] = ultimo
+                self.posicion[ultimo] = i
+        else:
+            # Ya salió: se deja un hueco para no desordenar el historial
+            self.nodos[i] = None
+            self.huecos += 1
+            if self.huecos * 2 > len(self.nodos):
+                self._compactar()
+
+# ---------------------- ÍNDICE DE BÚSQUEDA POR NOMBRE ----------------------
+
+def _normalizar(texto):
+    """Minúsculas y sin tildes, para que las búsquedas no distingan 'Canción' de 'cancion'."""
+    texto = texto.casefold()
+    if texto.isascii():
+        return texto
+    texto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in texto if not unicodedata.combining(c))
+
+def _distancia_acotada(a, b, limite):
+    """
+    Distancia de edición (Levenshtein) entre a y b, o limite + 1 si es mayor que limite.
+    Solo se calcula la franja de la tabla a menos de 'limite' de la diagonal.
+    """
+    if abs(len(a) - len(b)) > limite:
+        return limite + 1
+    if a == b:
+        return 0
+    if limite <= 2:
+        # Se salta el prefijo común: en la primera diferencia hay que cambiar, borrar o
+        # insertar una letra, y con un solo error el resto tiene que ser igual
+        i = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+        if limite == 2:
+            a, b = a[i:], b[i:]
+            return 1 + min(_distancia_acotada(a[1:], b[1:], 1), _distancia_acotada(a[1:], b, 1),
+                           _distancia_acotada(a, b[1:], 1))
+        if len(a) == len(b):
+            iguales = a[i + 1:] == b[i + 1:]
+        elif len(a) > len(b):
+            iguales = a[i + 1:] == b[i:]
+        else:
+            iguales = a[i:] == b[i + 1:]
+        return 1 if iguales else 2
+    fuera = limite + 1
+    fila = [j if j <= limite else fuera for j in range(len(b) + 1)]
+    for i, ca in enumerate(a, 1):
+        nueva = [fuera] * (len(b) + 1)
+        nueva[0] = i if i <= limite else fuera
+        mejor = nueva[0]
+        for j in range(max(1, i - limite), min(len(b), i + limite) + 1):
+            valor = fila[j - 1] + (ca != b[j - 1])
+            if fila[j] + 1 < valor:
+                valor = fila[j] + 1
+            if nueva[j - 1] + 1 < valor:
+                valor = nueva[j - 1] + 1
+            nueva[j] = valor
+            if valor < mejor:
+                mejor = valor
+        if mejor > limite:
+            return fuera
+        fila = nueva
+    return min(fila[-1], fuera)
+
+_CORTES = {}    # (largo del texto, LARGO_TROZO) -> slices de todos sus trozos
+
+class ListaOrdenada:
+    """
+    Lista ordenada partida en bloques de BLOQUE / 2 a 2 · BLOQUE elementos, con la clave del
+    último de cada bloque en 'maximos' (la idea de sortedcontainers): agregar y quitar cuestan
+    O(log n + BLOQUE) en lugar de mover media lista, y se recorre en orden desde cualquier
+    clave. Con 'clave' se ordena por clave(elemento), que no puede repetirse; con 'tipo' los
+    bloques son array(tipo) en lugar de listas.
+    """
+
+    __slots__ = ('clave', 'tipo', 'bloques', 'maximos', 'largo')
+    BLOQUE = 512
+
+    def __init__(self, ordenados=(), clave=None, tipo=None):
+        """'ordenados' ya tiene que estar en orden; se parte en bloques sin volver a ordenarlo."""
+        self.clave = clave
+        self.tipo = tipo
+        if tipo is not None and not isinstance(ordenados, array):
+            ordenados = array(tipo, ordenados)
+        elif tipo is None and not isinstance(ordenados, list):
+            ordenados = list(ordenados)
+        self.bloques = [ordenados[i:i + self.BLOQUE] for i in range(0, len(ordenados), self.BLOQUE)]
+        self.maximos = [self._clave(bloque[-1]) for bloque in self.bloques]
+        self.largo = len(ordenados)
+
+    def _clave(self, elemento):
+        return elemento if self.clave is None else self.clave(elemento)
+
+    def __len__(self):
+        return self.largo
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.bloques)
+
+    def desde(self, clave):
+        """Recorre en orden los elementos cuya clave es mayor o igual que 'clave'."""
+        b = bisect.bisect_left(self.maximos, clave)
+        if b == len(self.bloques):
+            return iter(())
+        bloque = self.bloques[b]
+        inicio = bisect.bisect_left(bloque, clave, key=self.clave)
+        return itertools.chain(itertools.islice(bloque, inicio, None),
+                               itertools.chain.from_iterable(itertools.islice(self.bloques, b + 1, None)))
+
+    def agregar(self, elemento):
+        clave = self._clave(elemento)
+        self.largo += 1
+        if not self.bloques:
+            self.bloques.append(array(self.tipo, (elemento,)) if self.tipo else [elemento])
+            self.maximos.append(clave)
+            return
+        b = min(bisect.bisect_left(self.maximos, clave), len(self.bloques) - 1)
+        bloque = self.bloques[b]
+        bloque.insert(bisect.bisect_left(bloque, clave, key=self.clave), elemento)
+        if clave > self.maximos[b]:
+            self.maximos[b] = clave
+        self._partir(b)
+
+    def quitar(self, elemento):
+        clave = self._clave(elemento)
+        b = bisect.bisect_left(self.maximos, clave)
+        bloque = self.bloques[b] if b < len(self.bloques) else ()
+        i = bisect.bisect_left(bloque, clave, key=self.clave)
+        if i == len(bloque) or bloque[i] != elemento:
+            raise ValueError(f"{elemento!r} no está en la lista.")
+        del bloque[i]
+        self.largo -= 1
+        if not bloque:
+            del self.bloques[b], self.maximos[b]
+            return
+        self.maximos[b] = self._clave(bloque[-1])
+        if len(bloque) < self.BLOQUE // 2 and len(self.bloques) > 1:
+            # Se junta con el bloque vecino para que no queden muchos bloques pequeños
+            b = min(b, len(self.bloques) - 2)
+            self.bloques[b].extend(self.bloques.pop(b + 1))
+            del self.maximos[b]
+            self._partir(b)
+
+    def _partir(self, b):
+        bloque = self.bloques[b]
+        if len(bloque) > 2 * self.BLOQUE:
+            self.bloques.insert(b + 1, bloque[self.BLOQUE:])
+            del bloque[self.BLOQUE:]
+            self.maximos.insert(b, self._clave(bloque[-1]))
+
+class IndiceBusqueda:
+    """
+    Índice de los nombres distintos de una lista para buscar por prefijo, por subcadena y de
+    forma aproximada, sin distinguir mayúsculas ni tildes. Se actualiza nombre a nombre.
+
+    Los resultados se ordenan por largo, luego por el nombre normalizado y luego por el
+    original ('claves'), así que no dependen del orden en que se agregaron los nombres. Todas
+    las listas de identificadores son ListaOrdenada en ese orden, y al crear el índice los
+    identificadores se dan en ese mismo orden para llenarlas sin ordenar nada.
+
+    - Prefijo: ListaOrdenada de los nombres normalizados y búsqueda binaria.
+    - Subcadena: cada trozo de 1 a LARGO_TROZO letras de los nombres tiene tres listas, una
+      por grupo del resultado (el nombre empieza por el trozo, una palabra empieza por él o
+      lo contiene en otro sitio), así que una consulta así de corta solo lee las primeras
+      'limite' de cada lista. Las más largas cruzan las listas de sus dos trozos menos
+      frecuentes y verifican solo esos nombres.
+    - Aproximada: cada palabra de la consulta se compara con el vocabulario de palabras de
+      los nombres. Las cortas admiten 1 error y se buscan con las variantes de un borrado;
+      las largas admiten 2 y se filtran por trigramas antes de calcular la distancia. Con una
+      sola palabra se mezclan en orden las listas de las parecidas hasta llegar al límite.
+
+    Los nombres quitados salen de todas las listas, pero dejan un hueco (None) en 'nombres'
+    y 'claves'; cuando los huecos son más que los nombres, _reconstruir() los quita.
+    """
+
+    LARGO_UN_ERROR = 7    # Palabras de hasta este largo admiten 1 error; las más largas, 2
+    LARGO_TROZO = 5       # Se indexan los trozos de 1 a LARGO_TROZO letras de cada nombre
+
+    def __init__(self, nombres=()):
+        self._crear(dict.fromkeys(nombres))
+
+    def _crear(self, nombres):
+        pares = sorted(((_normalizar(nombre), nombre) for nombre in nombres),
+                       key=lambda par: (len(par[0]), par[0], par[1]))
+        self.textos = [texto for texto, _ in pares]    # Identificador -> nombre normalizado
+        self.nombres = [nombre for _, nombre in pares] # Identificador -> nombre original (None si se quitó)
+        self.claves = [(len(texto), texto, nombre) for texto, nombre in pares]   # Identificador -> orden (None si se quitó)
+        self.ids = {nombre: ident for ident, nombre in enumerate(self.nombres)}   # Nombre -> identificador
+        self.por_texto = {}        # Nombre normalizado -> identificadores con ese texto
+        grupos = [collections.defaultdict(lambda: array('i')) for _ in range(3)]   # Trozo -> identificadores
+        palabras = collections.defaultdict(lambda: array('i'))                     # Palabra -> identificadores
+        recolector = _pausar_recolector()
+        try:
+            for ident, texto in enumerate(self.textos):
+                self.por_texto.setdefault(texto, []).append(ident)
+                for grupo, trozos in zip(grupos, self._trozos(texto)):
+                    for trozo in trozos:
+                        grupo[trozo].append(ident)
+                for palabra in set(texto.split()):
+                    palabras[palabra].append(ident)
+        finally:
+            if recolector:
+                gc.enable()
+        self.ordenados = ListaOrdenada(sorted(self.por_texto))   # Nombres normalizados distintos
+        # Las listas se pasan a ListaOrdenada y se sueltan a la vez para no tenerlas dos veces
+        clave = self.claves.__getitem__
+        self.trozos = {trozo: [ListaOrdenada(grupo.pop(trozo, ()), clave, 'i') for grupo in grupos]
+                       for trozo in grupos[2].keys() | grupos[1].keys() | grupos[0].keys()}
+        self.palabras = {palabra: ListaOrdenada(palabras.pop(palabra), clave, 'i') for palabra in list(palabras)}
+        self.borrados_palabra = {} # Palabra sin una letra -> palabras
+        self.trigramas_palabra = {}  # Trigrama (con espacios alrededor) -> palabras largas
+        for palabra in self.palabras:
+            self._indexar_palabra(palabra)
+        self.huecos = 0
+
+    def _reconstruir(self):
+        """
+        Vuelve a crear el índice solo con los nombres que quedan. quitar() lo llama cuando los
+        huecos pasan de la mitad, así que su coste O(n log n) se reparte entre n / 2 bajas.
+        """
+        self._crear(list(self.ids))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _trozos(self, texto):
+        """
+        Devuelve: (trozos por los que empieza el texto, por los que empieza otra de sus
+        palabras, el resto), tres conjuntos sin repetidos entre ellos con los trozos de 1 a
+        LARGO_TROZO letras. El texto entero no se incluye: esos nombres salen de por_texto.
+        """
+        largo = len(texto)
+        medidas = (largo, self.LARGO_TROZO)
+        cortes = _CORTES.get(medidas)
+        if cortes is None:
+            cortes = _CORTES[medidas] = [slice(i, i + n) for n in range(1, self.LARGO_TROZO + 1)
+                                         for i in range(largo - n + 1)]
+        resto = set(map(texto.__getitem__, cortes))
+        inicio = {texto[:n] for n in range(1, min(self.LARGO_TROZO, largo) + 1)}
+        palabras = set()
+        espacio = texto.find(" ")
+        while espacio != -1:
+            palabras.update(texto[espacio + 1:espacio + 1 + n] for n in range(1, self.LARGO_TROZO + 1))
+            espacio = texto.find(" ", espacio + 1)
+        palabras.discard("")
+        palabras -= inicio
+        resto -= inicio
+        resto -= palabras
+        inicio.discard(texto)
+        return inicio, palabras, resto
+
+    def agregar(self, nombre):
+        if nombre in self.ids:
+            return
+        ident = len(self.nombres)
+        texto = _normalizar(nombre)
+        self.nombres.append(nombre)
+        self.textos.append(texto)
+        self.claves.append((len(texto), texto, nombre))
+        self.ids[nombre] = ident
+        if texto not in self.por_texto:
+            self.ordenados.agregar(texto)
+            self.por_texto[texto] = []
+        self.por_texto[texto].append(ident)
+
+        for grupo, trozos in enumerate(self._trozos(texto)):
+            for trozo in trozos:
+                listas = self.trozos.get(trozo)
+                if listas is None:
+                    listas = self.trozos[trozo] = [ListaOrdenada(clave=self.claves.__getitem__, tipo='i') for _ in range(3)]
+                listas[grupo].agregar(ident)
+        for palabra in set(texto.split()):
+            if palabra not in self.palabras:
+                self.palabras[palabra] = ListaOrdenada(clave=self.claves.__getitem__, tipo='i')
+                self._indexar_palabra(palabra)
+            self.palabras[palabra].agregar(ident)
+
+    def _indexar_palabra(self, palabra):
+        for i in range(len(palabra)):
+            self.borrados_palabra.setdefault(palabra[:i] + palabra[i + 1:], set()).add(palabra)
+        if len(palabra) > self.LARGO_UN_ERROR - 2:
+            relleno = f" {palabra} "
+            for i in range(len(relleno) - 2):
+                self.trigramas_palabra.setdefault(relleno[i:i + 3], set()).add(palabra)
+
+    def quitar(self, nombre):
+        ident = self.ids.pop(nombre, None)
+        if ident is None:
+            return
+        texto = self.textos[ident]
+        # Se quita de las listas antes de borrar su clave, que hace falta para encontrarlo
+        for grupo, trozos in enumerate(self._trozos(texto)):
+            for trozo in trozos:
+                self.trozos[trozo][grupo].quitar(ident)
+        for palabra in set(texto.split()):
+            self.palabras[palabra].quitar(ident)
+        self.nombres[ident] = self.claves[ident] = None
+        self.huecos += 1
+        mismos = self.por_texto[texto]
+        mismos.remove(ident)
+        if not mismos:
+            del self.por_texto[texto]
+            self.ordenados.quitar(texto)
+        if self.huecos > len(self.ids):
+            self._reconstruir()
+
+    def prefijo(self, consulta, limite=20):
+        """Nombres que empiezan por la consulta, en orden alfabético."""
+        consulta = _normalizar(consulta)
+        encontrados = []
+        for texto in itertools.islice(self.ordenados.desde(consulta), limite):
+            if not texto.startswith(consulta):
+                break
+            encontrados.extend(sorted(self.por_texto[texto], key=self.nombres.__getitem__))
+        return [self.nombres[ident] for ident in encontrados[:limite]]
+
+    def subcadena(self, consulta, limite=20):
+        """
+        Nombres que contienen la consulta, ordenados: primero el nombre exacto, luego los que
+        empiezan por ella, luego los que tienen una palabra que empieza por ella y al final el
+        resto; dentro de cada grupo, los más cortos primero. Una consulta vacía no encuentra nada.
+        """
+        consulta = _normalizar(consulta)
+        if not consulta:
+            return []
+        if len(consulta) <= self.LARGO_TROZO:
+            # Las listas del trozo ya son los grupos 1 a 3 en orden: basta con leer el principio
+            exactos = sorted(self.por_texto.get(consulta, ()), key=self.nombres.__getitem__)
+            encontrados = itertools.chain(exactos, *self.trozos.get(consulta, ()))
+            return [self.nombres[ident] for ident in itertools.islice(encontrados, limite)]
+
+        largo = self.LARGO_TROZO
+        listas = [self.trozos.get(consulta[i:i + largo]) for i in range(len(consulta) - largo + 1)]
+        if not all(listas):
+            return []
+        # Se cruzan los identificadores de los dos trozos menos frecuentes sin mirar los textos
+        listas.sort(key=lambda grupos: sum(map(len, grupos)))
+        cruce = set(itertools.chain(*listas[0]))
+        if len(listas) > 1:
+            cruce.intersection_update(itertools.chain(*listas[1]))
+        # El resto, sin bucles de Python: compress se queda con los que contienen la consulta,
+        # se reparten por grupo con startswith y contains y cada grupo se ordena por su clave
+        coinciden = self._con_texto(cruce, operator.contains, consulta)
+        empiezan = self._con_texto(coinciden, str.startswith, consulta)
+        palabra = self._con_texto(coinciden, operator.contains, f" {consulta}") - empiezan
+        resto = coinciden - empiezan - palabra
+        empiezan.difference_update(self.por_texto.get(consulta, ()))
+        encontrados = sorted(self.por_texto.get(consulta, ()), key=self.nombres.__getitem__)
+        for grupo in (empiezan, palabra, resto):
+            if len(encontrados) >= limite:
+                break
+            encontrados += sorted(grupo, key=self.claves.__getitem__)
+        return [self.nombres[ident] for ident in encontrados[:limite]]
+
+    def _con_texto(self, identificadores, condicion, consulta):
+        """Devuelve: set de los identificadores cuyo texto cumple condicion(texto, consulta)."""
+        identificadores = list(identificadores)
+        if len(identificadores) < 2:
+            textos = [self.textos[ident] for ident in identificadores]
+        else:
+            textos = operator.itemgetter(*identificadores)(self.textos)
+        return set(itertools.compress(identificadores, map(condicion, textos, itertools.repeat(consulta))))
+
+    def _palabras_parecidas(self, palabra, limite=None):
+        """
+        Devuelve: dict {palabra del vocabulario: distancia} con las que están a 'limite'
+        errores o menos; por defecto, los que admite el largo de la palabra.
+        """
+        if limite is None:
+            limite = 1 if len(palabra) <= self.LARGO_UN_ERROR else 2
+        if limite == 1:
+            candidatas = {palabra} | self.borrados_palabra.get(palabra, set())   # Igual o con una letra más
+            for i in range(len(palabra)):
+                borrada = palabra[:i] + palabra[i + 1:]
+                candidatas.add(borrada)                                  # Con una letra menos
+                candidatas |= self.borrados_palabra.get(borrada, set())  # Con una letra cambiada
+        else:
+            relleno = f" {palabra} "
+            comunes = collections.Counter()
+            for i in range(len(relleno) - 2):
+                comunes.update(self.trigramas_palabra.get(relleno[i:i + 3], ()))
+            # Con d errores se pierden como mucho 3·d trigramas de la consulta
+            minimo = len(relleno) - 2 - 3 * limite
+            candidatas = [otra for otra, veces in comunes.items() if veces >= minimo]
+        distancias = {}
+        for otra in candidatas:
+            if otra in self.palabras:
+                distancia = _distancia_acotada(palabra, otra, limite)
+                if distancia <= limite:
+                    distancias[otra] = distancia
+        return distancias
+
+    def aproximada(self, consulta, limite=20):
+        """
+        Nombres en los que cada palabra de la consulta se parece a alguna de sus palabras,
+        ordenados por la suma de los errores y luego por largo.
+        """
+        palabras = _normalizar(consulta).split()
+        if len(palabras) == 1:
+            # Primero con un error, que sale del índice de borrados sin calcular distancias: si
+            # ya llena el límite, los nombres con dos errores quedarían detrás
+            encontrados = self._mas_parecidos(self._palabras_parecidas(palabras[0], 1), limite)
+            if len(encontrados) < limite and len(palabras[0]) > self.LARGO_UN_ERROR:
+                encontrados = self._mas_parecidos(self._palabras_parecidas(palabras[0]), limite)
+            return [self.nombres[ident] for ident in encontrados]
+        parecidas = [self._palabras_parecidas(palabra) for palabra in palabras]
+        if not parecidas or not all(parecidas):
+            return []
+
+        # Por cada palabra, el menor error de cada nombre; se suman en los nombres que las tienen todas
+        errores = self._errores_por_nombre(parecidas[0])
+        for distancias in parecidas[1:]:
+            otros = self._errores_por_nombre(distancias)
+            errores = {ident: errores[ident] + otros[ident] for ident in errores.keys() & otros.keys()}
+        mejores = heapq.nsmallest(limite, errores, key=lambda ident: (errores[ident], self.claves[ident]))
+        return [self.nombres[ident] for ident in mejores]
+
+    def _errores_por_nombre(self, distancias):
+        """
+        Devuelve: dict {identificador: menor distancia de sus palabras} de los nombres con
+        alguna de las palabras de 'distancias', sin bucles de Python: se llena de la mayor
+        distancia a la menor y cada update pisa a la anterior.
+        """
+        errores = {}
+        for distancia in sorted(set(distancias.values()), reverse=True):
+            listas = [self.palabras[otra] for otra, d in distancias.items() if d == distancia]
+            errores.update(dict.fromkeys(itertools.chain.from_iterable(listas), distancia))
+        return errores
+
+    def _mas_parecidos(self, distancias, limite):
+        """
+        Identificadores de los 'limite' primeros nombres con alguna de las palabras de
+        'distancias'. Las listas de cada palabra ya están en orden: se mezclan las de cada
+        distancia, de menos a más errores, y se para al llegar al límite.
+        """
+        mezclas = (heapq.merge(*[self.palabras[otra] for otra, d in distancias.items() if d == distancia],
+                               key=self.claves.__getitem__)
+                   for distancia in sorted(set(distancias.values())))
+        encontrados = {}         # Un nombre con dos palabras parecidas sale una sola vez
+        for ident in itertools.chain.from_iterable(mezclas):
+            if len(encontrados) == limite:
+                break
+            encontrados[ident] = None
+        return list(encontrados)
+
+    def buscar(self, consulta, modo="subcadena", limite=20):
+        """Busca con el modo indicado: 'prefijo', 'subcadena' o 'aproximada'."""
+        if modo not in MODOS_BUSQUEDA:
+            raise ValueError(f"Modo de búsqueda desconocido: '{modo}'.")
+        return getattr(self, modo)(consulta, limite)
+
+MODOS_BUSQUEDA = ("prefijo", "subcadena", "aproximada")
+
+# ---------------------- LECTURA Y ESCRITURA DE LISTAS EN VARIOS FORMATOS ----------------------
+#
+# Texto (un nombre por línea), M3U/M3U8, CSV (el nombre en la primera columna) y un formato
+# binario propio (.lrep): cabecera fija y luego todos los nombres en UTF-8 separados por
+# saltos de línea, que se cargan con mmap y se decodifican de una sola vez.
+
+TAMANO_BLOQUE = 1 << 20          # Caracteres que se leen o escriben de cada vez
+FORMATOS = {'.txt': 'texto', '.m3u': 'm3u', '.m3u8': 'm3u', '.csv': 'csv', '.lrep': 'binario'}
+_CABECERA_BINARIA = struct.Struct('<5sQQ')   # Marca, número de canciones, bytes de los nombres
+_MARCA_BINARIA = b'LREP1'
+_CABECERAS_CSV = {'nombre', 'name', 'titulo', 'título', 'title', 'cancion', 'canción'}
+
+def formato_de(archivo, formato=None):
+    """Devuelve el formato indicado o, si es None, el que corresponde a la extensión del archivo."""
+    if formato is None:
+        return FORMATOS.get(os.path.splitext(archivo)[1].lower(), 'texto')
+    if formato not in FORMATOS.values():
+        raise ValueError(f"Formato de lista desconocido: '{formato}'.")
+    return formato
+
+def _lineas(archivo, tamano_bloque):
+    """Líneas del archivo (sin el salto de línea) leídas en bloques grandes."""
+    with open(archivo, 'r', encoding='utf-8-sig') as f:
+        resto = ''
+        while (bloque := f.read(tamano_bloque)):
+            lineas = (resto + bloque).split('\n')
+            resto = lineas.pop()              # La última puede estar cortada por el bloque
+            yield from lineas
+        if resto:
+            yield resto
+
+def _leer_binario(archivo):
+    with open(archivo, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < _CABECERA_BINARIA.size:
+            raise ValueError(f"'{archivo}' no es una lista binaria.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            marca, canciones, largo = _CABECERA_BINARIA.unpack_from(datos)
+            if marca != _MARCA_BINARIA:
+                raise ValueError(f"'{archivo}' no es una lista binaria.")
+            if len(datos) < _CABECERA_BINARIA.size + largo:
+                raise ValueError(f"'{archivo}' está cortado: faltan nombres.")
+            if not canciones:
+                return []
+            with memoryview(datos) as vista:
+                texto = str(vista[_CABECERA_BINARIA.size:_CABECERA_BINARIA.size + largo], 'utf-8')
+    return texto.split('\n')
+
+def leer_canciones(archivo, formato=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Genera los nombres de las canciones del archivo en orden, saltándose las líneas vacías.
+    En M3U se usa el título de la línea #EXTINF si la hay y, si no, la ruta de la entrada.
+    """
+    formato = formato_de(archivo, formato)
+    if formato == 'binario':
+        yield from _leer_binario(archivo)
+    elif formato == 'csv':
+        with open(archivo, 'r', encoding='utf-8-sig', newline='', buffering=tamano_bloque) as f:
+            for numero, fila in enumerate(csv.reader(f)):
+                nombre = fila[0].strip() if fila else ''
+                if nombre and not (numero == 0 and nombre.casefold() in _CABECERAS_CSV):
+                    yield nombre
+    elif formato == 'm3u':
+        titulo = None
+        for linea in _lineas(archivo, tamano_bloque):
+            linea = linea.strip()
+            if linea.startswith('#'):
+                if linea[:8].upper() == '#EXTINF:':
+                    titulo = linea.partition(',')[2].strip() or None
+            elif linea:
+                yield titulo or linea
+                titulo = None
+    else:
+        for linea in _lineas(archivo, tamano_bloque):
+            nombre = linea.strip()
+            if nombre:
+                yield nombre
+
+def _escribir_por_bloques(f, trozos, tamano_bloque):
+    """Junta los trozos de texto y los escribe en bloques de unos tamano_bloque caracteres."""
+    bloque = []
+    acumulado = 0
+    for trozo in trozos:
+        bloque.append(trozo)
+        acumulado += len(trozo)
+        if acumulado >= tamano_bloque:
+            f.write(''.join(bloque))
+            bloque.clear()
+            acumulado = 0
+    f.write(''.join(bloque))
+
+def escribir_canciones(archivo, nombres, formato=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Escribe los nombres en el archivo con el formato indicado (o el de la extensión),
+    recorriéndolos una sola vez y escribiendo en bloques grandes.
+    Devuelve: número de canciones escritas.
+    """
+    formato = formato_de(archivo, formato)
+    contador = itertools.count()
+    contados = (nombre for nombre, _ in zip(nombres, contador))   # Cuenta sin guardar los nombres
+
+    if formato == 'binario':
+        with open(archivo, 'wb') as f:
+            f.write(bytes(_CABECERA_BINARIA.size))                  # Se rellena al terminar
+            largo = 0
+            separador = b''
+            while (trozo := list(itertools.islice(contados, 65536))):
+                datos = separador + '\n'.join(trozo).encode('utf-8')
+                f.write(datos)
+                largo += len(datos)
+                separador = b'\n'
+            canciones = next(contador)
+            f.seek(0)
+            f.write(_CABECERA_BINARIA.pack(_MARCA_BINARIA, canciones, largo))
+        return canciones
+
+    if formato == 'csv':
+        # csv.writer pone las comillas que hagan falta; se acumula en memoria y se vuelca por bloques
+        with open(archivo, 'w', encoding='utf-8', newline='') as f:
+            buffer = io.StringIO()
+            escritor = csv.writer(buffer, lineterminator='\n')
+            escritor.writerow(('nombre',))
+            for nombre in contados:
+                escritor.writerow((nombre,))
+                if buffer.tell() >= tamano_bloque:
+                    f.write(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+            f.write(buffer.getvalue())
+        return next(contador)
+
+    if formato == 'm3u':
+        # La entrada no puede empezar por '#' (sería un comentario); el título va en #EXTINF
+        trozos = itertools.chain(['#EXTM3U\n'], (f"#EXTINF:-1,{nombre}\n{'./' * nombre.startswith('#')}{nombre}\n"
+                                                  for nombre in contados))
+    else:
+        trozos = (nombre + '\n' for nombre in contados)
+    with open(archivo, 'w', encoding='utf-8') as f:
+        _escribir_por_bloques(f, trozos, tamano_bloque)
+    return next(contador)
+
+# ---------------------- CLASE PARA LA LISTA DE REPRODUCCIÓN ----------------------
+class ListaReproduccion:
+    def __init__(self, semilla=None):
+        self.primera = None         # Primer nodo/canción de la lista
+        self.ultima = None          # Último nodo, para agregar al final sin recorrer la lista
+        self.actual = None          # Canción que está sonando actualmente
+        self.modo_aleatorio = False # Indica si el modo aleatorio está activado
+        self.tamano = 0             # Número de canciones
+        # Índice nombre -> nodos con ese nombre, en el orden de la lista. Se usa un dict
+        # como conjunto ordenado para sacar el primero y borrar cualquiera en O(1).
+        self.indice = {}
+        self.semilla = semilla      # Semilla del modo aleatorio (None: orden distinto cada vez)
+        self.orden = None           # OrdenAleatorio, se crea la primera vez que se usa
+        self.busqueda = None        # IndiceBusqueda, se crea la primera vez que se busca por texto
+        self.diario = None          # Diario donde se registra cada cambio (ver ListaReproduccion.abrir)
+
+    @classmethod
+    def abrir(cls, carpeta, semilla=None, **opciones):
+        """
+        Recupera la lista guardada en la carpeta del diario (o una vacía si no hay nada) y
+        registra desde entonces cada cambio en el diario. 'opciones' se pasan a Diario.
+        """
+        os.makedirs(carpeta, exist_ok=True)
+        for archivo in os.listdir(carpeta):
+            # Instantánea a medias de un corte mientras se compactaba: no sirve para recuperar
+            partes = archivo.split('.')
+            if len(partes) == 4 and partes[0] == 'instantanea' and partes[1].isdigit() and partes[2:] == ['lrep', 'tmp']:
+                os.remove(os.path.join(carpeta, archivo))
+        lista = cls(semilla)
+        archivos = _generaciones(carpeta)
+        instantaneas = [g for tipo, g in archivos if tipo == 'instantanea']
+        inicio = max(instantaneas, default=0)
+        if instantaneas:
+            lista.cargar_lista(os.path.join(carpeta, f"instantanea.{inicio}.lrep"), 'binario')
+        diarios = sorted(g for tipo, g in archivos if tipo == 'diario' and g >= inicio)
+        for generacion in diarios:
+            _repetir_diario(lista, os.path.join(carpeta, f"diario.{generacion}.log"))
+        lista.diario = Diario(carpeta, lista, max(diarios, default=inicio), **opciones)
+        return lista
+
+    def cerrar(self):
+        """Escribe lo pendiente del diario y lo cierra."""
+        if self.diario is not None:
+            self.diario.cerrar()
+            self.diario = None
+
+    def _linea_cursor(self):
+        """Línea del diario que identifica la canción actual (cuál de las que tienen su nombre)."""
+        if self.actual is None:
+            return None
+        for numero, nodo in enumerate(self.indice[self.actual.nombre]):
+            if nodo is self.actual:
+                return f"C\t{numero}\t{nodo.nombre}\n"
+
+    def __len__(self):
+        return self.tamano
+
+    def agregar_cancion(self, nombre):
+        nueva = Cancion(nombre)     # Crea un nuevo nodo/canción
+        if not self.primera:
+            self.primera = self.actual = nueva  # Si la lista está vacía, es la primera y actual
+        else:
+            self.ultima.siguiente = nueva       # Enlaza la nueva canción al final
+            nueva.anterior = self.ultima        # Enlaza hacia atrás
+        self.ultima = nueva
+        self.tamano += 1
+        if nombre not in self.indice:
+            self.indice[nombre] = {}
+            if self.busqueda is not None:
+                self.busqueda.agregar(nombre)
+        self.indice[nombre][nueva] = None
+        if self.orden is not None:
+            self.orden.agregar(nueva)
+        if self.diario is not None:
+            self.diario.registrar(f"A\t{nombre}\n")
+        return nueva
+
+    def eliminar_cancion(self, nombre):
+        nodos = self.indice.get(nombre)
+        if not nodos:
+            return False
+        temp = next(iter(nodos))                    # La primera canción con ese nombre
+        del nodos[temp]
+        if not nodos:
+            del self.indice[nombre]
+            if self.busqueda is not None:
+                self.busqueda.quitar(nombre)
+        if self.orden is not None:
+            self.orden.quitar(temp)
+        if temp.anterior:
+            temp.anterior.siguiente = temp.siguiente  # Salta el nodo a eliminar
+        else:
+            self.primera = temp.siguiente             # Si es la primera, actualiza la cabeza
+        if temp.siguiente:
+            temp.siguiente.anterior = temp.anterior   # Ajusta el enlace hacia atrás
+        else:
+            self.ultima = temp.anterior               # Si es la última, actualiza la cola
+        if self.actual == temp:
+            self.actual = temp.siguiente or temp.anterior  # Cambia la actual si se elimina
+        self.tamano -= 1
+        if self.diario is not None:
+            self.diario.registrar(f"E\t{nombre}\n")
+        return True
+
+    def siguiente_cancion(self):
+        antes = self.actual
+        if self.modo_aleatorio:
+            if self.orden is None:
+                self.orden = OrdenAleatorio(self.obtener_lista(), self.semilla)
+            # Siguiente canción del orden aleatorio, distinta de la actual
+            self.actual = self.orden.siguiente(self.actual) or self.actual
+        elif self.actual and self.actual.siguiente:
+            self.actual = self.actual.siguiente  # Avanza a la siguiente canción
+        if self.diario is not None and self.actual is not antes:
+            self.diario.registrar(self._linea_cursor())
+
+    def anterior_cancion(self):
+        antes = self.actual
+        if self.modo_aleatorio:
+            if self.orden is not None:
+                # Vuelve a la canción que sonó antes en el modo aleatorio
+                self.actual = self.orden.anterior() or self.actual
+        elif self.actual and self.actual.anterior:
+            self.actual = self.actual.anterior   # Retrocede a la canción anterior
+        if self.diario is not None and self.actual is not antes:
+            self.diario.registrar(self._linea_cursor())
+
+    def repetir(self):
+        return self.actual.nombre if self.actual else "No hay canción."  # Devuelve el nombre de la actual
+
+    def buscar(self, nombre):
+        return nombre in self.indice
+
+    def buscar_texto(self, consulta, modo="subcadena", limite=20):
+        """
+        Búsqueda por prefijo, subcadena o aproximada (ver IndiceBusqueda).
+        Devuelve: lista de (nombre, [canciones con ese nombre]), de la mejor coincidencia a la peor.
+        """
+        if self.busqueda is None:
+            self.busqueda = IndiceBusqueda(self.indice)
+        return [(nombre, list(self.indice[nombre])) for nombre in self.busqueda.buscar(consulta, modo, limite)]
+
+    def obtener_lista(self):
+        lista = []
+        temp = self.primera
+        while temp:
+            lista.append(temp)      # Agrega cada nodo/canción a la lista
+            temp = temp.siguiente
+        return lista
+
+    def nombres_en_orden(self):
+        temp = self.primera
+        while temp:
+            yield temp.nombre
+            temp = temp.siguiente
+
+    def agregar_canciones(self, nombres):
+        """
+        Agrega muchas canciones al final enlazándolas en una sola pasada, sin pasar por
+        agregar_cancion() para cada una. Devuelve: número de canciones agregadas.
+        """
+        indice = self.indice
+        ultima = self.ultima
+        agregadas = 0
+        # Cada nodo nuevo despertaría al recolector de ciclos una y otra vez sin que haya
+        # basura que recoger: se pausa mientras se enlaza el bloque
+        recolector = _pausar_recolector()
+        try:
+            for nombre in nombres:
+                nueva = Cancion(nombre)
+                if ultima is None:
+                    self.primera = self.actual = nueva
+                else:
+                    ultima.siguiente = nueva
+                    nueva.anterior = ultima
+                ultima = nueva
+                nodos = indice.get(nombre)
+                if nodos is None:
+                    nodos = indice[nombre] = {}
+                    if self.busqueda is not None:
+                        self.busqueda.agregar(nombre)
+                nodos[nueva] = None
+                if self.orden is not None:
+                    self.orden.agregar(nueva)
+                if self.diario is not None:
+                    self.diario.registrar(f"A\t{nombre}\n")
+                agregadas += 1
+        finally:
+            # Si la lectura falla a medias, la lista queda coherente con lo ya agregado
+            self.ultima = ultima
+            self.tamano += agregadas
+            if recolector:
+                gc.enable()
+        return agregadas
+
+    def guardar_lista(self, archivo, formato=None):
+        return escribir_canciones(archivo, self.nombres_en_orden(), formato)  # Formato según la extensión
+
+    def cargar_lista(self, archivo, formato=None):
+        return self.agregar_canciones(leer_canciones(archivo, formato))     # Se saltan las líneas vacías
+
+# ---------------------- DIARIO DE CAMBIOS (PERSISTENCIA SIN REESCRIBIR LA LISTA) ----------------------
+#
+# En la carpeta del diario hay, por cada generación g, una instantánea 'instantanea.g.lrep'
+# (formato binario) con el estado al empezar la generación y un diario 'diario.g.log' con
+# una línea por cambio posterior:
+#
+#     A<tab>nombre             agregar_cancion(nombre)
+#     E<tab>nombre             eliminar_cancion(nombre)
+#     C<tab>n<tab>nombre       la canción actual pasa a ser la n-ésima con ese nombre
+#
+# Al abrir se carga la última instantánea completa y se repiten los diarios desde su
+# generación. Una instantánea se escribe a un archivo temporal y se renombra, así que un
+# corte a medias deja la anterior intacta; una última línea cortada del diario se descarta.
+
+class Diario:
+    """
+    Diario de solo añadir con confirmación por grupos: los cambios se acumulan en memoria y
+    se escriben con un único write() + fsync() cuando se juntan 'lote' o, como muy tarde,
+    'intervalo' segundos después (lo hace un hilo en segundo plano). Cuando el diario pasa
+    de 'limite_compactacion' bytes se empieza una generación nueva y otro hilo escribe la
+    instantánea, para que el diario no crezca sin límite.
+    """
+
+    def __init__(self, carpeta, lista, generacion, lote=256, intervalo=0.05, limite_compactacion=64 << 20):
+        self.carpeta = carpeta
+        self.lista = lista
+        self.generacion = generacion
+        self.lote = lote
+        self.intervalo = intervalo
+        self.limite_compactacion = limite_compactacion
+        self.pendientes = []               # Líneas aún no escritas
+        self.cerrojo = threading.Lock()
+        self.archivo = open(self._ruta('diario', generacion), 'ab')
+        self.tamano = self.archivo.tell()  # Bytes del diario de esta generación
+        self.compactacion = None           # Hilo que escribe la instantánea en curso
+        self.error_compactacion = None     # Excepción de la última instantánea, para quien la espere
+        self.toca_compactar = False        # Se compacta en el siguiente registrar(), en el hilo de la lista
+        # Contadores para medir la amplificación de escritura
+        self.bytes_cambios = 0             # Bytes de las líneas registradas
+        self.bytes_escritos = 0            # Bytes escritos en disco (diarios + instantáneas)
+        self.sincronizaciones = 0
+
+        self.parar = threading.Event()
+        self.hilo = threading.Thread(target=self._volcar_periodicamente, daemon=True)
+        self.hilo.start()
+
+    def _ruta(self, tipo, generacion):
+        return os.path.join(self.carpeta, f"{tipo}.{generacion}.{'log' if tipo == 'diario' else 'lrep'}")
+
+    def registrar(self, linea):
+        """Anota un cambio que ya se aplicó a la lista."""
+        with self.cerrojo:
+            self.pendientes.append(linea)
+            lleno = len(self.pendientes) >= self.lote
+        if self.toca_compactar:
+            self.compactar()               # La línea va al diario viejo: la instantánea ya la incluye
+        elif lleno:
+            self.sincronizar()
+
+    def sincronizar(self):
+        """Escribe los cambios pendientes y espera a que lleguen al disco (fsync)."""
+        with self.cerrojo:
+            if not self.pendientes:
+                return
+            datos = ''.join(self.pendientes).encode('utf-8')
+            self.pendientes.clear()
+            self.archivo.write(datos)
+            self.archivo.flush()
+            os.fsync(self.archivo.fileno())
+            self.tamano += len(datos)
+            self.bytes_cambios += len(datos)
+            self.bytes_escritos += len(datos)
+            self.sincronizaciones += 1
+            if self.tamano > self.limite_compactacion and self.compactacion is None:
+                self.toca_compactar = True
+
+    def _volcar_periodicamente(self):
+        while not self.parar.wait(self.intervalo):
+            self.sincronizar()
+
+    def compactar(self, esperar=False):
+        """
+        Empieza una generación nueva y escribe en segundo plano su instantánea. La copia de
+        los nombres se hace aquí, en el hilo de la lista, para que la instantánea sea coherente.
+        Si la instantánea falla, su error se lanza al esperarla: aquí con esperar=True o, si
+        no, en la siguiente compactación o en cerrar().
+        """
+        self._esperar_compactacion()
+        self.toca_compactar = False
+        self.sincronizar()
+        nombres = list(self.lista.nombres_en_orden())
+        with self.cerrojo:
+            self.archivo.close()
+            self.generacion += 1
+            self.archivo = open(self._ruta('diario', self.generacion), 'ab')
+            self.tamano = 0
+        cursor = self.lista._linea_cursor()
+        if cursor:
+            with self.cerrojo:
+                self.pendientes.append(cursor)     # La instantánea no guarda la canción actual
+        # El hilo pone self.compactacion a None al terminar: se espera al de la variable local
+        hilo = threading.Thread(target=self._escribir_instantanea, args=(nombres, self.generacion), daemon=True)
+        self.compactacion = hilo
+        hilo.start()
+        if esperar:
+            hilo.join()
+            self._lanzar_error_compactacion()
+
+    def _escribir_instantanea(self, nombres, generacion):
+        temporal = self._ruta('instantanea', generacion) + '.tmp'
+        try:
+            escribir_canciones(temporal, nombres, 'binario')
+            with open(temporal, 'rb+') as f:
+                os.fsync(f.fileno())
+            os.replace(temporal, self._ruta('instantanea', generacion))
+            with self.cerrojo:
+                self.bytes_escritos += os.path.getsize(self._ruta('instantanea', generacion))
+            # Lo anterior a esta generación ya no hace falta para recuperar la lista
+            for tipo, anterior in _generaciones(self.carpeta):
+                if anterior < generacion:
+                    os.remove(self._ruta(tipo, anterior))
+        except BaseException as error:
+            # Sin la instantánea se sigue recuperando con la anterior y los diarios; el error
+            # lo recibe quien espere a la compactación (compactar, la siguiente o cerrar)
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            self.error_compactacion = error
+        finally:
+            self.compactacion = None
+
+    def _lanzar_error_compactacion(self):
+        error, self.error_compactacion = self.error_compactacion, None
+        if error is not None:
+            raise error
+
+    def _esperar_compactacion(self):
+        hilo = self.compactacion
+        if hilo is not None:
+            hilo.join()
+        self._lanzar_error_compactacion()
+
+    def cerrar(self):
+        self.parar.set()
+        self.hilo.join()
+        try:
+            self._esperar_compactacion()
+        finally:
+            self.sincronizar()
+            self.archivo.close()
+
+def _generaciones(carpeta):
+    """Devuelve: lista de (tipo, generación) de los archivos del diario que hay en la carpeta."""
+    encontrados = []
+    for archivo in os.listdir(carpeta):
+        partes = archivo.split('.')
+        if len(partes) == 3 and partes[1].isdigit() and (partes[0], partes[2]) in (('diario', 'log'),
+                                                                                 ('instantanea', 'lrep')):
+            encontrados.append((partes[0], int(partes[1])))
+    return encontrados
+
+def _repetir_diario(lista, ruta):
+    """
+    Aplica a la lista los cambios del diario. Si la última línea quedó cortada por un corte
+    de luz, se descarta y se recorta el archivo para poder seguir añadiendo detrás.
+    """
+    with open(ruta, 'rb') as f:
+        datos = f.read()
+    completo = datos.rfind(b'\n') + 1
+    if completo < len(datos):
+        with open(ruta, 'rb+') as f:
+            f.truncate(completo)
+    lineas = datos[:completo].decode('utf-8').split('\n')
+    lineas.pop()
+    # Las altas seguidas (lo más habitual) se enlazan de una vez
+    for tipo, grupo in itertools.groupby(lineas, key=lambda linea: linea[:1]):
+        if tipo == 'A':
+            lista.agregar_canciones(linea[2:] for linea in grupo)
+        elif tipo == 'E':
+            for linea in grupo:
+                lista.eliminar_cancion(linea[2:])
+        elif tipo == 'C':
+            for linea in grupo:
+                numero, _, nombre = linea[2:].partition('\t')
+                nodos = lista.indice.get(nombre)
+                if nodos and int(numero) < len(nodos):
+                    lista.actual = next(itertools.islice(nodos, int(numero), None))
+
+# ---------------------- ACCESO POR POSICIÓN (VISTAS DE UNA VENTANA DE LA LISTA) ----------------------
+
+class PosicionesLista:
+    """
+    Canción de cualquier posición de una ListaReproduccion sin recorrer la lista desde el
+    principio cada vez: recuerda un nodo de cada 'paso' posiciones a medida que los pasa y
+    parte del más cercano que conoce (o del principio o el final de la lista). Así una
+    vista que solo dibuja las filas visibles puede abrirse y desplazarse sin copiar la lista.
+    Hay que llamar a invalidar() cada vez que se agregan o eliminan canciones.
+    """
+    def __init__(self, lista, paso=1024):
+        self.lista = lista
+        self.paso = paso
+        self.marcas = {}          # Posición (múltiplo de paso) -> nodo
+        self.claves = []          # Las mismas posiciones, ordenadas
+
+    def invalidar(self):
+        self.marcas.clear()
+        self.claves.clear()
+
+    def _marcar(self, posicion, nodo):
+        if posicion not in self.marcas:
+            bisect.insort(self.claves, posicion)
+            self.marcas[posicion] = nodo
+
+    def _recorrer(self, nodo, posicion, destino):
+        paso = self.paso
+        while posicion < destino:
+            nodo = nodo.siguiente
+            posicion += 1
+            if not posicion % paso:
+                self._marcar(posicion, nodo)
+        while posicion > destino:
+            nodo = nodo.anterior
+            posicion -= 1
+            if not posicion % paso:
+                self._marcar(posicion, nodo)
+        return nodo
+
+    def cancion(self, posicion):
+        """Devuelve: el nodo Cancion de esa posición, o None si está fuera de la lista."""
+        total = len(self.lista)
+        if not 0 <= posicion < total:
+            return None
+        # Punto de partida más cercano: el principio, el final o una marca a cada lado
+        candidatos = [(posicion, 0, self.lista.primera), (total - 1 - posicion, total - 1, self.lista.ultima)]
+        i = bisect.bisect_right(self.claves, posicion)
+        if i:
+            marca = self.claves[i - 1]
+            candidatos.append((posicion - marca, marca, self.marcas[marca]))
+        if i < len(self.claves):
+            marca = self.claves[i]
+            candidatos.append((marca - posicion, marca, self.marcas[marca]))
+        _, inicio, nodo = min(candidatos, key=operator.itemgetter(0))
+        return self._recorrer(nodo, inicio, posicion)
+
+    def ventana(self, inicio, cantidad):
+        """Devuelve: lista con los nodos de las posiciones inicio .. inicio + cantidad - 1 que existan."""
+        nodo = self.cancion(inicio)
+        nodos = []
+        while nodo is not None and len(nodos) < cantidad:
+            nodos.append(nodo)
+            if nodo.siguiente is not None and not (inicio + len(nodos)) % self.paso:
+                self._marcar(inicio + len(nodos), nodo.siguiente)
+            nodo = nodo.siguiente
+        return nodos
+
+# ---------------------- LISTA DE REPRODUCCIÓN COMPACTA ----------------------
+#
+# Misma interfaz que ListaReproduccion, pero cada canción es una ranura (un entero) en
+# unos arrays('i') con los enlaces, en lugar de un objeto Cancion con su __dict__. Los
+# nombres se guardan una sola vez en una tabla aunque se repitan, y las canciones con el
+# mismo nombre se enlazan entre sí para buscar y eliminar en O(1). El valor -1 hace de None.
+
+class CancionCompacta:
+    """
+    Vista de una ranura de ListaReproduccionCompacta (o de una posición de ListaPersistente)
+    con la misma interfaz que Cancion.
+    """
+    __slots__ = ('lista', 'ranura')
+
+    def __init__(self, lista, ranura):
+        self.lista = lista
+        self.ranura = ranura
+
+    @property
+    def nombre(self):
+        return self.lista._nombre(self.ranura)
+
+    @property
+    def siguiente(self):
+        return self.lista._vista(self.lista._siguiente(self.ranura))
+
+    @property
+    def anterior(self):
+        return self.lista._vista(self.lista._anterior(self.ranura))
+
+    def __eq__(self, otra):
+        return isinstance(otra, CancionCompacta) and otra.lista is self.lista and otra.ranura == self.ranura
+
+    def __hash__(self):
+        return hash((id(self.lista), self.ranura))
+
+class ListaReproduccionCompacta:
+    def __init__(self, semilla=None):
+        # Por ranura
+        self.siguientes = array('i')        # Ranura de la siguiente canción
+        self.anteriores = array('i')        # Ranura de la canción anterior
+        self.nombre_de = array('i')         # Identificador del nombre en la tabla
+        self.siguiente_igual = array('i')   # Siguiente canción con el mismo nombre
+        self.libres = []                    # Ranuras de canciones eliminadas, para reutilizarlas
+        # Por nombre
+        self.nombres = []                   # Tabla de nombres: identificador -> nombre
+        self.ids = {}                       # Nombre -> identificador
+        self.primera_igual = array('i')     # Primera canción de la lista con ese nombre
+        self.ultima_igual = array('i')      # Última canción de la lista con ese nombre
+        self.ids_libres = []                # Identificadores de nombres que ya no se usan
+
+        self.primera = -1
+        self.ultima = -1
+        self.ranura_actual = -1
+        self.modo_aleatorio = False
+        self.tamano = 0
+        self.semilla = semilla
+        self.orden = None                   # OrdenAleatorio sobre las ranuras
+        self.busqueda = None                # IndiceBusqueda, se crea la primera vez que se busca por texto
+
+    def __len__(self):
+        return self.tamano
+
+    def _vista(self, ranura):
+        return CancionCompacta(self, ranura) if ranura >= 0 else None
+
+    @property
+    def actual(self):
+        return self._vista(self.ranura_actual)
+
+    @actual.setter
+    def actual(self, cancion):
+        self.ranura_actual = cancion.ranura if cancion is not None else -1
+
+    def _ranuras(self):
+        ranura = self.primera
+        while ranura >= 0:
+            yield ranura
+            ranura = self.siguientes[ranura]
+
+    def _nombre(self, ranura):
+        return self.nombres[self.nombre_de[ranura]]
+
+    def _siguiente(self, ranura):
+        return self.siguientes[ranura]
+
+    def _anterior(self, ranura):
+        return self.anteriores[ranura]
+
+    def agregar_cancion(self, nombre):
+        return CancionCompacta(self, self._agregar_ranura(nombre))
+
+    def agregar_canciones(self, nombres):
+        """Agrega muchas canciones al final. Devuelve: número de canciones agregadas."""
+        agregar = self._agregar_ranura
+        agregadas = 0
+        for nombre in nombres:
+            agregar(nombre)
+            agregadas += 1
+        return agregadas
+
+    def _agregar_ranura(self, nombre):
+        # Identificador del nombre, creándolo si es la primera canción que lo usa
+        ident = self.ids.get(nombre)
+        if ident is None:
+            if self.ids_libres:
+                ident = self.ids_libres.pop()
+                self.nombres[ident] = nombre
+                self.primera_igual[ident] = self.ultima_igual[ident] = -1
+            else:
+                ident = len(self.nombres)
+                self.nombres.append(nombre)
+                self.primera_igual.append(-1)
+                self.ultima_igual.append(-1)
+            self.ids[nombre] = ident
+            if self.busqueda is not None:
+                self.busqueda.agregar(nombre)
+
+        if self.libres:
+            nueva = self.libres.pop()
+            self.siguientes[nueva] = -1
+            self.anteriores[nueva] = self.ultima
+            self.nombre_de[nueva] = ident
+            self.siguiente_igual[nueva] = -1
+        else:
+            nueva = len(self.siguientes)
+            self.siguientes.append(-1)
+            self.anteriores.append(self.ultima)
+            self.nombre_de.append(ident)
+            self.siguiente_igual.append(-1)
+
+        # Enlaza al final de la lista y al final de las canciones con el mismo nombre
+        if self.ultima < 0:
+            self.primera = self.ranura_actual = nueva
+        else:
+            self.siguientes[self.ultima] = nueva
+        self.ultima = nueva
+        if self.primera_igual[ident] < 0:
+            self.primera_igual[ident] = nueva
+        else:
+            self.siguiente_igual[self.ultima_igual[ident]] = nueva
+        self.ultima_igual[ident] = nueva
+        self.tamano += 1
+        if self.orden is not None:
+            self.orden.agregar(nueva)
+        return nueva
+
+    def eliminar_cancion(self, nombre):
+        ident = self.ids.get(nombre)
+        if ident is None:
+            return False
+        ranura = self.primera_igual[ident]       # La primera canción con ese nombre
+
+        # Desenlaza de las canciones con el mismo nombre: como siempre es la primera de ellas,
+        # basta con el enlace hacia delante
+        otra = self.siguiente_igual[ranura]
+        self.primera_igual[ident] = otra
+        if otra < 0:
+            del self.ids[nombre]                 # Ya no queda ninguna con ese nombre
+            self.nombres[ident] = None
+            self.ids_libres.append(ident)
+            if self.busqueda is not None:
+                self.busqueda.quitar(nombre)
+
+        # Desenlaza de la lista
+        anterior = self.anteriores[ranura]
+        siguiente = self.siguientes[ranura]
+        if anterior >= 0:
+            self.siguientes[anterior] = siguiente
+        else:
+            self.primera = siguiente
+        if siguiente >= 0:
+            self.anteriores[siguiente] = anterior
+        else:
+            self.ultima = anterior
+        if self.ranura_actual == ranura:
+            self.ranura_actual = siguiente if siguiente >= 0 else anterior
+        self.libres.append(ranura)
+        self.tamano -= 1
+        if self.orden is not None:
+            self.orden.quitar(ranura)
+        return True
+
+    def siguiente_cancion(self):
+        if self.modo_aleatorio:
+            if self.orden is None:
+                self.orden = OrdenAleatorio(self._ranuras(), self.semilla)
+            actual = self.ranura_actual if self.ranura_actual >= 0 else None
+            ranura = self.orden.siguiente(actual)
+            if ranura is not None:
+                self.ranura_actual = ranura
+        elif self.ranura_actual >= 0 and self.siguientes[self.ranura_actual] >= 0:
+            self.ranura_actual = self.siguientes[self.ranura_actual]
+
+    def anterior_cancion(self):
+        if self.modo_aleatorio:
+            if self.orden is not None:
+                ranura = self.orden.anterior()
+                if ranura is not None:
+                    self.ranura_actual = ranura
+        elif self.ranura_actual >= 0 and self.anteriores[self.ranura_actual] >= 0:
+            self.ranura_actual = self.anteriores[self.ranura_actual]
+
+    def repetir(self):
+        if self.ranura_actual < 0:
+            return "No hay canción."
+        return self.nombres[self.nombre_de[self.ranura_actual]]
+
+    def buscar(self, nombre):
+        return nombre in self.ids
+
+    def buscar_texto(self, consulta, modo="subcadena", limite=20):
+        """Igual que ListaReproduccion.buscar_texto(), con vistas CancionCompacta."""
+        if self.busqueda is None:
+            self.busqueda = IndiceBusqueda(self.ids)
+        resultados = []
+        for nombre in self.busqueda.buscar(consulta, modo, limite):
+            canciones = []
+            ranura = self.primera_igual[self.ids[nombre]]
+            while ranura >= 0:
+                canciones.append(CancionCompacta(self, ranura))
+                ranura = self.siguiente_igual[ranura]
+            resultados.append((nombre, canciones))
+        return resultados
+
+    def obtener_lista(self):
+        return [CancionCompacta(self, ranura) for ranura in self._ranuras()]
+
+    def nombres_en_orden(self):
+        nombres = self.nombres
+        nombre_de = self.nombre_de
+        return (nombres[nombre_de[ranura]] for ranura in self._ranuras())
+
+    def guardar_lista(self, archivo, formato=None):
+        return escribir_canciones(archivo, self.nombres_en_orden(), formato)
+
+    def cargar_lista(self, archivo, formato=None):
+        return self.agregar_canciones(leer_canciones(archivo, formato))
+
+# ---------------------- LISTA DE REPRODUCCIÓN PERSISTENTE (COPIAS EN O(1)) ----------------------
+# Las canciones solo se agregan al final, así que el orden de la lista es el orden en que se
+# agregaron: cada canción recibe una posición creciente y la lista es un árbol de 32 ramas
+# indexado por esa posición. Las canciones eliminadas dejan un hueco; los subárboles que se
+# quedan sin canciones se sueltan, así que avanzar o retroceder nunca recorre huecos largos.
+# Los nombres van en un trie de hash (HAMT) que guarda las posiciones de cada nombre.
+#
+# Ninguna copia modifica un nodo que comparte con otra: fork() solo reparte marcas de dueño
+# nuevas y cada edición copia los nodos de su camino (uno por nivel) que todavía no son suyos.
+
+_BITS_RAMA = 5
+_RAMAS = 1 << _BITS_RAMA
+_MASCARA_RAMA = _RAMAS - 1
+_BITS_HASH = 64
+_MASCARA_HASH = (1 << _BITS_HASH) - 1
+
+# Nodo del árbol de posiciones: [dueño, canciones vivas, hijo0 .. hijo31]; en las hojas los
+# hijos son los nombres (None si la canción se eliminó)
+def _primera_viva(nodo, desplazamiento, desde):
+    """Primera posición con canción >= 'desde' dentro del subárbol (relativa a él), o -1."""
+    if not desplazamiento:
+        for i in range(desde + 2, _RAMAS + 2):
+            if nodo[i] is not None:
+                return i - 2
+        return -1
+    resto = desde & ((1 << desplazamiento) - 1)
+    for rama in range(desde >> desplazamiento, _RAMAS):
+        hijo = nodo[rama + 2]
+        if hijo is not None:
+            posicion = _primera_viva(hijo, desplazamiento - _BITS_RAMA, resto)
+            if posicion >= 0:
+                return (rama << desplazamiento) | posicion
+        resto = 0
+    return -1
+
+def _ultima_viva(nodo, desplazamiento, hasta):
+    """Última posición con canción <= 'hasta' dentro del subárbol (relativa a él), o -1."""
+    if not desplazamiento:
+        for i in range(hasta + 2, 1, -1):
+            if nodo[i] is not None:
+                return i - 2
+        return -1
+    resto = hasta & ((1 << desplazamiento) - 1)
+    for rama in range(hasta >> desplazamiento, -1, -1):
+        hijo = nodo[rama + 2]
+        if hijo is not None:
+            posicion = _ultima_viva(hijo, desplazamiento - _BITS_RAMA, resto)
+            if posicion >= 0:
+                return (rama << desplazamiento) | posicion
+        resto = (1 << desplazamiento) - 1
+    return -1
+
+def _hojas(nodo, desplazamiento, base=0):
+    """Genera (posición de la primera ranura, hoja) para cada hoja, en orden."""
+    if not desplazamiento:
+        yield base, nodo
+        return
+    for rama in range(_RAMAS):
+        hijo = nodo[rama + 2]
+        if hijo is not None:
+            yield from _hojas(hijo, desplazamiento - _BITS_RAMA, base | (rama << desplazamiento))
+
+# Trie de nombres: los nodos internos son listas [dueño, ranura0 .. ranura31]; una ranura
+# guarda None, otro nodo, una entrada (nombre, posiciones, hash) o, si dos nombres tienen
+# el mismo hash completo, un dict {nombre: posiciones}
+def _hamt_buscar(nodo, clave, h):
+    desplazamiento = 0
+    while nodo is not None:
+        tipo = type(nodo)
+        if tipo is list:
+            nodo = nodo[((h >> desplazamiento) & _MASCARA_RAMA) + 1]
+            desplazamiento += _BITS_RAMA
+        elif tipo is tuple:
+            return nodo[1] if nodo[0] == clave else None
+        else:
+            return nodo.get(clave)
+    return None
+
+def _hamt_entradas(nodo):
+    """Genera (nombre, posiciones) de todo el trie."""
+    tipo = type(nodo)
+    if tipo is list:
+        for hijo in nodo[1:]:
+            if hijo is not None:
+                yield from _hamt_entradas(hijo)
+    elif tipo is tuple:
+        yield nodo[0], nodo[1]
+    elif nodo is not None:
+        yield from nodo.items()
+
+class ListaPersistente:
+    """
+    Lista de reproducción con la misma interfaz que ListaReproduccion (las canciones se
+    devuelven como vistas CancionCompacta) y copias baratas: fork() es O(1), cada edición
+    posterior copia O(log n) nodos y la memoria de una copia crece con sus ediciones, no con
+    el tamaño de la lista. Es una clase aparte porque las canciones enlazadas de
+    ListaReproduccion se modifican en su sitio y no se pueden compartir entre copias.
+    """
+    HOLGURA_BUSQUEDA = 1024   # Nombres ajenos que puede tener el índice de búsqueda antes de crear uno propio
+    def __init__(self, semilla=None):
+        self.raiz = None                # Árbol de posiciones
+        self.niveles = 1                # Niveles del árbol (1: la raíz es una hoja)
+        self.nombres = None             # Trie de nombres: nombre -> tupla de posiciones, en orden
+        self.posiciones = 0             # Posición que recibirá la próxima canción
+        self.ranura_actual = -1
+        self.modo_aleatorio = False
+        self.tamano = 0
+        self.semilla = semilla
+        self.orden = None               # OrdenAleatorio sobre las posiciones, propio de cada copia
+        self.distintos = 0              # Nombres distintos
+        self.busqueda = None            # IndiceBusqueda, compartido con las copias (ver buscar_texto)
+        self.dueno = object()           # Marca de los nodos que esta copia puede modificar sin copiarlos
+
+    def __len__(self):
+        return self.tamano
+
+    def fork(self):
+        """
+        Copia independiente de la lista en O(1). Las dos comparten todos los nodos hasta
+        que una los modifica. La copia conserva la canción actual y empieza su propio
+        orden aleatorio. Devuelve: la nueva ListaPersistente.
+        """
+        copia = type(self).__new__(type(self))
+        copia.__dict__.update(self.__dict__)
+        copia.orden = None
+        # Ninguna de las dos puede seguir modificando en su sitio los nodos que ahora comparten
+        copia.dueno = object()
+        self.dueno = object()
+        return copia
+
+    # --- Nodos ---
+    def _propio(self, nodo):
+        """El mismo nodo si es de esta copia; si no, una copia suya que ya lo es."""
+        if nodo[0] is self.dueno:
+            return nodo
+        copia = nodo.copy()
+        copia[0] = self.dueno
+        return copia
+
+    def _nodo_vacio(self):
+        return [self.dueno, 0] + [None] * _RAMAS
+
+    def _poner_nombre(self, nodo, clave, h, valor, desplazamiento=0):
+        """Trie de nombres con 'clave' -> 'valor' (None la quita), copiando solo el camino."""
+        if nodo is None:
+            return None if valor is None else (clave, valor, h)
+        tipo = type(nodo)
+        if tipo is tuple:
+            if nodo[0] == clave:
+                return None if valor is None else (clave, valor, h)
+            if valor is None:
+                return nodo
+            if desplazamiento >= _BITS_HASH:
+                return {nodo[0]: nodo[1], clave: valor}
+            # Dos nombres en la misma ranura: se separan un nivel más abajo
+            nuevo = [self.dueno] + [None] * _RAMAS
+            nuevo[((nodo[2] >> desplazamiento) & _MASCARA_RAMA) + 1] = nodo
+            return self._poner_nombre(nuevo, clave, h, valor, desplazamiento)
+        if tipo is dict:
+            copia = dict(nodo)
+            if valor is None:
+                copia.pop(clave, None)
+            else:
+                copia[clave] = valor
+            return copia or None
+        i = ((h >> desplazamiento) & _MASCARA_RAMA) + 1
+        hijo = self._poner_nombre(nodo[i], clave, h, valor, desplazamiento + _BITS_RAMA)
+        if hijo is nodo[i]:
+            return nodo                 # Sin cambios, o el hijo ya era de esta copia
+        nodo = self._propio(nodo)
+        nodo[i] = hijo
+        if hijo is None and not any(nodo[1:]):
+            return None
+        return nodo
+
+    # --- Posiciones ---
+    def _nombre(self, posicion):
+        nodo = self.raiz
+        desplazamiento = _BITS_RAMA * (self.niveles - 1)
+        while desplazamiento:
+            nodo = nodo[((posicion >> desplazamiento) & _MASCARA_RAMA) + 2]
+            desplazamiento -= _BITS_RAMA
+        return nodo[(posicion & _MASCARA_RAMA) + 2]
+
+    def _siguiente(self, posicion):
+        desde = posicion + 1
+        if self.raiz is None or desde >> (_BITS_RAMA * self.niveles):
+            return -1
+        return _primera_viva(self.raiz, _BITS_RAMA * (self.niveles - 1), desde)
+
+    def _anterior(self, posicion):
+        if self.raiz is None or posicion <= 0:
+            return -1
+        return _ultima_viva(self.raiz, _BITS_RAMA * (self.niveles - 1), posicion - 1)
+
+    def _vista(self, posicion):
+        return CancionCompacta(self, posicion) if posicion >= 0 else None
+
+    @property
+    def actual(self):
+        return self._vista(self.ranura_actual)
+
+    @actual.setter
+    def actual(self, cancion):
+        self.ranura_actual = cancion.ranura if cancion is not None else -1
+
+    def _ranuras(self):
+        if self.raiz is None:
+            return
+        for base, hoja in _hojas(self.raiz, _BITS_RAMA * (self.niveles - 1)):
+            for i in range(2, _RAMAS + 2):
+                if hoja[i] is not None:
+                    yield base + i - 2
+
+    def _agregar_posicion(self, nombre):
+        posicion = self.posiciones
+        if posicion >> (_BITS_RAMA * self.niveles):
+            # El árbol está lleno: la raíz pasa a ser la primera rama de una raíz nueva
+            raiz = self._nodo_vacio()
+            raiz[1] = self.tamano
+            raiz[2] = self.raiz
+            self.raiz = raiz
+            self.niveles += 1
+        nodo = self.raiz = self._nodo_vacio() if self.raiz is None else self._propio(self.raiz)
+        desplazamiento = _BITS_RAMA * (self.niveles - 1)
+        while desplazamiento:
+            nodo[1] += 1
+            i = ((posicion >> desplazamiento) & _MASCARA_RAMA) + 2
+            hijo = nodo[i]
+            nodo[i] = hijo = self._nodo_vacio() if hijo is None else self._propio(hijo)
+            nodo = hijo
+            desplazamiento -= _BITS_RAMA
+        nodo[1] += 1
+        nodo[(posicion & _MASCARA_RAMA) + 2] = nombre
+        self.posiciones = posicion + 1
+
+        h = hash(nombre) & _MASCARA_HASH
+        anteriores = _hamt_buscar(self.nombres, nombre, h) or ()
+        self.nombres = self._poner_nombre(self.nombres, nombre, h, anteriores + (posicion,))
+        if not anteriores:
+            self.distintos += 1
+            if self.busqueda is not None:
+                self.busqueda.agregar(nombre)
+        if not self.tamano:
+            self.ranura_actual = posicion
+        self.tamano += 1
+        if self.orden is not None:
+            self.orden.agregar(posicion)
+        return posicion
+
+    def _quitar_posicion(self, posicion):
+        camino = []
+        nodo = self.raiz = self._propio(self.raiz)
+        desplazamiento = _BITS_RAMA * (self.niveles - 1)
+        while desplazamiento:
+            nodo[1] -= 1
+            i = ((posicion >> desplazamiento) & _MASCARA_RAMA) + 2
+            nodo[i] = hijo = self._propio(nodo[i])
+            camino.append((nodo, i))
+            nodo = hijo
+            desplazamiento -= _BITS_RAMA
+        nodo[1] -= 1
+        nodo[(posicion & _MASCARA_RAMA) + 2] = None
+        # Se sueltan los subárboles que se han quedado sin canciones
+        while camino and not nodo[1]:
+            nodo, i = camino.pop()
+            nodo[i] = None
+        if not self.raiz[1]:
+            self.raiz = None
+
+    # --- Interfaz de ListaReproduccion ---
+    def agregar_cancion(self, nombre):
+        return CancionCompacta(self, self._agregar_posicion(nombre))
+
+    def agregar_canciones(self, nombres):
+        """Agrega muchas canciones al final. Devuelve: número de canciones agregadas."""
+        agregar = self._agregar_posicion
+        agregadas = 0
+        # Los nodos del árbol son listas: el recolector de ciclos se pausa mientras se crean
+        recolector = _pausar_recolector()
+        try:
+            for nombre in nombres:
+                agregar(nombre)
+                agregadas += 1
+        finally:
+            if recolector:
+                gc.enable()
+        return agregadas
+
+    def eliminar_cancion(self, nombre):
+        h = hash(nombre) & _MASCARA_HASH
+        posiciones = _hamt_buscar(self.nombres, nombre, h)
+        if posiciones is None:
+            return False
+        posicion = posiciones[0]                 # La primera canción con ese nombre
+        self.nombres = self._poner_nombre(self.nombres, nombre, h, posiciones[1:] or None)
+        if len(posiciones) == 1:
+            self.distintos -= 1                  # Sigue en el índice de búsqueda: puede ser de otra copia
+        if self.ranura_actual == posicion:
+            siguiente = self._siguiente(posicion)
+            self.ranura_actual = siguiente if siguiente >= 0 else self._anterior(posicion)
+        self._quitar_posicion(posicion)
+        self.tamano -= 1
+        if self.orden is not None:
+            self.orden.quitar(posicion)
+        return True
+
+    def siguiente_cancion(self):
+        if self.modo_aleatorio:
+            if self.orden is None:
+                self.orden = OrdenAleatorio(self._ranuras(), self.semilla)
+            actual = self.ranura_actual if self.ranura_actual >= 0 else None
+            posicion = self.orden.siguiente(actual)
+            if posicion is not None:
+                self.ranura_actual = posicion
+        elif self.ranura_actual >= 0:
+            posicion = self._siguiente(self.ranura_actual)
+            if posicion >= 0:
+                self.ranura_actual = posicion
+
+    def anterior_cancion(self):
+        if self.modo_aleatorio:
+            if self.orden is not None:
+                posicion = self.orden.anterior()
+                if posicion is not None:
+                    self.ranura_actual = posicion
+        elif self.ranura_actual >= 0:
+            posicion = self._anterior(self.ranura_actual)
+            if posicion >= 0:
+                self.ranura_actual = posicion
+
+    def repetir(self):
+        if self.ranura_actual < 0:
+            return "No hay canción."
+        return self._nombre(self.ranura_actual)
+
+    def buscar(self, nombre):
+        return _hamt_buscar(self.nombres, nombre, hash(nombre) & _MASCARA_HASH) is not None
+
+    def buscar_texto(self, consulta, modo="subcadena", limite=20):
+        """
+        Igual que ListaReproduccion.buscar_texto(), con vistas CancionCompacta.
+
+        El índice se crea la primera vez y fork() lo comparte: cada copia le agrega sus
+        nombres nuevos y ninguna quita, así que tiene los de todas. Cada copia se queda con
+        los resultados que son suyos y, si le faltan, pide el doble. El orden de un nombre no
+        depende de los demás, así que sale el mismo que con un índice propio. Cuando el
+        índice tiene más del doble de nombres que la copia, se crea uno solo con los suyos.
+        """
+        if self.busqueda is None or len(self.busqueda) > 2 * self.distintos + self.HOLGURA_BUSQUEDA:
+            self.busqueda = IndiceBusqueda(nombre for nombre, _ in _hamt_entradas(self.nombres))
+        pedidos = limite
+        while True:
+            encontrados = self.busqueda.buscar(consulta, modo, pedidos)
+            resultados = []
+            for nombre in encontrados:
+                posiciones = _hamt_buscar(self.nombres, nombre, hash(nombre) & _MASCARA_HASH)
+                if posiciones is not None:
+                    resultados.append((nombre, [CancionCompacta(self, posicion) for posicion in posiciones]))
+                    if len(resultados) == limite:
+                        return resultados
+            if len(encontrados) < pedidos or not limite:
+                return resultados
+            pedidos *= 2
+
+    def obtener_lista(self):
+        return [CancionCompacta(self, posicion) for posicion in self._ranuras()]
+
+    def nombres_en_orden(self):
+        if self.raiz is None:
+            return iter(())
+        return (nombre for _, hoja in _hojas(self.raiz, _BITS_RAMA * (self.niveles - 1))
+                for nombre in hoja[2:] if nombre is not None)
+
+    def guardar_lista(self, archivo, formato=None):
+        return escribir_canciones(archivo, self.nombres_en_orden(), formato)
+
+    def cargar_lista(self, archivo, formato=None):
+        return self.agregar_canciones(leer_canciones(archivo, formato))
+
+# ---------------------- BENCHMARK DEL MODO ALEATORIO ----------------------
+
+def comparar_aleatorio(canciones=100_000, saltos=1_000, semilla=0):
+    """
+    Compara el salto aleatorio original (copia la lista y elige con random.choice) con el
+    orden aleatorio precalculado, con la misma semilla para que sea reproducible.
+    Devuelve: (segundos_por_salto_original, segundos_por_salto_precalculado).
+    """
+    lista = ListaReproduccion(semilla=semilla)
+    for i in range(canciones):
+        lista.agregar_cancion(f"Canción {i}")
+
+    aleatorio = random.Random(semilla)
+    inicio = time.perf_counter()
+    actual = lista.actual
+    for _ in range(saltos):
+        actual = aleatorio.choice([c for c in lista.obtener_lista() if c != actual])
+    original = (time.perf_counter() - inicio) / saltos
+
+    lista.modo_aleatorio = True
+    lista.siguiente_cancion()          # Crea el orden aleatorio fuera de la medición
+    inicio = time.perf_counter()
+    for _ in range(saltos):
+        lista.siguiente_cancion()
+    precalculado = (time.perf_counter() - inicio) / saltos
+    return original, precalculado
+
+# ---------------------- BENCHMARK DEL ALMACENAMIENTO COMPACTO ----------------------
+
+def comparar_almacenamiento(canciones=1_000_000, operaciones=100_000, semilla=0):
+    """
+    Compara ListaReproduccion (un objeto por canción) con ListaReproduccionCompacta: bytes
+    por canción (medidos con tracemalloc, sin contar los nombres, que ocupan lo mismo en
+    las dos) y operaciones por segundo al agregar, buscar, eliminar y avanzar.
+    Devuelve: dict {nombre de la clase: {medida: valor}}.
+    """
+    import tracemalloc
+
+    nombres = [f"Canción {i}" for i in range(canciones)]
+    aleatorio = random.Random(semilla)
+    buscadas = aleatorio.choices(nombres, k=operaciones)
+    eliminadas = aleatorio.sample(nombres, operaciones)
+
+    def por_segundo(funcion, cantidad):
+        inicio = time.perf_counter()
+        funcion()
+        return cantidad / (time.perf_counter() - inicio)
+
+    resultados = {}
+    for clase in (ListaReproduccion, ListaReproduccionCompacta):
+        tracemalloc.start()
+        lista = clase()
+        for nombre in nombres:
+            lista.agregar_cancion(nombre)
+        bytes_por_cancion = tracemalloc.get_traced_memory()[0] / canciones
+        tracemalloc.stop()
+        del lista
+
+        lista = clase(semilla=semilla)
+        medidas = {"bytes_por_cancion": bytes_por_cancion}
+        medidas["agregar_s"] = por_segundo(lambda: [lista.agregar_cancion(n) for n in nombres], canciones)
+        medidas["buscar_s"] = por_segundo(lambda: [lista.buscar(n) for n in buscadas], operaciones)
+        medidas["siguiente_s"] = por_segundo(lambda: [lista.siguiente_cancion() for _ in range(operaciones)],
+                                             operaciones)
+        medidas["eliminar_s"] = por_segundo(lambda: [lista.eliminar_cancion(n) for n in eliminadas], operaciones)
+        resultados[clase.__name__] = medidas
+    return resultados
+
+# ---------------------- BENCHMARK DE LA BÚSQUEDA ----------------------
+
+def nombres_aleatorios(cantidad, semilla=0):
+    """Nombres de canciones de 2 a 4 palabras inventadas juntando sílabas al azar."""
+    generador = random.Random(semilla)
+    silabas = [consonante + vocal for consonante in "bcdfglmnprstvz" for vocal in "aeiou"]
+    vocabulario = sorted({''.join(generador.choices(silabas, k=generador.randint(1, 4))) for _ in range(50_000)})
+    return [' '.join(generador.choices(vocabulario, k=generador.randint(2, 4))).capitalize()
+            for _ in range(cantidad)]
+
+OBJETIVO_BUSQUEDA_MS = 1.0   # Tiempo por consulta que debe cumplir el índice con un millón de canciones
+
+def comparar_busqueda(canciones=1_000_000, consultas=200, semilla=0):
+    """
+    Mide cuánto tarda en crearse el índice de búsqueda, el tiempo por consulta de cada modo
+    con consultas de varios largos (media, mediana y percentil 99, cada consulta una sola
+    vez) y lo que cuesta agregar y quitar un nombre, comparado con recorrer todos los
+    nombres buscando la subcadena.
+    Devuelve: dict {'crear_indice_ms', 'agregar_ms', 'quitar_ms', 'recorrido_lineal_ms':
+    milisegundos, 'consultas': {caso: {'media_ms', 'p50_ms', 'p99_ms'}}}.
+    """
+    generador = random.Random(semilla)
+    lista = ListaReproduccion()
+    for nombre in nombres_aleatorios(canciones, semilla):
+        lista.agregar_cancion(nombre)
+
+    inicio = time.perf_counter()
+    lista.buscar_texto("")
+    resultados = {"crear_indice_ms": (time.perf_counter() - inicio) * 1000}
+
+    def errata(palabra):
+        i = generador.randrange(len(palabra))
+        return palabra[:i] + generador.choice("aeiou") + palabra[i + 1:]   # Una letra cambiada
+
+    elegidos = [_normalizar(nombre) for nombre in generador.sample(list(lista.indice), consultas)]
+    casos = {"prefijo": ("prefijo", [nombre[:6] for nombre in elegidos])}
+    for largo in (1, 2, 3, 5, 8):
+        casos[f"subcadena_{largo}"] = ("subcadena", [nombre[(len(nombre) - largo) // 2:][:largo] for nombre in elegidos])
+    casos["aproximada"] = ("aproximada", [errata(generador.choice(nombre.split())) for nombre in elegidos])
+    casos["aproximada_2"] = ("aproximada", [f"{errata(nombre.split()[0])} {nombre.split()[1]}" for nombre in elegidos])
+
+    resultados["consultas"] = {}
+    for caso, (modo, textos) in casos.items():
+        tiempos = []
+        for texto in textos:
+            inicio = time.perf_counter()
+            lista.buscar_texto(texto, modo)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        tiempos.sort()
+        resultados["consultas"][caso] = {"media_ms": sum(tiempos) / len(tiempos),
+                                         "p50_ms": tiempos[len(tiempos) // 2],
+                                         "p99_ms": tiempos[len(tiempos) * 99 // 100]}
+
+    # Las ediciones se miden en el índice, sin la lista enlazada
+    nuevos = [nombre for nombre in nombres_aleatorios(consultas, semilla + 1) if nombre not in lista.indice]
+    for medida, operacion in (("agregar_ms", lista.busqueda.agregar), ("quitar_ms", lista.busqueda.quitar)):
+        inicio = time.perf_counter()
+        for nombre in nuevos:
+            operacion(nombre)
+        resultados[medida] = (time.perf_counter() - inicio) * 1000 / len(nuevos)
+
+    normalizados = [_normalizar(nombre) for nombre in lista.indice]
+    subcadenas = casos["subcadena_5"][1]
+    inicio = time.perf_counter()
+    for texto in subcadenas[:10]:
+        [nombre for nombre in normalizados if texto in nombre]
+    resultados["recorrido_lineal_ms"] = (time.perf_counter() - inicio) * 1000 / 10
+    return resultados
+
+# ---------------------- BENCHMARK DE LOS FORMATOS DE LISTA ----------------------
+
+def comparar_formatos(canciones=1_000_000, carpeta=None, semilla=0):
+    """
+    Guarda y carga una lista en cada formato y lo compara con la carga original, línea a
+    línea con agregar_cancion(). Los archivos se crean en una carpeta temporal.
+    Devuelve: dict {formato: {'guardar_s', 'cargar_s', 'bytes'}}.
+    """
+    import tempfile
+
+    lista = ListaReproduccion()
+    lista.agregar_canciones(nombres_aleatorios(canciones, semilla))
+    resultados = {}
+    with tempfile.TemporaryDirectory(dir=carpeta) as temporal:
+        for extension in ('.txt', '.m3u8', '.csv', '.lrep'):
+            archivo = os.path.join(temporal, 'lista' + extension)
+            inicio = time.perf_counter()
+            lista.guardar_lista(archivo)
+            guardar = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            cargada = ListaReproduccion()
+            cargada.cargar_lista(archivo)
+            resultados[formato_de(archivo)] = {"guardar_s": guardar, "cargar_s": time.perf_counter() - inicio,
+                                               "bytes": os.path.getsize(archivo)}
+            del cargada                       # Liberar la lista no cuenta en la medición
+
+        archivo = os.path.join(temporal, 'lista.txt')
+        inicio = time.perf_counter()
+        original = ListaReproduccion()
+        with open(archivo, 'r', encoding='utf-8') as f:
+            for linea in f:
+                original.agregar_cancion(linea.strip())
+        resultados["linea_a_linea"] = {"guardar_s": None, "cargar_s": time.perf_counter() - inicio,
+                                       "bytes": os.path.getsize(archivo)}
+    return resultados
+
+# ---------------------- BENCHMARK DEL DIARIO ----------------------
+
+def comparar_diario(canciones=200_000, ediciones=50_000, guardar_cada=1_000, carpeta=None, semilla=0):
+    """
+    Compara guardar la lista completa cada 'guardar_cada' ediciones con registrar cada
+    edición en el diario. Mide el tiempo de las ediciones, los bytes escritos en disco y su
+    amplificación (bytes escritos / bytes de las líneas de cambio) y lo que tarda en
+    recuperarse la lista del diario al abrirla de nuevo.
+    Devuelve: dict {estrategia: {medida: valor}}.
+    """
+    import tempfile
+
+    nombres = nombres_aleatorios(canciones, semilla)
+
+    def editar(lista, aleatorio, al_editar):
+        for numero in range(ediciones):
+            opcion = aleatorio.random()
+            if opcion < 0.4:
+                lista.agregar_cancion(aleatorio.choice(nombres))
+            elif opcion < 0.7:
+                lista.eliminar_cancion(aleatorio.choice(nombres))
+            else:
+                lista.siguiente_cancion()
+            al_editar(numero)
+
+    resultados = {}
+    with tempfile.TemporaryDirectory(dir=carpeta) as temporal:
+        # Reescritura completa periódica
+        lista = ListaReproduccion()
+        lista.agregar_canciones(nombres)
+        archivo = os.path.join(temporal, 'lista.txt')
+        escritos = []
+
+        def guardar(numero):
+            if (numero + 1) % guardar_cada == 0:
+                lista.guardar_lista(archivo)
+                escritos.append(os.path.getsize(archivo))
+        inicio = time.perf_counter()
+        editar(lista, random.Random(semilla), guardar)
+        resultados["reescritura"] = {"ediciones_s": time.perf_counter() - inicio, "bytes_escritos": sum(escritos)}
+
+        # Diario con confirmación por grupos
+        carpeta_diario = os.path.join(temporal, 'diario')
+        lista = ListaReproduccion.abrir(carpeta_diario)
+        lista.agregar_canciones(nombres)
+        lista.diario.compactar(esperar=True)           # Se parte de una instantánea, como la reescritura
+        diario = lista.diario
+        escritos_antes, cambios_antes = diario.bytes_escritos, diario.bytes_cambios
+        inicio = time.perf_counter()
+        editar(lista, random.Random(semilla), lambda numero: None)
+        lista.cerrar()
+        segundos = time.perf_counter() - inicio
+        cambios = diario.bytes_cambios - cambios_antes
+        resultados["diario"] = {"ediciones_s": segundos, "bytes_escritos": diario.bytes_escritos - escritos_antes,
+                                "sincronizaciones": diario.sincronizaciones}
+
+        inicio = time.perf_counter()
+        recuperada = ListaReproduccion.abrir(carpeta_diario)
+        resultados["diario"]["recuperar_s"] = time.perf_counter() - inicio
+        recuperada.cerrar()
+
+    for medidas in resultados.values():
+        medidas["amplificacion"] = medidas["bytes_escritos"] / cambios
+    return resultados
+
+# ---------------------- BENCHMARK DE LAS COPIAS ----------------------
+
+def comparar_copias(canciones=1_000_000, copias=1_000, ediciones=10, copias_completas=3, carpeta=None,
+                    semilla=0):
+    """
+    Crea 'copias' variantes de una lista maestra, cada una con 'ediciones' cambios al azar
+    (agregar, eliminar o avanzar), con fork() de ListaPersistente y como hasta ahora,
+    guardando la maestra y cargándola en una ListaReproduccion nueva (esto último solo
+    'copias_completas' veces, porque cada copia cuesta lo que la lista entera).
+    Mide el tiempo y los bytes (con tracemalloc) por copia ya editada.
+    Devuelve: dict {estrategia: {'ms_por_copia', 'bytes_por_copia'}}.
+    """
+    import tempfile
+    import tracemalloc
+
+    nombres = nombres_aleatorios(canciones, semilla)
+
+    def editar(lista, aleatorio):
+        for _ in range(ediciones):
+            opcion = aleatorio.random()
+            if opcion < 0.4:
+                lista.agregar_cancion(aleatorio.choice(nombres))
+            elif opcion < 0.8:
+                lista.eliminar_cancion(aleatorio.choice(nombres))
+            else:
+                lista.siguiente_cancion()
+
+    def medir(copiar, cantidad):
+        aleatorio = random.Random(semilla)
+        inicio = time.perf_counter()
+        variantes = [copiar() for _ in range(cantidad)]
+        for variante in variantes:
+            editar(variante, aleatorio)
+        segundos = time.perf_counter() - inicio
+        del variantes
+
+        aleatorio = random.Random(semilla)
+        tracemalloc.start()
+        variantes = [copiar() for _ in range(cantidad)]
+        for variante in variantes:
+            editar(variante, aleatorio)
+        ocupados = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del variantes
+        return {"ms_por_copia": segundos * 1000 / cantidad, "bytes_por_copia": ocupados / cantidad}
+
+    maestra = ListaPersistente()
+    maestra.agregar_canciones(nombres)
+    resultados = {"fork": medir(maestra.fork, copias)}
+    del maestra
+
+    maestra = ListaReproduccion()
+    maestra.agregar_canciones(nombres)
+    with tempfile.TemporaryDirectory(dir=carpeta) as temporal:
+        archivo = os.path.join(temporal, 'maestra.lrep')
+
+        def guardar_y_cargar():
+            maestra.guardar_lista(archivo)
+            copia = ListaReproduccion()
+            copia.cargar_lista(archivo)
+            return copia
+        resultados["guardar_y_cargar"] = medir(guardar_y_cargar, copias_completas)
+    return resultados
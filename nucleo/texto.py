@@ -0,0 +1,596 @@
+# Lógica del Ejercicio 1 (procesamiento de texto), sin dependencias de Tkinter
+
+import codecs                         # Para decodificar UTF-8 por bloques sin cortar caracteres
+import hashlib                        # Hash estable entre procesos para los estimadores aproximados
+import heapq                          # Para mezclar los tramos ordenados y elegir las palabras más frecuentes
+import itertools                      # Combinaciones de operaciones para el benchmark de la tubería
+import math                           # Logaritmo para la corrección de HyperLogLog
+import mmap                           # Para proyectar archivos grandes en memoria sin leerlos completos
+import os                             # Para consultar el tamaño de los archivos procesados
+import re                             # Para localizar separadores de palabras en bytes
+import tempfile                       # Para guardar los tramos ordenados en archivos temporales
+import time                           # Para medir el rendimiento del procesamiento de archivos
+import timeit                         # Para el benchmark de la tubería de transformaciones
+from array import array               # Contadores compactos del CountMinSketch
+from collections import Counter, deque  # Counter para frecuencias y deque para las tareas pendientes
+from operator import itemgetter       # Para ordenar y mezclar por la clave precalculada
+
+# ---------------------- FUNCIONES DE PROCESAMIENTO DE TEXTO ----------------------
+
+def invertir_palabras(frase):
+    """
+    Invierte el orden de las palabras en la frase.
+    Ejemplo: "Hola mundo bonito" -> "bonito mundo Hola"
+    """
+    palabras = frase.strip().split()   # Elimina espacios y separa la frase en palabras
+    pila = list(palabras)              # Crea una copia de la lista de palabras (simula una pila)
+    resultado = []
+    while pila:                        # Mientras la pila tenga elementos
+        resultado.append(pila.pop())   # Saca la última palabra y la agrega al resultado
+    return ' '.join(resultado)         # Une las palabras invertidas en una sola cadena
+
+def invertir_letras(frase):
+    """
+    Invierte las letras de cada palabra, pero mantiene el orden de las palabras.
+    Ejemplo: "Hola mundo" -> "aloH odnum"
+    """
+    return ' '.join([palabra[::-1] for palabra in frase.strip().split()])
+
+def invertir_completo(frase):
+    """
+    Invierte completamente la frase (letras y palabras).
+    Ejemplo: "Hola mundo" -> "odnum aloH"
+    """
+    palabras = invertir_palabras(frase)  # Invierte el orden de las palabras
+    return palabras[::-1]                # Invierte todos los caracteres de la frase resultante
+
+def contar_palabras(frase):
+    """
+    Cuenta el número de palabras en la frase.
+    """
+    return f"Número de palabras: {len(frase.strip().split())}"
+
+def ordenar_alfabetico(frase):
+    """
+    Ordena las palabras de la frase alfabéticamente (ignorando mayúsculas/minúsculas).
+    """
+    palabras = sorted(frase.strip().split(), key=lambda x: x.lower())
+    return ' '.join(palabras)
+
+# ---------------------- TUBERÍA DE TRANSFORMACIONES FUSIONADAS ----------------------
+
+# Funciones de texto que se pueden encadenar, con el mismo nombre que en la interfaz
+OPERACIONES_TEXTO = {
+    "Invertir palabras": invertir_palabras,
+    "Invertir letras de cada palabra": invertir_letras,
+    "Invertir completamente": invertir_completo,
+    "Ordenar alfabéticamente": ordenar_alfabetico,
+    "Contar palabras": contar_palabras,
+}
+
+def _clave_normal(palabra):
+    return palabra.lower()
+
+def _clave_al_reves(palabra):
+    return palabra[::-1].lower()
+
+class Tuberia:
+    """
+    Encadena operaciones de texto y las aplica en una sola pasada sobre las palabras.
+    Ejemplo: Tuberia("Invertir palabras", "Ordenar alfabéticamente").aplicar(frase)
+    da lo mismo que ordenar_alfabetico(invertir_palabras(frase)), pero separa la frase
+    una única vez y no crea cadenas ni listas intermedias.
+    """
+    def __init__(self, *operaciones):
+        self.operaciones = []
+        self._plan = None
+        for operacion in operaciones:
+            self.encadenar(operacion)
+
+    def encadenar(self, operacion):
+        """Añade una operación al final de la tubería y la devuelve para seguir encadenando"""
+        if operacion not in OPERACIONES_TEXTO:
+            raise ValueError(f"Operación no válida: '{operacion}'.")
+        if self.operaciones and self.operaciones[-1] == "Contar palabras":
+            raise ValueError("'Contar palabras' debe ser la última operación.")
+        self.operaciones.append(operacion)
+        self._plan = None
+        return self
+
+    def _compilar(self):
+        """
+        Reduce las operaciones a un plan: las ordenaciones que hay que hacer sobre la lista
+        de palabras original y, al final, si hay que recorrerla al revés y si hay que invertir
+        las letras de cada palabra. Contar no depende del orden ni de las letras, así que
+        si la tubería termina contando no hace falta nada más.
+        """
+        if self.operaciones and self.operaciones[-1] == "Contar palabras":
+            return [], False, False, True
+
+        ordenaciones = []        # Pares (clave, reverse) para list.sort()
+        orden_invertido = False  # La secuencia lógica es la lista física leída al revés
+        letras_invertidas = False
+        for operacion in self.operaciones:
+            if operacion == "Invertir palabras":
+                orden_invertido = not orden_invertido
+            elif operacion in ("Invertir letras de cada palabra", "Invertir completamente"):
+                letras_invertidas = not letras_invertidas
+            elif operacion == "Ordenar alfabéticamente":
+                clave = _clave_al_reves if letras_invertidas else _clave_normal
+                paso = (clave, orden_invertido)
+                # Si desde la última ordenación solo hubo inversiones que se anularon entre sí,
+                # la secuencia ya está ordenada y volver a ordenar no cambia nada
+                if not ordenaciones or ordenaciones[-1] != paso:
+                    ordenaciones.append(paso)
+        return ordenaciones, orden_invertido, letras_invertidas, False
+
+    def aplicar(self, frase):
+        """Aplica todas las operaciones a la frase de una vez"""
+        if not self.operaciones:
+            return frase         # Sin operaciones no se toca ni el espaciado, como al encadenar cero funciones
+        if self._plan is None:
+            self._plan = self._compilar()
+        ordenaciones, orden_invertido, letras_invertidas, contar = self._plan
+
+        palabras = frase.split()
+        if contar:
+            return f"Número de palabras: {len(palabras)}"
+        for clave, descendente in ordenaciones:
+            # Si la secuencia lógica está al revés, se ordena la lista física de mayor a menor:
+            # sort(reverse=True) es estable, y leída al revés queda igual que ordenar la secuencia lógica
+            palabras.sort(key=clave, reverse=descendente)
+        recorrido = reversed(palabras) if orden_invertido else palabras
+        if letras_invertidas:
+            return ' '.join(palabra[::-1] for palabra in recorrido)
+        return ' '.join(recorrido)
+
+    def aplicar_lote(self, frases):
+        """Aplica la tubería a varias frases y devuelve la lista de resultados"""
+        aplicar = self.aplicar
+        return [aplicar(frase) for frase in frases]
+
+    def aplicar_ingenuo(self, frase):
+        """Aplica las funciones de texto una detrás de otra (sirve para comparar)"""
+        for operacion in self.operaciones:
+            frase = OPERACIONES_TEXTO[operacion](frase)
+        return frase
+
+def comparar_tuberias(frases, longitud=2, repeticiones=3):
+    """
+    Micro-benchmark: para cada combinación de 'longitud' operaciones compara el tiempo de
+    aplicar las funciones una detrás de otra con el de la tubería fusionada sobre el lote
+    de frases, comprobando que ambos resultados coinciden.
+    Devuelve: lista de (operaciones, segundos_ingenuo, segundos_fusionado).
+    """
+    resultados = []
+    for combinacion in itertools.product(OPERACIONES_TEXTO, repeat=longitud):
+        if "Contar palabras" in combinacion[:-1]:
+            continue                                   # Contar solo puede ir al final
+        tuberia = Tuberia(*combinacion)
+        if tuberia.aplicar_lote(frases) != [tuberia.aplicar_ingenuo(frase) for frase in frases]:
+            raise AssertionError(f"La tubería fusionada no coincide para {combinacion}.")
+        ingenuo = min(timeit.repeat(lambda: [tuberia.aplicar_ingenuo(f) for f in frases], number=1, repeat=repeticiones))
+        fusionado = min(timeit.repeat(lambda: tuberia.aplicar_lote(frases), number=1, repeat=repeticiones))
+        resultados.append((combinacion, ingenuo, fusionado))
+    return resultados
+
+# ---------------------- PROCESAMIENTO DE ARCHIVOS POR BLOQUES ----------------------
+
+TAMANO_BLOQUE = 1 << 20   # Tamaño de cada bloque de lectura/escritura (1 MiB)
+
+def leer_palabras(archivo, tamano_bloque=TAMANO_BLOQUE, inicio=0, fin=None):
+    """
+    Generador que devuelve las palabras de un archivo leyéndolo por bloques de tamaño fijo.
+    Si un bloque termina a mitad de una palabra, ese trozo se guarda y se une al siguiente bloque.
+    'inicio' y 'fin' limitan la lectura a un rango de bytes que debe empezar y terminar en un espacio.
+    """
+    decodificador = codecs.getincrementaldecoder('utf-8')()  # Une los caracteres cortados entre bloques
+    resto = ''                                  # Trozo de palabra cortado al final del bloque anterior
+    with open(archivo, 'rb') as f:
+        f.seek(inicio)
+        pendientes = None if fin is None else fin - inicio   # Bytes que quedan por leer del rango
+        while pendientes is None or pendientes > 0:
+            datos = f.read(tamano_bloque if pendientes is None else min(tamano_bloque, pendientes))
+            if not datos:
+                break
+            if pendientes is not None:
+                pendientes -= len(datos)
+            bloque = resto + decodificador.decode(datos)
+            palabras = bloque.split()
+            if palabras and not bloque[-1].isspace():
+                resto = palabras.pop()          # La última palabra puede continuar en el siguiente bloque
+            else:
+                resto = ''
+            yield from palabras
+    resto += decodificador.decode(b'', final=True)
+    if resto:
+        yield resto
+
+def escribir_palabras(palabras, destino, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Escribe las palabras separadas por un espacio, acumulándolas en memoria
+    hasta llenar un bloque para hacer pocas llamadas a write().
+    """
+    buffer = []
+    tamano = 0
+    primero = True
+    for palabra in palabras:
+        buffer.append(palabra)
+        tamano += len(palabra) + 1
+        if tamano >= tamano_bloque:
+            if not primero:
+                destino.write(' ')
+            destino.write(' '.join(buffer))    # Vacía el bloque en el archivo
+            primero = False
+            buffer = []
+            tamano = 0
+    if buffer:
+        if not primero:
+            destino.write(' ')
+        destino.write(' '.join(buffer))
+
+# Bytes que str.split() considera espacio y que en UTF-8 ocupan un solo byte
+_ESPACIO_BYTES = re.compile(rb'[ \t\n\r\x0b\x0c\x1c-\x1f]')
+
+def leer_palabras_al_reves(archivo, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Generador que devuelve las palabras de un archivo desde la última hasta la primera.
+    El archivo se proyecta en memoria con mmap y se recorre hacia atrás por bloques,
+    así que nunca se construye la lista completa de palabras.
+    """
+    with open(archivo, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return                                  # mmap no admite archivos vacíos
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            fin = len(mapa)
+            resto = b''                             # Trozo de palabra que continúa en el bloque anterior
+            while fin > 0:
+                inicio = max(0, fin - tamano_bloque)
+                bloque = mapa[inicio:fin] + resto
+                if inicio > 0:
+                    # Solo se puede cortar en un espacio: lo que hay antes puede seguir en el bloque anterior
+                    espacio = _ESPACIO_BYTES.search(bloque)
+                    corte = espacio.start() if espacio else len(bloque)
+                    resto = bloque[:corte]
+                    bloque = bloque[corte:]
+                else:
+                    resto = b''
+                palabras = bloque.decode('utf-8').split()
+                palabras.reverse()
+                yield from palabras
+                fin = inicio
+
+def _archivo_invertir_palabras(archivo_entrada, destino, tamano_bloque):
+    escribir_palabras(leer_palabras_al_reves(archivo_entrada, tamano_bloque), destino, tamano_bloque)
+
+def _archivo_invertir_letras(archivo_entrada, destino, tamano_bloque):
+    palabras = leer_palabras(archivo_entrada, tamano_bloque)
+    escribir_palabras((palabra[::-1] for palabra in palabras), destino, tamano_bloque)
+
+def _archivo_contar_palabras(archivo_entrada, destino, tamano_bloque):
+    total = sum(1 for _ in leer_palabras(archivo_entrada, tamano_bloque))
+    destino.write(f"Número de palabras: {total}")
+
+# ---------------------- ORDENACIÓN EXTERNA POR TRAMOS ----------------------
+
+TAMANO_TRAMO = 32 * 1024 * 1024   # Caracteres de texto que se ordenan en memoria de una vez
+
+def _tramos(palabras, tamano_tramo):
+    """Agrupa las palabras en tramos de como mucho 'tamano_tramo' caracteres"""
+    tramo = []
+    tamano = 0
+    for palabra in palabras:
+        tramo.append(palabra)
+        tamano += len(palabra)
+        if tamano >= tamano_tramo:
+            yield tramo
+            tramo = []
+            tamano = 0
+    if tramo:
+        yield tramo
+
+def _ordenar_tramo(tramo, ruta):
+    """
+    Ordena un tramo de palabras y lo guarda en 'ruta', una línea 'clave palabra' por palabra.
+    La clave en minúsculas se calcula una sola vez aquí y se reutiliza en la mezcla.
+    """
+    pares = [(palabra.lower(), palabra) for palabra in tramo]
+    pares.sort(key=itemgetter(0))   # sort es estable: las palabras con la misma clave conservan su orden
+    with open(ruta, 'w', encoding='utf-8', newline='\n') as f:
+        f.writelines(f"{clave} {palabra}\n" for clave, palabra in pares)
+    return ruta
+
+def _leer_tramo(ruta):
+    """Generador que devuelve los pares (clave, palabra) de un tramo ya ordenado"""
+    with open(ruta, 'r', encoding='utf-8', newline='\n') as f:
+        for linea in f:
+            clave, palabra = linea[:-1].split(' ')   # Las palabras nunca contienen espacios
+            yield clave, palabra
+
+def _escribir_tramos(tramos, directorio, procesos):
+    """
+    Ordena cada tramo y lo guarda en un archivo temporal. Con varios procesos se ordenan
+    en paralelo, pero nunca hay más de 'procesos' tramos pendientes en memoria.
+    Devuelve las rutas en el mismo orden que los tramos.
+    """
+    rutas = []
+    if procesos <= 1:
+        for i, tramo in enumerate(tramos):
+            rutas.append(_ordenar_tramo(tramo, os.path.join(directorio, f"tramo{i}.txt")))
+        return rutas
+
+    # Se importa aquí para no cargar multiprocessing cuando se ordena en un solo proceso
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        pendientes = deque()
+        for i, tramo in enumerate(tramos):
+            pendientes.append(pool.submit(_ordenar_tramo, tramo, os.path.join(directorio, f"tramo{i}.txt")))
+            if len(pendientes) >= procesos:
+                rutas.append(pendientes.popleft().result())   # Espera al más antiguo antes de leer más
+        rutas.extend(futuro.result() for futuro in pendientes)
+    return rutas
+
+def ordenar_externo(archivo_entrada, destino, tamano_tramo=TAMANO_TRAMO, procesos=1,
+                    tamano_bloque=TAMANO_BLOQUE):
+    """
+    Ordena alfabéticamente (ignorando mayúsculas/minúsculas) las palabras de un archivo
+    usando una cantidad de memoria acotada: ordena tramos en archivos temporales y luego
+    los mezcla con heapq.merge. El resultado es el mismo que ordenar_alfabetico().
+    'procesos' > 1 reparte la ordenación de los tramos entre varios núcleos.
+    """
+    with tempfile.TemporaryDirectory(prefix="ordenar_") as directorio:
+        tramos = _tramos(leer_palabras(archivo_entrada, tamano_bloque), tamano_tramo)
+        rutas = _escribir_tramos(tramos, directorio, procesos)
+        # Ante claves iguales, merge toma primero el tramo anterior, así que el orden es estable
+        mezcla = heapq.merge(*(_leer_tramo(ruta) for ruta in rutas), key=itemgetter(0))
+        escribir_palabras(map(itemgetter(1), mezcla), destino, tamano_bloque)
+
+def _archivo_ordenar_alfabetico(archivo_entrada, destino, tamano_bloque):
+    ordenar_externo(archivo_entrada, destino, tamano_bloque=tamano_bloque)
+
+# ---------------------- ESTADÍSTICAS DE PALABRAS ----------------------
+
+def estadisticas_palabras(frase, top=10):
+    """
+    Calcula estadísticas de las palabras de la frase.
+    Devuelve: dict con 'total', 'distintas', 'frecuencias' (Counter) y 'top'
+    (las 'top' palabras más frecuentes como pares (palabra, veces); a igual
+    frecuencia, en orden alfabético).
+    """
+    frecuencias = Counter(frase.split())
+    return _resumir_frecuencias(frecuencias, top)
+
+def _resumir_frecuencias(frecuencias, top):
+    return {
+        'total': sum(frecuencias.values()),
+        'distintas': len(frecuencias),
+        'frecuencias': frecuencias,
+        'top': _mas_frecuentes(frecuencias.items(), top),
+    }
+
+def _orden_frecuencia(par):
+    # Clave para ordenar pares (palabra, veces): primero las de más veces y, a igual
+    # frecuencia, por palabra, así el resultado no depende del orden de llegada ni de
+    # cómo se repartió el archivo
+    palabra, veces = par
+    return -veces, palabra
+
+def _mas_frecuentes(pares, top):
+    # Los 'top' pares (palabra, veces) con más veces, en el orden de _orden_frecuencia
+    return heapq.nsmallest(top, pares, key=_orden_frecuencia)
+
+def _hash64(palabra):
+    """Hash de 64 bits estable entre procesos (hash() cambia en cada intérprete)"""
+    return int.from_bytes(hashlib.blake2b(palabra.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class CountMinSketch:
+    """
+    Tabla de 'profundidad' filas por 'ancho' contadores que estima cuántas veces aparece
+    cada palabra usando siempre la misma memoria. La estimación nunca es menor que el valor real.
+    """
+    def __init__(self, ancho=1 << 16, profundidad=4):
+        self.ancho = ancho
+        self.profundidad = profundidad
+        self.tabla = array('Q', bytes(8 * ancho * profundidad))  # Todas las filas en un único arreglo
+
+    def _posiciones(self, h):
+        # Deriva 'profundidad' posiciones de un solo hash (h1 + i*h2)
+        h1, h2 = h & 0xFFFFFFFF, h >> 32
+        return [fila * self.ancho + (h1 + fila * h2) % self.ancho for fila in range(self.profundidad)]
+
+    def agregar(self, palabra, veces=1, h=None):
+        for pos in self._posiciones(_hash64(palabra) if h is None else h):
+            self.tabla[pos] += veces
+
+    def estimar(self, palabra, h=None):
+        return min(self.tabla[pos] for pos in self._posiciones(_hash64(palabra) if h is None else h))
+
+    def __getitem__(self, palabra):
+        return self.estimar(palabra)
+
+    def combinar(self, otro):
+        """Suma los contadores de otra tabla con las mismas dimensiones"""
+        for i, valor in enumerate(otro.tabla):
+            self.tabla[i] += valor
+
+class HyperLogLog:
+    """
+    Estima la cantidad de palabras distintas con 2**precision registros de un byte
+    (error típico de 1.04 / sqrt(2**precision), un 0.8 % con la precisión por defecto).
+    """
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registros = bytearray(1 << precision)
+
+    def agregar(self, palabra, h=None):
+        h = _hash64(palabra) if h is None else h
+        bits_resto = 64 - self.precision
+        indice = h >> bits_resto
+        resto = h & ((1 << bits_resto) - 1)
+        rango = bits_resto - resto.bit_length() + 1   # Posición del primer bit a 1
+        if rango > self.registros[indice]:
+            self.registros[indice] = rango
+
+    def estimar(self):
+        m = len(self.registros)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimacion = alfa * m * m / sum(2.0 ** -r for r in self.registros)
+        ceros = self.registros.count(0)
+        if estimacion <= 2.5 * m and ceros:
+            estimacion = m * math.log(m / ceros)      # Corrección para cardinalidades pequeñas
+        return round(estimacion)
+
+    def combinar(self, otro):
+        """Une otro estimador con la misma precisión quedándose con el máximo de cada registro"""
+        self.registros = bytearray(map(max, self.registros, otro.registros))
+
+def _contar_aproximado(palabras, top):
+    """
+    Cuenta palabras con memoria fija: total exacto, frecuencias en un CountMinSketch,
+    distintas con HyperLogLog y las 'top' más frecuentes como candidatas.
+    """
+    sketch = CountMinSketch()
+    hll = HyperLogLog()
+    candidatas = {}          # Como mucho 'top' palabras con su frecuencia estimada
+    peor = None              # Clave de orden de la candidata que saldría la última del 'top'
+    total = 0
+    for palabra in palabras:
+        total += 1
+        h = _hash64(palabra)
+        sketch.agregar(palabra, h=h)
+        hll.agregar(palabra, h=h)
+        if top <= 0:
+            continue         # Sin candidatas que mantener (max() de un dict vacío fallaría)
+        estimada = sketch.estimar(palabra, h=h)
+        clave = _orden_frecuencia((palabra, estimada))
+        if palabra in candidatas or len(candidatas) < top:
+            candidatas[palabra] = estimada
+        elif clave < peor:
+            del candidatas[peor[1]]
+            candidatas[palabra] = estimada
+        else:
+            continue
+        peor = max(map(_orden_frecuencia, candidatas.items()))
+    return total, sketch, hll, candidatas
+
+def _contar_rango(archivo, inicio, fin, tamano_bloque, aproximado, top):
+    """Cuenta las palabras de un rango de bytes del archivo (tarea de cada proceso)"""
+    palabras = leer_palabras(archivo, tamano_bloque, inicio, fin)
+    if aproximado:
+        return _contar_aproximado(palabras, top)
+    return Counter(palabras)
+
+def _cortes_archivo(archivo, partes):
+    """
+    Divide el archivo en 'partes' rangos de bytes parecidos, moviendo cada corte
+    hasta el siguiente espacio para no partir palabras ni caracteres UTF-8.
+    Devuelve la lista de pares (inicio, fin).
+    """
+    tamano = os.path.getsize(archivo)
+    cortes = [0]
+    with open(archivo, 'rb') as f:
+        for i in range(1, partes):
+            pos = max(tamano * i // partes, cortes[-1])
+            f.seek(pos)
+            while True:
+                datos = f.read(4096)
+                if not datos:
+                    pos = tamano
+                    break
+                espacio = _ESPACIO_BYTES.search(datos)
+                if espacio:
+                    pos += espacio.start()
+                    break
+                pos += len(datos)
+            cortes.append(pos)
+    cortes.append(tamano)
+    return [(a, b) for a, b in zip(cortes, cortes[1:]) if a < b]
+
+def estadisticas_archivo(archivo, top=10, procesos=1, aproximado=False, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Calcula las mismas estadísticas que estadisticas_palabras() sobre un archivo.
+    Con 'procesos' > 1 el archivo se reparte en rangos entre varios procesos y se suman
+    los Counter parciales. Con 'aproximado' se usa memoria fija: 'frecuencias' es un
+    CountMinSketch (se consulta igual, con frecuencias[palabra]), 'distintas' es una
+    estimación de HyperLogLog y 'top' contiene frecuencias estimadas.
+    """
+    rangos = _cortes_archivo(archivo, max(1, procesos))
+    tareas = [(archivo, inicio, fin, tamano_bloque, aproximado, top) for inicio, fin in rangos]
+    if procesos <= 1 or len(rangos) <= 1:
+        parciales = [_contar_rango(*tarea) for tarea in tareas]
+    else:
+        from concurrent.futures import ProcessPoolExecutor   # Solo hace falta con varios procesos
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            parciales = list(pool.map(_contar_rango, *zip(*tareas)))
+
+    if not aproximado:
+        frecuencias = Counter()
+        for parcial in parciales:
+            frecuencias.update(parcial)
+        return _resumir_frecuencias(frecuencias, top)
+
+    total = 0
+    sketch = CountMinSketch()
+    hll = HyperLogLog()
+    candidatas = set()
+    for total_parcial, sketch_parcial, hll_parcial, candidatas_parciales in parciales:
+        total += total_parcial
+        sketch.combinar(sketch_parcial)
+        hll.combinar(hll_parcial)
+        candidatas.update(candidatas_parciales)
+    # Las candidatas de cada rango se vuelven a estimar con la tabla combinada
+    mas_frecuentes = _mas_frecuentes(((p, sketch.estimar(p)) for p in candidatas), top)
+    return {
+        'total': total,
+        'distintas': hll.estimar(),
+        'frecuencias': sketch,
+        'top': mas_frecuentes,
+    }
+
+def formatear_estadisticas(estadisticas):
+    """Devuelve las estadísticas como texto para mostrarlas o guardarlas"""
+    mas_frecuentes = ', '.join(f"{palabra} ({veces})" for palabra, veces in estadisticas['top'])
+    return (
+        f"Número de palabras: {estadisticas['total']}\n"
+        f"Palabras distintas: {estadisticas['distintas']}\n"
+        f"Más frecuentes: {mas_frecuentes or 'ninguna'}"
+    )
+
+def _archivo_estadisticas(archivo_entrada, destino, tamano_bloque):
+    destino.write(formatear_estadisticas(estadisticas_archivo(archivo_entrada, tamano_bloque=tamano_bloque)))
+
+# ---------------------- OPERACIONES DISPONIBLES PARA ARCHIVOS ----------------------
+
+# Operaciones que se pueden aplicar a un archivo sin cargarlo completo en memoria
+OPERACIONES_ARCHIVO = {
+    "Invertir palabras": _archivo_invertir_palabras,
+    "Invertir letras de cada palabra": _archivo_invertir_letras,
+    # Invertir el orden de las palabras y luego toda la cadena deja cada palabra en su sitio
+    # con las letras al revés, así que basta con una pasada hacia delante
+    "Invertir completamente": _archivo_invertir_letras,
+    "Contar palabras": _archivo_contar_palabras,
+    "Ordenar alfabéticamente": _archivo_ordenar_alfabetico,
+    "Estadísticas de palabras": _archivo_estadisticas,
+}
+
+def procesar_archivo(opcion, archivo_entrada, archivo_salida, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Aplica la opción indicada al archivo de entrada por bloques y escribe el resultado
+    en el archivo de salida. El resultado es el mismo que daría la función de texto
+    sobre el contenido completo del archivo.
+    Devuelve: dict con los bytes leídos, los segundos empleados y el rendimiento en MB/s.
+    """
+    if opcion not in OPERACIONES_ARCHIVO:
+        raise ValueError(f"La opción '{opcion}' no está disponible para archivos.")
+
+    inicio = time.perf_counter()
+    with open(archivo_salida, 'w', encoding='utf-8') as destino:
+        OPERACIONES_ARCHIVO[opcion](archivo_entrada, destino, tamano_bloque)
+    segundos = time.perf_counter() - inicio
+
+    bytes_leidos = os.path.getsize(archivo_entrada)
+    return {
+        'bytes': bytes_leidos,
+        'segundos': segundos,
+        'mb_s': bytes_leidos / (1024 * 1024) / segundos if segundos > 0 else float('inf'),
+    }
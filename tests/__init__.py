@@ -0,0 +1,6 @@
+"""
+Pruebas de la lógica de los ejercicios (no abren ninguna ventana de Tkinter).
+Cada motor nuevo se compara con la función o clase original sobre datos aleatorios.
+
+Uso desde la raíz del repositorio: python -m unittest   (o python -m pytest)
+"""
@@ -0,0 +1,76 @@
+# Pruebas de la línea de comandos (python -m nucleo) y del paquete sin Tkinter
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from nucleo.__main__ import MODULOS, main
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class PruebasLineaDeComandos(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+
+    def escribir(self, nombre, texto):
+        ruta = os.path.join(self.carpeta.name, nombre)
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        return ruta
+
+    def ejecutar(self, *argumentos):
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            codigo = main(list(argumentos))
+        return codigo, salida.getvalue()
+
+    def test_ningun_modulo_importa_tkinter(self):
+        for modulo in MODULOS:
+            codigo = f"import sys, nucleo.{modulo}; sys.exit('tkinter' in sys.modules)"
+            with self.subTest(modulo=modulo):
+                self.assertEqual(subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ).returncode, 0)
+
+    def test_texto(self):
+        archivo = self.escribir("frase.txt", "uno dos tres")
+        salida = os.path.join(self.carpeta.name, "resultados")
+        os.mkdir(salida)
+        codigo, _ = self.ejecutar("texto", "invertir-palabras", archivo, "--salida", salida)
+        self.assertEqual(codigo, 0)
+        with open(os.path.join(salida, "frase.txt.invertir-palabras.txt"), encoding='utf-8') as f:
+            self.assertEqual(f.read(), "tres dos uno")
+
+    def test_parentesis(self):
+        bien = self.escribir("bien.txt", "a (b [c] {d}) e")
+        mal = self.escribir("mal.txt", "a (b ]")
+        codigo, salida = self.ejecutar("parentesis", bien, mal)
+        self.assertEqual(codigo, 1)
+        self.assertIn("balanceados correctamente", salida.splitlines()[0])
+        self.assertIn("posición 6", salida.splitlines()[1])
+
+    def test_canciones(self):
+        archivo = self.escribir("lista.txt", "Intro\nBalada\nFin\n")
+        for opciones in ((), ("--compacta",), ("--persistente",)):
+            codigo, salida = self.ejecutar("canciones", archivo, "--buscar", "Balada", *opciones)
+            self.assertEqual(codigo, 0)
+            self.assertEqual(salida, f"{archivo}: 3 canciones, encontrada 'Balada'\n")
+
+    def test_prioridad(self):
+        archivo = self.escribir("cola.txt", "b,3\na,1\nc,2\n")
+        for motor in ("heap", "cubetas"):
+            codigo, salida = self.ejecutar("prioridad", archivo, "--motor", motor, "--prioridad-maxima", "10")
+            self.assertEqual(codigo, 0)
+            self.assertEqual([linea.split()[0] for linea in salida.splitlines()[1:]], ["a", "c", "b"])
+
+    def test_enlazada(self):
+        archivo = self.escribir("numeros.txt", "4 8 15 16 23 42 8")
+        codigo, salida = self.ejecutar("enlazada", archivo, "--buscar", "8")
+        self.assertEqual(codigo, 0)
+        self.assertIn("8 en posiciones", salida)
+
+if __name__ == "__main__":
+    unittest.main()
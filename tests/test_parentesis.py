@@ -0,0 +1,326 @@
+# Pruebas del Ejercicio 2: cada verificador nuevo debe dar lo mismo que el recorrido original
+
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from nucleo.parentesis import (
+    LIMITE_EXACTO,
+    VerificadorDocumento,
+    VerificadorIncremental,
+    _numpy,
+    _perfil_numpy,
+    _perfil_python,
+    corregir_parentesis,
+    reparar_parentesis,
+    residuo_peor_caso,
+    validar_lote,
+    verificar_balanceo_detallado,
+)
+
+def verificar_original(cadena):
+    """verificar_balanceo_detallado() tal como estaba antes de optimizarla (carácter a carácter)"""
+    pila = []
+    pares = {')': '(', '}': '{', ']': '['}
+    resumen = {'(': 0, ')': 0, '{': 0, '}': 0, '[': 0, ']': 0}
+    for i, char in enumerate(cadena):
+        if char in '({[':
+            pila.append((char, i))
+            resumen[char] += 1
+        elif char in ')}]':
+            resumen[char] += 1
+            if not pila:
+                return False, f"Error: paréntesis de cierre '{char}' sin apertura en posición {i+1}.", resumen
+            ultimo, pos_ultimo = pila[-1]
+            if ultimo != pares[char]:
+                return False, (
+                    f"Error: paréntesis de cierre '{char}' en posición {i+1} no coincide con "
+                    f"el de apertura '{ultimo}' en posición {pos_ultimo+1}."
+                ), resumen
+            pila.pop()
+    if pila:
+        char, pos = pila[-1]
+        return False, f"Error: paréntesis de apertura '{char}' sin cerrar en posición {pos+1}.", resumen
+    return True, "✅ Paréntesis balanceados correctamente.", resumen
+
+def corregir_original(cadena):
+    """corregir_parentesis() tal como estaba antes de optimizarla"""
+    pila = []
+    resultado = []
+    pares = {')': '(', '}': '{', ']': '['}
+    apertura = {'(': ')', '{': '}', '[': ']'}
+    for char in cadena:
+        if char in '({[':
+            pila.append(char)
+            resultado.append(char)
+        elif char in ')}]':
+            if pila and pila[-1] == pares[char]:
+                pila.pop()
+                resultado.append(char)
+        else:
+            resultado.append(char)
+    while pila:
+        resultado.append(apertura[pila.pop()])
+    return ''.join(resultado)
+
+def texto_aleatorio(generador, longitud, densidad=0.3, balanceado=False):
+    """
+    Texto con una fracción 'densidad' de paréntesis. Con 'balanceado' los paréntesis se
+    generan bien anidados y luego se estropea alguno de vez en cuando.
+    """
+    if not balanceado:
+        return ''.join(generador.choice('(){}[]') if generador.random() < densidad
+                       else generador.choice('ab \n') for _ in range(longitud))
+    cierres = {'(': ')', '[': ']', '{': '}'}
+    pila = []
+    texto = []
+    for _ in range(longitud):
+        if generador.random() >= densidad:
+            texto.append(generador.choice('ab \n'))
+        elif pila and generador.random() < 0.5:
+            texto.append(cierres[pila.pop()])
+        else:
+            pila.append(generador.choice('([{'))
+            texto.append(pila[-1])
+    texto.extend(cierres[c] for c in reversed(pila))
+    if texto and generador.random() < 0.5:
+        texto[generador.randrange(len(texto))] = generador.choice('(){}[]')
+    return ''.join(texto)
+
+def trocear(generador, texto):
+    """Parte el texto en fragmentos de longitud aleatoria (alguno vacío)"""
+    fragmentos = []
+    inicio = 0
+    while inicio < len(texto):
+        fin = inicio + generador.randint(0, 7)
+        fragmentos.append(texto[inicio:fin])
+        inicio = fin
+    return fragmentos
+
+class PruebasRecorridoPorSaltos(unittest.TestCase):
+    def test_igual_que_el_original(self):
+        generador = random.Random(3)
+        # Con pocos paréntesis se salta de uno a otro; con muchos se recorre carácter a carácter
+        for densidad in (0.01, 0.05, 0.3, 0.9):
+            for _ in range(200):
+                texto = texto_aleatorio(generador, generador.randint(0, 120), densidad,
+                                        balanceado=generador.random() < 0.7)
+                self.assertEqual(verificar_balanceo_detallado(texto), verificar_original(texto), texto)
+                self.assertEqual(corregir_parentesis(texto), corregir_original(texto), texto)
+
+def perfil_original(cadena):
+    """Perfil de profundidad calculado de la forma más directa, para comparar"""
+    balanceado, mensaje, resumen = verificar_original(cadena)
+    profundidad = []
+    for char in cadena:
+        anterior = profundidad[-1] if profundidad else 0
+        profundidad.append(anterior + (char in '([{') - (char in ')]}'))
+    maxima = max(profundidad, default=0)
+    por_tipo = {}
+    for apertura, cierre in ('()', '[]', '{}'):
+        nivel, mejor = 0, {'maxima': 0, 'posicion': None}
+        for i, char in enumerate(cadena):
+            nivel += (char == apertura) - (char == cierre)
+            if nivel > mejor['maxima']:
+                mejor = {'maxima': nivel, 'posicion': i + 1}
+        por_tipo[apertura] = mejor
+    return {
+        'balanceado': balanceado, 'mensaje': mensaje, 'resumen': resumen,
+        'profundidad': profundidad, 'profundidad_maxima': max(maxima, 0),
+        'posicion_maxima': profundidad.index(maxima) + 1 if maxima > 0 else None,
+        'por_tipo': por_tipo,
+    }
+
+class PruebasPerfilProfundidad(unittest.TestCase):
+    def textos(self, semilla):
+        generador = random.Random(semilla)
+        for _ in range(300):
+            yield texto_aleatorio(generador, generador.randint(0, 60), balanceado=generador.random() < 0.7)
+
+    def test_python(self):
+        for texto in self.textos(4):
+            self.assertEqual(_perfil_python(texto), perfil_original(texto), texto)
+
+    @unittest.skipIf(_numpy() is None, "numpy no está instalado")
+    def test_numpy_igual_que_python(self):
+        np = _numpy()
+        for texto in self.textos(5):
+            perfil = _perfil_numpy(np, texto)
+            perfil['profundidad'] = perfil['profundidad'].tolist()
+            self.assertEqual(perfil, _perfil_python(texto), texto)
+
+    @unittest.skipIf(_numpy() is None, "numpy no está instalado")
+    def test_numpy_con_sustitutos_sueltos(self):
+        np = _numpy()
+        for texto in ("(\ud800)", "[\udcff{]}", "\udfff" * 3 + "("):
+            perfil = _perfil_numpy(np, texto)
+            perfil['profundidad'] = perfil['profundidad'].tolist()
+            self.assertEqual(perfil, _perfil_python(texto), ascii(texto))
+
+class PruebasVerificadorIncremental(unittest.TestCase):
+    def test_fragmentos_igual_que_el_texto_completo(self):
+        generador = random.Random(1)
+        for _ in range(500):
+            texto = texto_aleatorio(generador, generador.randint(0, 80), balanceado=generador.random() < 0.7)
+            verificador = VerificadorIncremental()
+            for fragmento in trocear(generador, texto):
+                verificador.feed(fragmento)
+            self.assertEqual(verificador.finalizar(), verificar_original(texto), texto)
+
+    def test_continuar_desde_un_punto_de_control(self):
+        generador = random.Random(2)
+        for _ in range(200):
+            texto = texto_aleatorio(generador, generador.randint(0, 80), balanceado=True)
+            fragmentos = trocear(generador, texto)
+            corte = generador.randint(0, len(fragmentos))
+            verificador = VerificadorIncremental()
+            for fragmento in fragmentos[:corte]:
+                verificador.feed(fragmento)
+            # El estado pasa por JSON como en un reinicio
+            verificador = VerificadorIncremental.desde_estado(json.loads(json.dumps(verificador.estado())))
+            for fragmento in fragmentos[corte:]:
+                verificador.feed(fragmento)
+            self.assertEqual(verificador.finalizar(), verificar_original(texto), texto)
+
+    def test_el_error_no_cambia_con_mas_texto(self):
+        verificador = VerificadorIncremental()
+        error = verificador.feed("(a]")
+        self.assertIsNotNone(error)
+        self.assertEqual(verificador.feed("))))"), error)
+        self.assertEqual(verificador.marcas(), [0, 2])
+
+class PruebasVerificadorDocumento(unittest.TestCase):
+    def test_ediciones_igual_que_verificar_de_nuevo(self):
+        generador = random.Random(6)
+        for intervalo in (1, 4, 16):
+            documento = VerificadorDocumento(intervalo=intervalo)
+            texto = ''
+            for _ in range(400):
+                # Inserta, borra o reemplaza un trozo en una posición al azar
+                inicio = generador.randint(0, len(texto))
+                fin = min(len(texto), inicio + generador.choice((0, 0, 1, 3)))
+                nuevo = texto_aleatorio(generador, generador.choice((0, 1, 2, 5)), densidad=0.6)
+                texto = texto[:inicio] + nuevo + texto[fin:]
+                desde = inicio if generador.random() < 0.5 else None   # A veces se calcula solo
+                self.assertEqual(documento.actualizar(texto, desde), verificar_original(texto), texto)
+                completo = VerificadorIncremental()
+                completo.feed(texto)
+                self.assertEqual(documento.marcas(), completo.marcas(), texto)
+
+class PruebasValidarLote(unittest.TestCase):
+    def test_reporte_y_corregidos(self):
+        generador = random.Random(7)
+        with tempfile.TemporaryDirectory() as carpeta:
+            rutas = []
+            textos = {}
+            for i in range(9):
+                ruta = os.path.join(carpeta, f"archivo{i}.txt")
+                textos[ruta] = texto_aleatorio(generador, 50, balanceado=True)
+                with open(ruta, 'w', encoding='utf-8', newline='') as f:
+                    f.write(textos[ruta])
+                rutas.append(ruta)
+            ilegible = os.path.join(carpeta, "ilegible.txt")
+            with open(ilegible, 'wb') as f:
+                f.write(b"(\xff\xfe")                         # No es UTF-8 válido
+            rutas.insert(4, ilegible)
+
+            reporte = os.path.join(carpeta, "reporte.jsonl")
+            total = validar_lote(rutas, reporte, procesos=2, corregir=True, tamano_lote=2)
+            with open(reporte, encoding='utf-8') as f:
+                lineas = [json.loads(linea) for linea in f]
+
+            self.assertEqual([registro['archivo'] for registro in lineas[:-1]], rutas)   # Mismo orden
+            self.assertEqual(lineas[-1]['total']['archivos'], len(rutas))
+            self.assertEqual(total['con_errores'], sum(not registro['balanceado'] for registro in lineas[:-1]))
+            self.assertGreater(total['con_errores'], 1)                # Hay algo más que el ilegible
+            for registro in lineas[:-1]:
+                if registro['archivo'] == ilegible:
+                    self.assertFalse(registro['balanceado'])
+                    self.assertIn("Error al leer", registro['mensaje'])
+                    continue
+                texto = textos[registro['archivo']]
+                balanceado, mensaje, resumen = verificar_original(texto)
+                self.assertEqual((registro['balanceado'], registro['mensaje'], registro['resumen']),
+                                 (balanceado, mensaje, resumen))
+                if balanceado:
+                    self.assertIsNone(registro['corregido'])
+                else:
+                    self.assertIn(f"posición {registro['posicion']}", mensaje)
+                    with open(registro['corregido'], encoding='utf-8', newline='') as f:
+                        self.assertEqual(f.read(), corregir_original(texto))
+
+def ediciones_minimas(cadena):
+    """Mínimo de ediciones con la tabla de intervalos completa, sin ningún atajo"""
+    parentesis = [char for char in cadena if char in '(){}[]']
+    cierre = {'(': ')', '[': ']', '{': '}'}
+    n = len(parentesis)
+    costo = [[0] * (n + 1) for _ in range(n + 1)]   # costo[i][j]: ediciones para parentesis[i:j]
+    for i in range(n - 1, -1, -1):
+        for j in range(i + 1, n + 1):
+            mejor = 1 + costo[i + 1][j]
+            for m in range(i + 1, j):
+                if parentesis[m] == cierre.get(parentesis[i]):
+                    mejor = min(mejor, costo[i + 1][m] + costo[m + 1][j])
+            costo[i][j] = mejor
+    return costo[0][n]
+
+class PruebasReparacion(unittest.TestCase):
+    def comprobar(self, cadena):
+        """Comprueba la reparación y devuelve (ediciones, exacta)"""
+        corregida, ediciones, exacta = reparar_parentesis(cadena)
+        self.assertTrue(verificar_original(corregida)[0], cadena)
+        quitar = str.maketrans('', '', '(){}[]')
+        self.assertEqual(corregida.translate(quitar), cadena.translate(quitar))   # El resto no cambia
+        self.assertEqual(len(corregida), len(cadena) + sum(1 if e[0] == 'insertar' else -1 for e in ediciones))
+        self.assertEqual([e[1] for e in ediciones], sorted(e[1] for e in ediciones))
+        for tipo, posicion, char in ediciones:
+            if tipo == 'eliminar':
+                self.assertEqual(cadena[posicion], char)
+            else:
+                self.assertIn(char, ')]}')
+        return ediciones, exacta
+
+    def test_minimo_en_textos_cortos(self):
+        generador = random.Random(8)
+        for _ in range(1500):
+            cadena = texto_aleatorio(generador, generador.randint(0, 30), densidad=0.7,
+                                     balanceado=generador.random() < 0.5)
+            ediciones, exacta = self.comprobar(cadena)
+            self.assertTrue(exacta)
+            self.assertEqual(len(ediciones), ediciones_minimas(cadena), cadena)
+
+    def test_minimo_con_residuo_largo(self):
+        # Más largo que el límite de la versión anterior de la tabla exacta (96)
+        generador = random.Random(9)
+        for _ in range(3):
+            cadena = ''.join(generador.choice('(){}[]') for _ in range(200))
+            ediciones, exacta = self.comprobar(cadena)
+            self.assertTrue(exacta)
+            self.assertEqual(len(ediciones), ediciones_minimas(cadena))
+
+    def test_residuo_mayor_que_el_limite(self):
+        generador = random.Random(10)
+        cadena = ''.join(generador.choice('(){}[]') for _ in range(3 * LIMITE_EXACTO))
+        _, exacta = self.comprobar(cadena)       # Sigue siendo una reparación válida...
+        self.assertFalse(exacta)                 # ...pero se avisa de que puede no ser la mínima
+
+    def test_residuo_peor_caso_en_el_limite(self):
+        # El residuo más lento que aún va a la tabla exacta, y uno justo por encima
+        for parentesis, exacta in ((LIMITE_EXACTO, True), (LIMITE_EXACTO + 2, False)):
+            cadena = residuo_peor_caso(parentesis)
+            self.assertEqual(len(cadena), parentesis)
+            ediciones, obtenida = self.comprobar(cadena)
+            self.assertEqual(obtenida, exacta)
+            if exacta:
+                # Lo mínimo es emparejar todos los paréntesis y eliminar los dos corchetes
+                self.assertEqual(len(ediciones), 2)
+
+    def test_inserta_antes_del_cierre_que_la_contiene(self):
+        corregida, ediciones, exacta = reparar_parentesis("a{b(c}d")
+        self.assertEqual(corregida, "a{b(c)}d")
+        self.assertEqual(ediciones, [('insertar', 5, ')')])
+
+if __name__ == "__main__":
+    unittest.main()
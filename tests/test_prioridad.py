@@ -0,0 +1,483 @@
+# Pruebas del Ejercicio 4: cada motor de la cola debe sacar los elementos como la cola original
+
+import asyncio
+import collections
+import heapq
+import itertools
+import os
+import random
+import tempfile
+import threading
+import unittest
+
+from nucleo.prioridad import (
+    LIMITE_CUBETAS,
+    PRIORIDAD_MAXIMA,
+    ColaAsincrona,
+    ColaConcurrente,
+    ColaCubetas,
+    ColaPrioridad,
+    FilasOrdenadas,
+    Historial,
+    crear_cola,
+)
+
+class ColaOriginal:
+    """ColaPrioridad tal como estaba antes de optimizarla (heapq y recorridos de toda la cola)"""
+
+    def __init__(self):
+        self.cola = []
+        self.historial = []
+
+    def encolar(self, nombre, prioridad):
+        heapq.heappush(self.cola, (prioridad, nombre))
+
+    def desencolar(self):
+        if self.cola:
+            elemento = heapq.heappop(self.cola)
+            self.historial.append(elemento)
+            return elemento
+        return None
+
+    def buscar(self, nombre):
+        for i, (p, n) in enumerate(self.cola):
+            if n.lower() == nombre.lower():
+                return (i + 1, p)
+        return None
+
+    def editar(self, nombre, nueva_prioridad):
+        for i, (p, n) in enumerate(self.cola):
+            if n.lower() == nombre.lower():
+                self.cola[i] = (nueva_prioridad, n)
+                heapq.heapify(self.cola)
+                return True
+        return False
+
+    def eliminar(self, nombre):
+        # La cola original no tenía eliminar(): se quita recorriendo y se reordena
+        for i, (p, n) in enumerate(self.cola):
+            if n.lower() == nombre.lower():
+                elemento = self.cola.pop(i)
+                heapq.heapify(self.cola)
+                return elemento
+        return None
+
+def nombre_aleatorio(generador, distintos=20):
+    # El mismo nombre con mayúsculas distintas es el mismo elemento para buscar y editar
+    nombre = f"tarea {generador.randrange(distintos)}"
+    return nombre.upper() if generador.random() < 0.3 else nombre
+
+def operaciones_aleatorias(generador, cantidad, prioridades):
+    """Secuencia de (método, argumentos); 'prioridades' es la función que sortea una prioridad"""
+    for _ in range(cantidad):
+        tirada = generador.random()
+        if tirada < 0.35:
+            yield "encolar", (nombre_aleatorio(generador), prioridades(generador))
+        elif tirada < 0.55:
+            yield "desencolar", ()
+        elif tirada < 0.7:
+            yield "buscar", (nombre_aleatorio(generador),)
+        elif tirada < 0.85:
+            yield "editar", (nombre_aleatorio(generador), prioridades(generador))
+        else:
+            yield "eliminar", (nombre_aleatorio(generador),)
+
+def prioridad_entera(generador):
+    return generador.randint(-5, 30)
+
+class PruebasHeapIndexado(unittest.TestCase):
+    def comprobar_heap(self, cola):
+        # Propiedad del heap e índices coherentes con las casillas
+        for i in range(1, len(cola.cola)):
+            self.assertLessEqual(cola.cola[(i - 1) // 2], cola.cola[i])
+        self.assertEqual(len(cola.ids), len(cola.cola))
+        for i, ident in enumerate(cola.ids):
+            self.assertEqual(cola.casilla[ident], i)
+        self.assertEqual(sorted(ident for grupo in cola.por_nombre.values() for ident in grupo), sorted(cola.ids))
+
+    def test_igual_que_la_original(self):
+        # Sin nombres repetidos en la cola: la original y la nueva editan el mismo elemento
+        generador = random.Random(21)
+        for _ in range(40):
+            original, nueva = ColaOriginal(), ColaPrioridad()
+            for metodo, argumentos in operaciones_aleatorias(generador, 200, prioridad_entera):
+                if metodo == "encolar" and original.buscar(argumentos[0]):
+                    continue
+                esperado = getattr(original, metodo)(*argumentos)
+                obtenido = getattr(nueva, metodo)(*argumentos)
+                if metodo == "buscar" and esperado is not None:
+                    # La original daba la casilla del heap; ahora es el orden de salida
+                    elemento = (esperado[1], next(n for p, n in original.cola
+                                                  if n.lower() == argumentos[0].lower()))
+                    esperado = (1 + sum(otro < elemento for otro in original.cola), esperado[1])
+                if metodo != "encolar":
+                    self.assertEqual(obtenido, esperado, (metodo, argumentos))
+                self.assertEqual(nueva.elementos(), sorted(original.cola))
+                self.comprobar_heap(nueva)
+            self.assertEqual(list(nueva.historial), original.historial)
+
+    def test_nombres_repetidos(self):
+        # Con nombres repetidos se busca, edita y elimina el que saldría primero
+        generador = random.Random(22)
+        for _ in range(30):
+            nueva = ColaPrioridad()
+            modelo = []
+            for metodo, argumentos in operaciones_aleatorias(generador, 200, prioridad_entera):
+                if metodo == "encolar":
+                    nueva.encolar(*argumentos)
+                    modelo.append((argumentos[1], argumentos[0]))
+                    continue
+                if metodo == "desencolar":
+                    esperado = min(modelo) if modelo else None
+                    if modelo:
+                        modelo.remove(esperado)
+                    self.assertEqual(nueva.desencolar(), esperado)
+                    continue
+                nombre = argumentos[0].lower()
+                mismos = [e for e in modelo if e[1].lower() == nombre]
+                primero = min(mismos) if mismos else None
+                if metodo == "buscar":
+                    esperado = None if primero is None else (1 + sum(e < primero for e in modelo), primero[0])
+                    self.assertEqual(nueva.buscar(argumentos[0]), esperado)
+                elif metodo == "editar":
+                    self.assertEqual(nueva.editar(*argumentos), primero is not None)
+                    if primero is not None:
+                        modelo[modelo.index(primero)] = (argumentos[1], primero[1])
+                else:
+                    self.assertEqual(nueva.eliminar(argumentos[0]), primero)
+                    if primero is not None:
+                        modelo.remove(primero)
+                self.assertEqual(nueva.elementos(), sorted(modelo))
+                self.comprobar_heap(nueva)
+
+    def test_rango_con_cola_grande(self):
+        # Por encima del límite del recorrido, buscar() compara con toda la cola
+        generador = random.Random(23)
+        cola = ColaPrioridad()
+        for i in range(3000):
+            cola.encolar(f"t{i}", generador.randint(0, 100))
+        orden = cola.elementos()
+        for i in generador.sample(range(3000), 50):
+            elemento = next(e for e in orden if e[1] == f"t{i}")
+            self.assertEqual(cola.buscar(f"T{i}"), (orden.index(elemento) + 1, elemento[0]))
+
+class ColaFIFO:
+    """Modelo de ColaCubetas: sale la menor prioridad y, a igual prioridad, la que llegó antes"""
+
+    def __init__(self):
+        self.lista = []                  # (prioridad, llegada, nombre)
+        self.llegadas = itertools.count()
+
+    def _primero(self, nombre):
+        mismos = [e for e in self.lista if e[2].lower() == nombre.lower()]
+        return min(mismos, key=self._orden) if mismos else None
+
+    @staticmethod
+    def _orden(elemento):
+        return elemento[:2]
+
+    def encolar(self, nombre, prioridad):
+        self.lista.append((prioridad, next(self.llegadas), nombre))
+
+    def desencolar(self):
+        if not self.lista:
+            return None
+        elemento = min(self.lista, key=self._orden)
+        self.lista.remove(elemento)
+        return (elemento[0], elemento[2])
+
+    def buscar(self, nombre):
+        elemento = self._primero(nombre)
+        if elemento is None:
+            return None
+        return (1 + sum(self._orden(otro) < self._orden(elemento) for otro in self.lista), elemento[0])
+
+    def editar(self, nombre, nueva_prioridad):
+        elemento = self._primero(nombre)
+        if elemento is None:
+            return False
+        self.lista.remove(elemento)
+        self.encolar(elemento[2], nueva_prioridad)      # Pasa al final de su nueva prioridad
+        return True
+
+    def eliminar(self, nombre):
+        elemento = self._primero(nombre)
+        if elemento is None:
+            return None
+        self.lista.remove(elemento)
+        return (elemento[0], elemento[2])
+
+    def elementos(self):
+        return [(e[0], e[2]) for e in sorted(self.lista, key=self._orden)]
+
+def prioridad_mezclada(generador):
+    # Enteras dentro y fuera de 0..8, reales (algunas con valor entero) y booleanos
+    tirada = generador.random()
+    if tirada < 0.6:
+        return generador.randint(-3, 12)
+    if tirada < 0.9:
+        return generador.choice((-0.5, 0.0, 0.5, 2.0, 3.5, 8.0, 8.5, 1e20))
+    return generador.choice((True, False))
+
+class PruebasColaCubetas(unittest.TestCase):
+    def test_igual_que_el_modelo_fifo(self):
+        generador = random.Random(24)
+        for _ in range(40):
+            modelo, cubetas = ColaFIFO(), ColaCubetas(prioridad_maxima=8)
+            for metodo, argumentos in operaciones_aleatorias(generador, 250, prioridad_mezclada):
+                esperado = getattr(modelo, metodo)(*argumentos)
+                obtenido = getattr(cubetas, metodo)(*argumentos)
+                if metodo != "encolar":
+                    self.assertEqual(obtenido, esperado, (metodo, argumentos))
+                self.assertEqual(cubetas.elementos(), modelo.elementos())
+                self.assertEqual(len(cubetas), len(modelo.lista))
+
+    def test_reconstruir_tras_muchas_ediciones(self):
+        generador = random.Random(25)
+        modelo, cubetas = ColaFIFO(), ColaCubetas(prioridad_maxima=8)
+        for i in range(50):
+            for cola in (modelo, cubetas):
+                cola.encolar(f"t{i}", i % 12)
+        for _ in range(3000):
+            nombre, prioridad = f"t{generador.randrange(50)}", prioridad_mezclada(generador)
+            self.assertEqual(cubetas.editar(nombre, prioridad), modelo.editar(nombre, prioridad))
+        self.assertLess(cubetas.descartados, len(cubetas) + 1024)
+        self.assertEqual(cubetas.elementos(), modelo.elementos())
+        self.assertEqual([cubetas.desencolar() for _ in range(51)], [modelo.desencolar() for _ in range(51)])
+
+    def test_mismo_orden_que_el_heap(self):
+        # Entre empatados el heap saca antes el menor nombre y las cubetas el que llegó antes:
+        # sin nombres ni prioridades repetidos, las dos colas deben ir siempre a la par
+        generador = random.Random(26)
+        for _ in range(40):
+            heap, cubetas = ColaPrioridad(), ColaCubetas(prioridad_maxima=8)
+            for metodo, argumentos in operaciones_aleatorias(generador, 250, prioridad_mezclada):
+                repetida = metodo in ("encolar", "editar") and argumentos[1] in heap.histograma
+                if repetida or metodo == "encolar" and heap.buscar(argumentos[0]):
+                    continue
+                esperado = getattr(heap, metodo)(*argumentos)
+                obtenido = getattr(cubetas, metodo)(*argumentos)
+                if metodo != "encolar":
+                    self.assertEqual(obtenido, esperado, (metodo, argumentos))
+                self.assertEqual(cubetas.elementos(), heap.elementos())
+            self.assertEqual(list(cubetas.historial), list(heap.historial))
+
+    def test_crear_cola(self):
+        self.assertIsInstance(crear_cola("auto", 100), ColaCubetas)
+        self.assertIsInstance(crear_cola("auto", LIMITE_CUBETAS), ColaPrioridad)
+        self.assertIsInstance(crear_cola("auto"), ColaPrioridad)
+        self.assertEqual(crear_cola("cubetas").prioridad_maxima, PRIORIDAD_MAXIMA)
+        with self.assertRaises(ValueError):
+            crear_cola("lista")
+
+def prioridad_exacta(generador):
+    # Como prioridad_mezclada, pero con reales cuya suma es exacta (el promedio se compara con ==)
+    prioridad = prioridad_mezclada(generador)
+    return prioridad if prioridad != 1e20 else 4.25
+
+class PruebasEstadisticas(unittest.TestCase):
+    def motores(self):
+        return {"heap": ColaPrioridad(), "cubetas": ColaCubetas(prioridad_maxima=8)}
+
+    def test_igual_que_recalcularlas(self):
+        generador = random.Random(27)
+        for motor, cola in self.motores().items():
+            for metodo, argumentos in operaciones_aleatorias(generador, 2000, prioridad_exacta):
+                getattr(cola, metodo)(*argumentos)
+                if generador.random() < 0.005:
+                    cola.vaciar()
+                prioridades = [p for p, _ in cola.elementos()]
+                # Como las calculaba la cola original, recorriendo toda la cola
+                esperadas = (len(prioridades), min(prioridades), sum(prioridades) / len(prioridades)) \
+                    if prioridades else (0, "N/A", "N/A")
+                self.assertEqual(cola.obtener_estadisticas(), esperadas, motor)
+                self.assertEqual(cola.histograma, dict(collections.Counter(prioridades)), motor)
+
+class PruebasFilasOrdenadas(unittest.TestCase):
+    def test_filas_igual_que_los_elementos(self):
+        # Las filas se actualizan como en la interfaz del Ejercicio 4 (prioridades enteras),
+        # sin reordenar la lista
+        generador = random.Random(28)
+        for cola in (ColaPrioridad(), ColaCubetas(prioridad_maxima=8)):
+            filas = FilasOrdenadas()
+            visibles = []
+            for metodo, argumentos in operaciones_aleatorias(generador, 1500, prioridad_entera):
+                if metodo == "encolar":
+                    clave = cola.encolar(*argumentos)
+                    visibles.insert(filas.insertar(clave), filas.texto(clave))
+                elif metodo == "desencolar":
+                    if cola.desencolar() is not None:
+                        del visibles[filas.quitar_primera()]
+                elif metodo == "editar":
+                    cambio = cola.cambiar_prioridad(*argumentos)
+                    if cambio:
+                        anterior, nueva = cambio
+                        del visibles[filas.quitar(anterior)]
+                        visibles.insert(filas.insertar(nueva), filas.texto(nueva))
+                else:
+                    cola.buscar(argumentos[0])
+                self.assertEqual(visibles, [f"{n} (Prioridad: {p})" for p, n in cola.elementos()])
+                self.assertEqual(len(filas), len(cola))
+            cola.vaciar()
+            filas.vaciar()
+            self.assertEqual(len(filas), 0)
+
+    def test_quitar_clave_que_no_esta(self):
+        filas = FilasOrdenadas()
+        filas.insertar((1, "a"))
+        with self.assertRaises(ValueError):
+            filas.quitar((2, "a"))
+
+class PruebasHistorial(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+
+    def test_paginas_igual_que_una_lista(self):
+        generador = random.Random(29)
+        for capacidad, paso, en_carpeta in ((1, 1, False), (3, 2, True), (10, 4, False), (7, 16, True)):
+            archivo = os.path.join(self.carpeta.name, f"historial{capacidad}.jsonl") if en_carpeta else None
+            historial = Historial(capacidad, archivo, paso)
+            self.addCleanup(historial.cerrar)
+            todos = []
+            for i in range(300):
+                elemento = (generador.choice((i, i / 4, True)), f"tarea «{i}» 😀")
+                historial.append(elemento)
+                todos.append(elemento)
+                self.assertEqual(len(historial), len(todos))
+                # Los más antiguos ya están en el archivo, otros esperan a completar un bloque
+                self.assertLessEqual(len(todos) - historial.en_disco, capacidad + paso)
+                for _ in range(3):
+                    inicio = generador.randint(-3, len(todos) + 2)
+                    cantidad = generador.randint(0, 2 * (capacidad + paso))
+                    self.assertEqual(historial.pagina(inicio, cantidad),
+                                     todos[max(inicio, 0):max(inicio + cantidad, 0)])
+                    self.assertEqual(historial.recientes(cantidad), todos[max(len(todos) - cantidad, 0):] if cantidad else [])
+                    posicion = generador.randint(-len(todos), len(todos) - 1)
+                    self.assertEqual(historial[posicion], todos[posicion])
+            self.assertEqual(list(historial), todos)
+            with self.assertRaises(IndexError):
+                historial[len(todos)]
+            if en_carpeta:
+                self.assertTrue(os.path.exists(archivo))
+
+    def test_historial_de_la_cola(self):
+        for motor in ("heap", "cubetas"):
+            cola = crear_cola(motor, 100, historial=Historial(capacidad=4, paso=3))
+            self.addCleanup(cola.historial.cerrar)
+            generador = random.Random(30)
+            for i in range(200):
+                cola.encolar(f"t{i}", generador.randint(0, 100))
+            salidos = [cola.desencolar() for _ in range(150)]
+            self.assertEqual(list(cola.historial), salidos)
+            self.assertEqual(cola.historial.pagina(10, 5), salidos[10:15])
+
+    def test_capacidad_no_valida(self):
+        with self.assertRaises(ValueError):
+            Historial(0)
+
+class PruebasColasConcurrentes(unittest.TestCase):
+    def test_hilos_entregan_todo_una_vez(self):
+        for motor in ("heap", "cubetas"):
+            for lote in (1, 16):
+                cola = ColaConcurrente(crear_cola(motor, 100))
+                self.addCleanup(cola.cola.historial.cerrar)
+                recibidos = []
+                cerrojo = threading.Lock()
+
+                def producir(parte):
+                    elementos = [(f"p{parte}-{i}", (i * 7 + parte) % 100) for i in range(500)]
+                    for inicio in range(0, len(elementos), lote):
+                        if lote == 1:
+                            cola.encolar(*elementos[inicio])
+                        else:
+                            cola.encolar_varios(elementos[inicio:inicio + lote])
+
+                def consumir():
+                    while (elementos := cola.desencolar_varios(lote)):
+                        with cerrojo:
+                            recibidos.extend(elementos)
+
+                productores = [threading.Thread(target=producir, args=(parte,)) for parte in range(4)]
+                consumidores = [threading.Thread(target=consumir) for _ in range(3)]
+                for hilo in productores + consumidores:
+                    hilo.start()
+                for hilo in productores:
+                    hilo.join()
+                cola.cerrar()
+                for hilo in consumidores:
+                    hilo.join(10)
+                    self.assertFalse(hilo.is_alive())
+                esperados = [((i * 7 + parte) % 100, f"p{parte}-{i}") for parte in range(4) for i in range(500)]
+                self.assertEqual(sorted(recibidos), sorted(esperados))
+
+    def test_cerrar(self):
+        cola = ColaConcurrente()
+        cola.encolar_varios([("b", 2), ("a", 1), ("c", 3)])
+        self.assertEqual(cola.desencolar(), (1, "a"))
+        cola.cerrar()
+        with self.assertRaises(ValueError):
+            cola.encolar("d", 4)
+        # Tras cerrar se sigue sacando lo que quedaba y luego None, sin esperar
+        self.assertEqual(cola.desencolar_varios(5), [(2, "b"), (3, "c")])
+        self.assertIsNone(cola.desencolar())
+        self.assertEqual(cola.desencolar_varios(5), [])
+
+        cola = ColaConcurrente(ColaCubetas())
+        cola.encolar("a", 1)
+        cola.cerrar(descartar=True)
+        self.assertIsNone(cola.desencolar())
+
+    def test_esperas(self):
+        cola = ColaConcurrente()
+        self.assertIsNone(cola.desencolar(bloquear=False))
+        self.assertIsNone(cola.desencolar(espera=0.01))
+        # Un consumidor que espera se despierta con el primer elemento
+        recibido = []
+        hilo = threading.Thread(target=lambda: recibido.append(cola.desencolar(espera=10)))
+        hilo.start()
+        cola.encolar("a", 5)
+        hilo.join(10)
+        self.assertEqual(recibido, [(5, "a")])
+
+    def test_asyncio(self):
+        async def principal():
+            cola = ColaAsincrona(ColaCubetas())
+            recibidos = []
+
+            async def consumir():
+                while (elemento := await cola.desencolar()) is not None:
+                    recibidos.append(elemento)
+
+            async def producir(parte):
+                for i in range(200):
+                    cola.encolar(f"p{parte}-{i}", i % 50)
+                    if not i % 10:
+                        await asyncio.sleep(0)
+
+            consumidores = [asyncio.create_task(consumir()) for _ in range(3)]
+            await asyncio.gather(*(producir(parte) for parte in range(3)))
+            cola.cerrar()                  # Los consumidores terminan cuando se vacía
+            await asyncio.gather(*consumidores)
+            with self.assertRaises(ValueError):
+                cola.encolar("tarde", 1)
+            return recibidos
+
+        recibidos = asyncio.run(principal())
+        self.assertEqual(sorted(recibidos), sorted((i % 50, f"p{parte}-{i}") for parte in range(3) for i in range(200)))
+
+    def test_asyncio_despierta_a_otra_tarea(self):
+        # Una tarea que se cancela mientras espera no se queda con el aviso de otra
+        async def principal():
+            cola = ColaAsincrona()
+            primera = asyncio.create_task(cola.desencolar())
+            segunda = asyncio.create_task(cola.desencolar(espera=5))
+            await asyncio.sleep(0)
+            primera.cancel()
+            cola.encolar("a", 1)
+            return await segunda
+
+        self.assertEqual(asyncio.run(principal()), (1, "a"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,727 @@
+# Pruebas del Ejercicio 3: cada lista nueva debe comportarse como la lista enlazada original
+
+import operator
+import os
+import random
+import tempfile
+import unittest
+
+from nucleo.reproduccion import (
+    MODOS_BUSQUEDA,
+    TAMANO_BLOQUE,
+    IndiceBusqueda,
+    ListaPersistente,
+    ListaReproduccion,
+    ListaOrdenada,
+    ListaReproduccionCompacta,
+    PosicionesLista,
+    _distancia_acotada,
+    _normalizar,
+    escribir_canciones,
+    leer_canciones,
+)
+
+# Pocos nombres distintos para que haya muchas canciones repetidas
+NOMBRES = ["Intro", "Balada", "balada", "Canción", "Rock 1", "Rock 2", "Fin"]
+
+class ListaOriginal:
+    """ListaReproduccion tal como estaba antes de optimizarla (sin el modo aleatorio ni archivos)"""
+
+    class Cancion:
+        def __init__(self, nombre):
+            self.nombre = nombre
+            self.siguiente = None
+            self.anterior = None
+
+    def __init__(self):
+        self.primera = None
+        self.actual = None
+
+    def agregar_cancion(self, nombre):
+        nueva = self.Cancion(nombre)
+        if not self.primera:
+            self.primera = self.actual = nueva
+        else:
+            temp = self.primera
+            while temp.siguiente:
+                temp = temp.siguiente
+            temp.siguiente = nueva
+            nueva.anterior = temp
+
+    def eliminar_cancion(self, nombre):
+        temp = self.primera
+        while temp:
+            if temp.nombre == nombre:
+                if temp.anterior:
+                    temp.anterior.siguiente = temp.siguiente
+                else:
+                    self.primera = temp.siguiente
+                if temp.siguiente:
+                    temp.siguiente.anterior = temp.anterior
+                if self.actual == temp:
+                    self.actual = temp.siguiente or temp.anterior
+                return True
+            temp = temp.siguiente
+        return False
+
+    def siguiente_cancion(self):
+        if self.actual and self.actual.siguiente:
+            self.actual = self.actual.siguiente
+
+    def anterior_cancion(self):
+        if self.actual and self.actual.anterior:
+            self.actual = self.actual.anterior
+
+    def repetir(self):
+        return self.actual.nombre if self.actual else "No hay canción."
+
+    def buscar(self, nombre):
+        temp = self.primera
+        while temp:
+            if temp.nombre == nombre:
+                return True
+            temp = temp.siguiente
+        return False
+
+    def obtener_lista(self):
+        lista = []
+        temp = self.primera
+        while temp:
+            lista.append(temp)
+            temp = temp.siguiente
+        return lista
+
+def operaciones_aleatorias(generador, cantidad):
+    """Secuencia de (método, argumentos) con más altas que bajas para que la lista crezca"""
+    for _ in range(cantidad):
+        tirada = generador.random()
+        nombre = generador.choice(NOMBRES)
+        if tirada < 0.4:
+            yield "agregar_cancion", (nombre,)
+        elif tirada < 0.6:
+            yield "eliminar_cancion", (nombre,)
+        elif tirada < 0.75:
+            yield "siguiente_cancion", ()
+        elif tirada < 0.9:
+            yield "anterior_cancion", ()
+        else:
+            yield "buscar", (nombre,)
+
+def aplicar(lista, metodo, argumentos):
+    resultado = getattr(lista, metodo)(*argumentos)
+    # agregar_cancion devuelve el nodo en las listas nuevas y None en la original
+    return None if metodo == "agregar_cancion" else resultado
+
+def estado(lista):
+    """Nombres en orden y posición de la canción actual (-1 si no hay)"""
+    canciones = lista.obtener_lista()
+    actual = lista.actual
+    posicion = next((i for i, c in enumerate(canciones) if c == actual), -1) if actual is not None else -1
+    return [c.nombre for c in canciones], posicion, lista.repetir()
+
+class PruebasListaEnlazada(unittest.TestCase):
+    def test_igual_que_la_original(self):
+        generador = random.Random(13)
+        for _ in range(40):
+            original, nueva = ListaOriginal(), ListaReproduccion()
+            for metodo, argumentos in operaciones_aleatorias(generador, 150):
+                self.assertEqual(aplicar(nueva, metodo, argumentos), aplicar(original, metodo, argumentos),
+                                 metodo)
+                self.assertEqual(estado(nueva), estado(original))
+                nombres = estado(original)[0]
+                self.assertEqual(len(nueva), len(nombres))
+                self.assertEqual(nueva.ultima.nombre if nueva.ultima else None, nombres[-1] if nombres else None)
+                # El índice guarda, por nombre, los nodos en el orden de la lista
+                self.assertEqual({n: [c for c in nueva.obtener_lista() if c.nombre == n] for n in set(nombres)},
+                                 {n: list(nodos) for n, nodos in nueva.indice.items()})
+
+    def test_agregar_canciones_igual_que_una_a_una(self):
+        generador = random.Random(14)
+        nombres = generador.choices(NOMBRES, k=300)
+        una_a_una, de_golpe = ListaReproduccion(), ListaReproduccion()
+        una_a_una.agregar_cancion("Primera")
+        de_golpe.agregar_cancion("Primera")
+        for nombre in nombres:
+            una_a_una.agregar_cancion(nombre)
+        self.assertEqual(de_golpe.agregar_canciones(iter(nombres)), len(nombres))
+        self.assertEqual(estado(de_golpe), estado(una_a_una))
+        self.assertEqual(len(de_golpe), len(una_a_una))
+        self.assertEqual(list(de_golpe.nombres_en_orden()), estado(una_a_una)[0])
+
+class PruebasOrdenAleatorio(unittest.TestCase):
+    def lista(self, canciones, semilla):
+        lista = ListaReproduccion(semilla=semilla)
+        for i in range(canciones):
+            lista.agregar_cancion(f"C{i}")
+        lista.modo_aleatorio = True
+        return lista
+
+    def sonar(self, lista, veces):
+        sonadas = []
+        for _ in range(veces):
+            lista.siguiente_cancion()
+            sonadas.append(lista.actual)
+        return sonadas
+
+    def test_cada_ronda_suena_todas_una_vez(self):
+        for semilla in range(20):
+            lista = self.lista(9, semilla)
+            todas = set(lista.obtener_lista())
+            anterior = lista.actual
+            for _ in range(4):
+                # La que sonaba al empezar la ronda cuenta como ya sonada
+                ronda = self.sonar(lista, len(todas) - 1)
+                self.assertEqual(set(ronda) | {anterior}, todas)
+                self.assertEqual(len(set(ronda)), len(ronda))
+                self.assertNotEqual(ronda[0], anterior)
+                anterior = ronda[-1]
+
+    def test_anterior_recorre_el_historial(self):
+        lista = self.lista(12, 5)
+        historial = [lista.actual] + self.sonar(lista, 7)
+        for cancion in reversed(historial[:-1]):
+            lista.anterior_cancion()
+            self.assertIs(lista.actual, cancion)
+        lista.anterior_cancion()                   # Al principio del historial no se mueve
+        self.assertIs(lista.actual, historial[0])
+        self.assertEqual(self.sonar(lista, 7), historial[1:])   # Y se vuelve a avanzar por él
+
+    def test_agregar_y_eliminar_a_mitad_de_ronda(self):
+        lista = self.lista(10, 3)
+        sonadas = {lista.actual} | set(self.sonar(lista, 4))
+        faltan = [c for c in lista.obtener_lista() if c not in sonadas]
+        quitada = faltan.pop()
+        lista.eliminar_cancion(quitada.nombre)
+        nueva = lista.agregar_cancion("Nueva")
+        self.assertEqual(set(self.sonar(lista, len(faltan) + 1)), set(faltan) | {nueva})
+
+    def test_con_ediciones_aleatorias(self):
+        generador = random.Random(14)
+        for semilla in range(10):
+            lista = self.lista(3, semilla)
+            for metodo, argumentos in operaciones_aleatorias(generador, 300):
+                antes = lista.actual
+                aplicar(lista, metodo, argumentos)
+                canciones = lista.obtener_lista()
+                self.assertEqual(lista.actual is None, not canciones)
+                if canciones:
+                    self.assertIn(lista.actual, canciones)
+                if metodo == "siguiente_cancion" and len(canciones) > 1:
+                    self.assertIsNot(lista.actual, antes)
+                if lista.orden is not None:
+                    # El orden tiene justo las canciones de la lista, cada una en su posición
+                    vivos = [nodo for nodo in lista.orden.nodos if nodo is not None]
+                    self.assertEqual(set(vivos), set(canciones))
+                    self.assertEqual(len(vivos), len(canciones))
+                    for nodo, i in lista.orden.posicion.items():
+                        self.assertIs(lista.orden.nodos[i], nodo)
+
+    def test_misma_semilla_mismo_orden(self):
+        uno, otro = self.lista(30, 7), self.lista(30, 7)
+        self.assertEqual([c.nombre for c in self.sonar(uno, 60)], [c.nombre for c in self.sonar(otro, 60)])
+
+def comparar_con_lista(prueba, crear, semilla, rondas=20, operaciones=200):
+    """
+    Aplica las mismas operaciones, con el modo aleatorio entrando y saliendo, a una
+    ListaReproduccion y a la lista que devuelve crear(semilla); deben quedar siempre iguales.
+    """
+    generador = random.Random(semilla)
+    for ronda in range(rondas):
+        referencia, otra = ListaReproduccion(semilla=ronda), crear(ronda)
+        for metodo, argumentos in operaciones_aleatorias(generador, operaciones):
+            if generador.random() < 0.05:
+                referencia.modo_aleatorio = otra.modo_aleatorio = not referencia.modo_aleatorio
+            prueba.assertEqual(aplicar(otra, metodo, argumentos), aplicar(referencia, metodo, argumentos))
+            prueba.assertEqual(estado(otra), estado(referencia))
+            prueba.assertEqual(len(otra), len(referencia))
+        prueba.assertEqual(list(otra.nombres_en_orden()), list(referencia.nombres_en_orden()))
+        for modo in MODOS_BUSQUEDA:
+            esperados = [(nombre, len(canciones)) for nombre, canciones in referencia.buscar_texto("bal", modo)]
+            prueba.assertEqual([(nombre, len(canciones)) for nombre, canciones in otra.buscar_texto("bal", modo)],
+                               esperados, modo)
+
+class PruebasPosicionesLista(unittest.TestCase):
+    def test_igual_que_obtener_lista(self):
+        generador = random.Random(22)
+        for paso in (1, 3, 16):
+            lista = ListaReproduccion()
+            lista.agregar_canciones(generador.choices(NOMBRES, k=100))
+            posiciones = PosicionesLista(lista, paso)
+            for metodo, argumentos in operaciones_aleatorias(generador, 200):
+                resultado = aplicar(lista, metodo, argumentos)
+                if metodo == "agregar_cancion" or metodo == "eliminar_cancion" and resultado:
+                    posiciones.invalidar()          # Las marcas ya no valen tras un alta o una baja
+                canciones = lista.obtener_lista()
+                for _ in range(3):
+                    posicion = generador.randint(-2, len(canciones) + 2)
+                    esperada = canciones[posicion] if 0 <= posicion < len(canciones) else None
+                    self.assertIs(posiciones.cancion(posicion), esperada)
+                    cantidad = generador.randint(0, 40)
+                    inicio = max(posicion, 0)
+                    self.assertEqual(posiciones.ventana(posicion, cantidad),
+                                     canciones[inicio:inicio + cantidad] if esperada is not None else [])
+                # Las marcas que se van dejando apuntan a la canción de su posición
+                for marca, nodo in posiciones.marcas.items():
+                    self.assertEqual(marca % paso, 0)
+                    self.assertIs(nodo, canciones[marca])
+                self.assertEqual(posiciones.claves, sorted(posiciones.marcas))
+
+class PruebasListaCompacta(unittest.TestCase):
+    def test_igual_que_la_lista_enlazada(self):
+        comparar_con_lista(self, lambda semilla: ListaReproduccionCompacta(semilla=semilla), 15)
+
+    def test_las_ranuras_libres_se_reutilizan(self):
+        lista = ListaReproduccionCompacta()
+        lista.agregar_canciones(NOMBRES * 3)
+        for nombre in NOMBRES * 2:
+            lista.eliminar_cancion(nombre)
+        lista.agregar_canciones(NOMBRES * 2)
+        self.assertEqual(len(lista.siguientes), len(NOMBRES) * 3)
+        self.assertEqual(list(lista.nombres_en_orden()), NOMBRES * 3)
+        # Las vistas de las canciones se recorren igual que los nodos Cancion
+        cancion = lista.actual
+        self.assertIsNone(cancion.anterior)
+        self.assertEqual(cancion.siguiente.nombre, NOMBRES[1])
+        self.assertEqual(cancion.siguiente.anterior, cancion)
+
+def levenshtein(a, b):
+    """Distancia de edición con la tabla completa"""
+    fila = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        nueva = [i]
+        for j, cb in enumerate(b, 1):
+            nueva.append(min(fila[j] + 1, nueva[j - 1] + 1, fila[j - 1] + (ca != cb)))
+        fila = nueva
+    return fila[-1]
+
+def nombre_aleatorio(generador):
+    palabras = [''.join(generador.choices("abcdáÉ", k=generador.randint(1, 10)))
+                for _ in range(generador.randint(1, 3))]
+    return ' '.join(palabras)
+
+def consulta_aleatoria(generador, nombres):
+    """Un trozo de un nombre, una palabra con una o dos letras cambiadas o algo al azar"""
+    nombre = generador.choice(nombres) if nombres else "abc"
+    tirada = generador.random()
+    if tirada < 0.4:
+        i = generador.randrange(len(nombre))
+        return nombre[i:i + generador.randint(1, 8)]
+    if tirada < 0.8:
+        letras = list(generador.choice(nombre.split()))
+        for _ in range(generador.randint(1, 2)):
+            letras[generador.randrange(len(letras))] = generador.choice("abcdx")
+        return ''.join(letras)
+    return nombre_aleatorio(generador)
+
+class PruebasIndiceBusqueda(unittest.TestCase):
+    LIMITE = 8
+
+    def prefijo(self, nombres, consulta):
+        consulta = _normalizar(consulta)
+        return sorted((n for n in nombres if _normalizar(n).startswith(consulta)),
+                      key=lambda n: (_normalizar(n), n))[:self.LIMITE]
+
+    def orden_subcadena(self, consulta):
+        def orden(nombre):
+            texto = _normalizar(nombre)
+            if texto == consulta:
+                grupo = 0
+            elif texto.startswith(consulta):
+                grupo = 1
+            elif f" {consulta}" in texto:
+                grupo = 2
+            else:
+                grupo = 3
+            return grupo, len(texto), texto, nombre
+        return orden
+
+    def errores(self, nombre, consulta):
+        """Suma de errores de las palabras de la consulta, o None si alguna no se parece"""
+        total = 0
+        for palabra in _normalizar(consulta).split():
+            limite = 1 if len(palabra) <= IndiceBusqueda.LARGO_UN_ERROR else 2
+            distancia = min(levenshtein(palabra, otra) for otra in _normalizar(nombre).split())
+            if distancia > limite:
+                return None
+            total += distancia
+        return total
+
+    def comprobar(self, indice, nombres, consulta):
+        limite = self.LIMITE
+        self.assertEqual(indice.prefijo(consulta, limite), self.prefijo(nombres, consulta))
+
+        normalizada = _normalizar(consulta)
+        orden = self.orden_subcadena(normalizada)
+        coinciden = [n for n in nombres if normalizada in _normalizar(n)]
+        self.assertEqual(indice.subcadena(consulta, limite), sorted(coinciden, key=orden)[:limite])
+
+        clave = lambda n: (self.errores(n, consulta), len(_normalizar(n)), _normalizar(n), n)
+        parecidos = [n for n in nombres if normalizada.split() and self.errores(n, consulta) is not None]
+        self.assertEqual(indice.aproximada(consulta, limite), sorted(parecidos, key=clave)[:limite])
+
+    def test_igual_que_la_fuerza_bruta(self):
+        self.comparar_con_fuerza_bruta(16)
+
+    def test_bloques_pequenos(self):
+        # Con bloques de 4 las listas de identificadores se parten y se juntan muchas veces
+        bloque = ListaOrdenada.BLOQUE
+        self.addCleanup(setattr, ListaOrdenada, 'BLOQUE', bloque)
+        ListaOrdenada.BLOQUE = 4
+        self.comparar_con_fuerza_bruta(22)
+
+    def comparar_con_fuerza_bruta(self, semilla):
+        generador = random.Random(semilla)
+        for _ in range(8):
+            nombres = list(dict.fromkeys(nombre_aleatorio(generador) for _ in range(50)))
+            indice = IndiceBusqueda(nombres)
+            for _ in range(100):
+                if generador.random() < 0.3:
+                    nombre = nombre_aleatorio(generador)
+                    if nombre not in nombres:
+                        nombres.append(nombre)
+                    indice.agregar(nombre)
+                elif generador.random() < 0.4 and nombres:
+                    # Muchas bajas: el índice se reconstruye cuando los huecos pasan de la mitad
+                    indice.quitar(nombres.pop(generador.randrange(len(nombres))))
+                consulta = consulta_aleatoria(generador, nombres)
+                with self.subTest(consulta=consulta):
+                    self.comprobar(indice, nombres, consulta)
+            self.assertEqual(len(indice), len(nombres))
+
+    def test_reconstruir_con_muchas_bajas(self):
+        nombres = [f"Canción {i}" for i in range(100)]
+        indice = IndiceBusqueda(nombres)
+        for nombre in nombres[:51]:
+            indice.quitar(nombre)
+        # Al pasar los huecos de la mitad se reconstruye: no queda ninguno y se sigue buscando
+        self.assertEqual(indice.huecos, 0)
+        self.assertEqual(len(indice.nombres), 49)
+        self.assertEqual(indice.subcadena("99"), ["Canción 99"])
+        indice.agregar("Canción 0")
+        self.assertEqual(indice.prefijo("cancion", 2), ["Canción 0", "Canción 51"])
+
+    def test_distancia_acotada(self):
+        generador = random.Random(17)
+        for _ in range(3000):
+            a = ''.join(generador.choices("abc", k=generador.randint(0, 9)))
+            b = ''.join(generador.choices("abc", k=generador.randint(0, 9)))
+            limite = generador.randint(1, 3)
+            self.assertEqual(_distancia_acotada(a, b, limite), min(levenshtein(a, b), limite + 1), (a, b, limite))
+
+    def test_sin_tildes_ni_mayusculas(self):
+        indice = IndiceBusqueda(["Canción Triste", "cancion alegre", "Otra"])
+        self.assertEqual(indice.buscar("CANCIÓN", "prefijo"), ["cancion alegre", "Canción Triste"])
+        self.assertEqual(indice.buscar("cion", "subcadena"), ["cancion alegre", "Canción Triste"])
+        self.assertEqual(indice.buscar("trste", "aproximada"), ["Canción Triste"])
+        with self.assertRaises(ValueError):
+            indice.buscar("x", "exacta")
+
+class PruebasListaOrdenada(unittest.TestCase):
+    def test_igual_que_una_lista_ordenada(self):
+        class Pequena(ListaOrdenada):
+            BLOQUE = 4           # Para que los bloques se partan y se junten a menudo
+
+        generador = random.Random(23)
+        for clave, tipo in ((None, None), (operator.neg, 'i')):
+            referencia = sorted(generador.sample(range(1000), 50), key=clave)
+            lista = Pequena(referencia, clave, tipo)
+            for _ in range(2000):
+                valor = generador.randrange(1000)
+                if valor in referencia:
+                    lista.quitar(valor)
+                    referencia.remove(valor)
+                else:
+                    lista.agregar(valor)
+                    referencia.append(valor)
+                    referencia.sort(key=clave)
+                self.assertEqual(list(lista), referencia)
+                self.assertEqual(len(lista), len(referencia))
+                desde = generador.randrange(-1000, 1000)
+                self.assertEqual(list(lista.desde(desde)), [x for x in referencia if (clave or int)(x) >= desde])
+            with self.assertRaises(ValueError):
+                lista.quitar(1000)
+
+def copiar_lista(lista):
+    """ListaReproduccion nueva con las mismas canciones y la misma canción actual"""
+    nombres, posicion, _ = estado(lista)
+    copia = ListaReproduccion()
+    copia.agregar_canciones(nombres)
+    if posicion >= 0:
+        copia.actual = copia.obtener_lista()[posicion]
+    return copia
+
+class PruebasListaPersistente(unittest.TestCase):
+    def test_igual_que_la_lista_enlazada(self):
+        comparar_con_lista(self, lambda semilla: ListaPersistente(semilla=semilla), 19)
+
+    def test_lista_grande(self):
+        # Más de 32 * 32 canciones: tres niveles, y subárboles enteros que se quedan vacíos
+        generador = random.Random(20)
+        nombres = [f"C{generador.randrange(500)}" for _ in range(3000)]
+        referencia, persistente = ListaReproduccion(), ListaPersistente()
+        referencia.agregar_canciones(nombres)
+        persistente.agregar_canciones(nombres)
+        for nombre in nombres[:1500] + generador.sample(nombres, 300):
+            self.assertEqual(persistente.eliminar_cancion(nombre), referencia.eliminar_cancion(nombre))
+        for _ in range(200):
+            metodo = generador.choice(("siguiente_cancion", "anterior_cancion"))
+            getattr(persistente, metodo)()
+            getattr(referencia, metodo)()
+        self.assertEqual(persistente.niveles, 3)
+        self.assertEqual(estado(persistente), estado(referencia))
+
+    def test_copias_independientes(self):
+        generador = random.Random(21)
+        for _ in range(10):
+            # Pares (copia persistente, lista enlazada que la sigue); cada fork() abre un par nuevo
+            pares = [(ListaPersistente(), ListaReproduccion())]
+            for metodo, argumentos in operaciones_aleatorias(generador, 300):
+                persistente, referencia = generador.choice(pares)
+                if generador.random() < 0.1:
+                    pares.append((persistente.fork(), copiar_lista(referencia)))
+                else:
+                    aplicar(persistente, metodo, argumentos)
+                    aplicar(referencia, metodo, argumentos)
+                for persistente, referencia in pares:
+                    self.assertEqual(estado(persistente), estado(referencia))
+                    self.assertEqual(len(persistente), len(referencia))
+                    self.assertEqual(persistente.buscar("Intro"), referencia.buscar("Intro"))
+
+    def test_busqueda_compartida(self):
+        generador = random.Random(23)
+        lista = ListaPersistente()
+        lista.buscar_texto("")
+        pares = [(lista, ListaReproduccion())]
+        for metodo, argumentos in operaciones_aleatorias(generador, 400):
+            persistente, referencia = generador.choice(pares)
+            if generador.random() < 0.1:
+                pares.append((persistente.fork(), copiar_lista(referencia)))
+            else:
+                aplicar(persistente, metodo, argumentos)
+                aplicar(referencia, metodo, argumentos)
+            for persistente, referencia in pares:
+                for consulta, modo in (("bal", "subcadena"), ("r", "prefijo"), ("balda", "aproximada")):
+                    self.assertEqual([(nombre, len(canciones)) for nombre, canciones in persistente.buscar_texto(consulta, modo, 2)],
+                                     [(nombre, len(canciones)) for nombre, canciones in referencia.buscar_texto(consulta, modo, 2)])
+        # Todas las copias usan el índice de la primera búsqueda, que tiene los nombres de todas
+        self.assertTrue(all(persistente.busqueda is lista.busqueda for persistente, _ in pares))
+
+    def test_busqueda_con_muchos_nombres_ajenos(self):
+        lista = ListaPersistente()
+        lista.agregar_canciones(f"Canción {i}" for i in range(3000))
+        lista.buscar_texto("")
+        copia = lista.fork()
+        for i in range(500):
+            copia.eliminar_cancion(f"Canción {i}")
+        # Los primeros resultados del índice compartido ya no son de la copia: se piden más
+        self.assertEqual([nombre for nombre, _ in copia.buscar_texto("canción", limite=3)],
+                         ["Canción 500", "Canción 501", "Canción 502"])
+        self.assertIs(copia.busqueda, lista.busqueda)
+        # Con muchos más nombres ajenos que propios, la copia crea un índice solo con los suyos
+        for i in range(500, 2900):
+            copia.eliminar_cancion(f"Canción {i}")
+        self.assertEqual([nombre for nombre, _ in copia.buscar_texto("canción", limite=3)],
+                         ["Canción 2900", "Canción 2901", "Canción 2902"])
+        self.assertIsNot(copia.busqueda, lista.busqueda)
+        self.assertEqual(len(copia.busqueda), 100)
+        self.assertEqual(len(lista.buscar_texto("canción 1", limite=5000)), 1111)
+        self.assertEqual(copia.buscar_texto("canción", limite=0), [])
+
+    def test_copia_con_modo_aleatorio_propio(self):
+        lista = ListaPersistente(semilla=4)
+        lista.agregar_canciones(f"C{i}" for i in range(20))
+        lista.modo_aleatorio = True
+        lista.siguiente_cancion()
+        copia = lista.fork()
+        self.assertEqual(copia.repetir(), lista.repetir())
+        self.assertIsNone(copia.orden)
+        copia.eliminar_cancion("C3")
+        for _ in range(40):
+            lista.siguiente_cancion()
+            copia.siguiente_cancion()
+            self.assertNotEqual(copia.repetir(), "C3")
+        self.assertEqual(len(lista), 20)
+        self.assertEqual(len(copia), 19)
+
+class PruebasFormatos(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+
+    def ruta(self, nombre):
+        return os.path.join(self.carpeta.name, nombre)
+
+    def nombres_aleatorios(self, generador, cantidad):
+        # Comas, comillas, almohadillas y letras de varios bytes; sin espacios a los lados
+        letras = "ab ,\"'#;ñé😀"
+        nombres = []
+        for _ in range(cantidad):
+            nombre = ''.join(generador.choices(letras, k=generador.randint(1, 12))).strip()
+            nombres.append(nombre or "x")
+        return nombres
+
+    def test_ida_y_vuelta(self):
+        generador = random.Random(17)
+        for extension in ('.txt', '.m3u', '.m3u8', '.csv', '.lrep'):
+            for cantidad in (0, 1, 50):
+                nombres = self.nombres_aleatorios(generador, cantidad)
+                archivo = self.ruta(f"lista{extension}")
+                for tamano_bloque in (1, 7, TAMANO_BLOQUE):
+                    with self.subTest(extension=extension, cantidad=cantidad, tamano_bloque=tamano_bloque):
+                        self.assertEqual(escribir_canciones(archivo, iter(nombres), tamano_bloque=tamano_bloque),
+                                         cantidad)
+                        self.assertEqual(list(leer_canciones(archivo, tamano_bloque=tamano_bloque)), nombres)
+
+    def test_texto_igual_que_la_carga_original(self):
+        archivo = self.ruta("lista.txt")
+        with open(archivo, 'w', encoding='utf-8') as f:
+            f.write("  uno \n\ndos\r\n\t tres\n\n")
+        with open(archivo, encoding='utf-8') as f:
+            original = [linea.strip() for linea in f]      # La carga original agregaba también las vacías
+        self.assertEqual(list(leer_canciones(archivo, tamano_bloque=2)), [n for n in original if n])
+
+    def test_m3u_y_csv_escritos_a_mano(self):
+        m3u = self.ruta("lista.m3u")
+        with open(m3u, 'w', encoding='utf-8') as f:
+            f.write("#EXTM3U\n#EXTINF:123,Artista - Tema\nmusica/tema.mp3\n\nmusica/otro.mp3\n# comentario\n")
+        self.assertEqual(list(leer_canciones(m3u)), ["Artista - Tema", "musica/otro.mp3"])
+        csv_ = self.ruta("lista.csv")
+        with open(csv_, 'w', encoding='utf-8-sig') as f:
+            f.write('Título,Artista\n"Uno, dos",A\n,B\n Tres ,C\n')
+        self.assertEqual(list(leer_canciones(csv_)), ["Uno, dos", "Tres"])
+
+    def test_binario_cortado_o_ajeno(self):
+        archivo = self.ruta("lista.lrep")
+        escribir_canciones(archivo, ["uno", "dos", "tres"])
+        with open(archivo, 'rb') as f:
+            datos = f.read()
+        for largo in (0, 5, len(datos) - 1):
+            with open(archivo, 'wb') as f:
+                f.write(datos[:largo])
+            with self.subTest(largo=largo), self.assertRaises(ValueError):
+                list(leer_canciones(archivo))
+        with open(archivo, 'wb') as f:
+            f.write(b'OTRA1' + datos[5:])
+        with self.assertRaises(ValueError):
+            list(leer_canciones(archivo))
+
+    def test_guardar_y_cargar_listas(self):
+        nombres = self.nombres_aleatorios(random.Random(18), 40)
+        for clase in (ListaReproduccion, ListaReproduccionCompacta, ListaPersistente):
+            lista = clase()
+            lista.agregar_canciones(nombres)
+            for extension in ('.txt', '.csv', '.lrep'):
+                archivo = self.ruta(f"{clase.__name__}{extension}")
+                lista.guardar_lista(archivo)
+                otra = clase()
+                self.assertEqual(otra.cargar_lista(archivo), len(nombres))
+                self.assertEqual(list(otra.nombres_en_orden()), nombres)
+
+class PruebasDiario(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+
+    def abrir(self, **opciones):
+        # Sin el volcado periódico: solo se escribe al llenarse el lote, al sincronizar o al cerrar
+        opciones.setdefault('intervalo', 3600)
+        lista = ListaReproduccion.abrir(self.carpeta.name, **opciones)
+        self.addCleanup(lista.cerrar)
+        return lista
+
+    def cortar(self, lista):
+        """Simula un corte de luz: se pierde lo que no se había escrito en el diario"""
+        diario = lista.diario
+        diario.parar.set()
+        diario.hilo.join()
+        diario._esperar_compactacion()
+        diario.archivo.close()
+        lista.diario = None
+
+    def editar(self, generador, lista, modelo, operaciones):
+        for metodo, argumentos in operaciones_aleatorias(generador, operaciones):
+            aplicar(lista, metodo, argumentos)
+            aplicar(modelo, metodo, argumentos)
+
+    def test_cerrar_y_volver_a_abrir(self):
+        generador = random.Random(18)
+        modelo = ListaOriginal()
+        for _ in range(6):
+            lista = self.abrir(lote=generador.choice((1, 8, 256)))
+            self.assertEqual(estado(lista), estado(modelo))
+            self.editar(generador, lista, modelo, 80)
+            lista.cerrar()
+        self.assertEqual(estado(self.abrir()), estado(modelo))
+
+    def test_corte_pierde_solo_lo_no_sincronizado(self):
+        generador = random.Random(19)
+        modelo = ListaOriginal()
+        guardado = estado(modelo)
+        for cola in (b"", b"A\tCortad", b"E\tCanci\xc3", b"C\t1"):
+            lista = self.abrir(lote=10_000)
+            self.assertEqual(estado(lista), guardado)
+            self.editar(generador, lista, modelo, 60)
+            lista.diario.sincronizar()
+            guardado = estado(modelo)
+            self.editar(generador, lista, ListaOriginal(), 20)    # Se pierde con el corte
+            diario = lista.diario._ruta('diario', lista.diario.generacion)
+            self.cortar(lista)
+            # La última línea quedó a medio escribir
+            with open(diario, 'ab') as f:
+                f.write(cola)
+            modelo = ListaOriginal()
+            for nombre in guardado[0]:
+                modelo.agregar_cancion(nombre)
+            for _ in range(guardado[1]):
+                modelo.siguiente_cancion()
+        lista = self.abrir()
+        self.assertEqual(estado(lista), guardado)
+
+    def test_compactacion(self):
+        generador = random.Random(20)
+        modelo = ListaOriginal()
+        lista = self.abrir(lote=4, limite_compactacion=300)
+        self.editar(generador, lista, modelo, 400)
+        self.assertGreater(lista.diario.generacion, 0)
+        lista.diario.compactar(esperar=True)
+        self.editar(generador, lista, modelo, 30)
+        generacion = lista.diario.generacion
+        lista.cerrar()
+        # Solo queda la última generación, y con ella se recupera todo
+        self.assertEqual(sorted(os.listdir(self.carpeta.name)),
+                         [f"diario.{generacion}.log", f"instantanea.{generacion}.lrep"])
+        self.assertEqual(estado(self.abrir()), estado(modelo))
+
+    def test_instantanea_a_medias(self):
+        # Un corte mientras se escribía la instantánea deja el .tmp, que no se tiene en cuenta
+        generador = random.Random(21)
+        modelo = ListaOriginal()
+        lista = self.abrir()
+        self.editar(generador, lista, modelo, 100)
+        lista.cerrar()
+        temporal = os.path.join(self.carpeta.name, "instantanea.1.lrep.tmp")
+        with open(temporal, 'wb') as f:
+            f.write(b"LREP1")
+        self.assertEqual(estado(self.abrir()), estado(modelo))
+        self.assertFalse(os.path.exists(temporal))
+
+    def test_error_en_la_instantanea(self):
+        generador = random.Random(22)
+        modelo = ListaOriginal()
+        lista = self.abrir()
+        self.editar(generador, lista, modelo, 100)
+        # Una carpeta con el nombre de la instantánea hace fallar el os.replace() del final
+        instantanea = lista.diario._ruta('instantanea', lista.diario.generacion + 1)
+        os.mkdir(instantanea)
+        with self.assertRaises(OSError):
+            lista.diario.compactar(esperar=True)
+        self.assertIsNone(lista.diario.compactacion)
+        self.assertFalse(os.path.exists(instantanea + '.tmp'))
+        # Se sigue registrando en la generación nueva y se recupera con la anterior
+        self.editar(generador, lista, modelo, 30)
+        lista.cerrar()
+        os.rmdir(instantanea)
+        self.assertEqual(estado(self.abrir()), estado(modelo))
+
+if __name__ == "__main__":
+    unittest.main()
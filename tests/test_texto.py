@@ -0,0 +1,208 @@
+# Pruebas del Ejercicio 1: el procesamiento de archivos debe dar lo mismo que las funciones de texto
+
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from nucleo.texto import (
+    OPERACIONES_TEXTO,
+    CountMinSketch,
+    HyperLogLog,
+    Tuberia,
+    contar_palabras,
+    estadisticas_archivo,
+    estadisticas_palabras,
+    invertir_completo,
+    invertir_letras,
+    invertir_palabras,
+    leer_palabras,
+    leer_palabras_al_reves,
+    ordenar_alfabetico,
+    ordenar_externo,
+    procesar_archivo,
+)
+
+# Letras de uno a cuatro bytes en UTF-8 y separadores que str.split() reconoce
+# (el espacio duro y el NEL ocupan dos bytes: la lectura hacia atrás no puede cortar en ellos)
+LETRAS = "abcXYZñé€😀"
+SEPARADORES = [" ", " ", "  ", "\n", "\t", "\r\n", "\u00a0", "\x85"]
+
+def texto_aleatorio(generador, palabras):
+    """Texto de 'palabras' palabras con separadores variados, también al principio y al final"""
+    partes = [generador.choice(SEPARADORES)]
+    for _ in range(palabras):
+        partes.append(''.join(generador.choices(LETRAS, k=generador.randint(1, 8))))
+        partes.append(generador.choice(SEPARADORES))
+    return ''.join(partes)
+
+class PruebasTuberia(unittest.TestCase):
+    def test_igual_que_aplicar_una_a_una(self):
+        generador = random.Random(9)
+        operaciones = list(OPERACIONES_TEXTO)
+        for _ in range(300):
+            cadena = generador.choices(operaciones, k=generador.randint(0, 5))
+            cadena = [op for op in cadena[:-1] if op != "Contar palabras"] + cadena[-1:]
+            tuberia = Tuberia(*cadena)
+            frases = [texto_aleatorio(generador, generador.randint(0, 12)) for _ in range(5)]
+            self.assertEqual(tuberia.aplicar_lote(frases), [tuberia.aplicar_ingenuo(f) for f in frases],
+                             cadena)
+
+    def test_tuberia_vacia(self):
+        # Sin operaciones la frase sale tal cual, con sus espacios y saltos de línea
+        frase = "  hola \n mundo\t"
+        self.assertEqual(Tuberia().aplicar(frase), frase)
+        self.assertEqual(Tuberia().aplicar_lote([frase, ""]), [frase, ""])
+
+    def test_operaciones_no_validas(self):
+        with self.assertRaises(ValueError):
+            Tuberia("No existe")
+        with self.assertRaises(ValueError):
+            Tuberia("Contar palabras", "Invertir palabras")
+
+class PruebaConArchivos(unittest.TestCase):
+    """Crea una carpeta temporal para los archivos de cada prueba"""
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+
+    def escribir(self, texto, nombre="entrada.txt"):
+        ruta = os.path.join(self.carpeta.name, nombre)
+        with open(ruta, 'w', encoding='utf-8', newline='') as f:
+            f.write(texto)
+        return ruta
+
+    def procesar(self, opcion, texto, tamano_bloque):
+        entrada = self.escribir(texto)
+        salida = os.path.join(self.carpeta.name, "salida.txt")
+        procesar_archivo(opcion, entrada, salida, tamano_bloque=tamano_bloque)
+        with open(salida, encoding='utf-8', newline='') as f:
+            return f.read()
+
+class PruebasBloques(PruebaConArchivos):
+    def test_leer_palabras_por_bloques(self):
+        generador = random.Random(1)
+        for _ in range(30):
+            texto = texto_aleatorio(generador, generador.randint(0, 60))
+            ruta = self.escribir(texto)
+            for tamano_bloque in (1, 2, 3, 5, 64):
+                self.assertEqual(list(leer_palabras(ruta, tamano_bloque)), texto.split())
+
+    def test_leer_palabras_al_reves(self):
+        generador = random.Random(3)
+        for _ in range(30):
+            texto = texto_aleatorio(generador, generador.randint(0, 60))
+            ruta = self.escribir(texto)
+            for tamano_bloque in (1, 2, 3, 5, 64):
+                self.assertEqual(list(leer_palabras_al_reves(ruta, tamano_bloque)), texto.split()[::-1])
+
+    def test_operaciones_por_bloques(self):
+        generador = random.Random(2)
+        funciones = {
+            "Invertir palabras": invertir_palabras,
+            "Invertir letras de cada palabra": invertir_letras,
+            "Invertir completamente": invertir_completo,
+            "Contar palabras": contar_palabras,
+        }
+        for _ in range(20):
+            texto = texto_aleatorio(generador, generador.randint(0, 60))
+            for opcion, funcion in funciones.items():
+                for tamano_bloque in (1, 4, 7, 1 << 20):
+                    with self.subTest(opcion=opcion, tamano_bloque=tamano_bloque):
+                        self.assertEqual(self.procesar(opcion, texto, tamano_bloque), funcion(texto))
+
+    def test_archivo_vacio(self):
+        self.assertEqual(self.procesar("Invertir palabras", "", 4), "")
+        self.assertEqual(self.procesar("Contar palabras", " \n ", 4), "Número de palabras: 0")
+
+    def test_opcion_no_disponible(self):
+        with self.assertRaises(ValueError):
+            self.procesar("No existe", "hola", 4)
+
+class PruebasOrdenExterno(PruebaConArchivos):
+    def test_igual_que_ordenar_alfabetico(self):
+        generador = random.Random(4)
+        for _ in range(15):
+            # Pocas palabras distintas y con mayúsculas mezcladas: muchas claves empatadas
+            palabras = [''.join(generador.choices("aAbBñÑ", k=generador.randint(1, 3)))
+                        for _ in range(generador.randint(0, 80))]
+            texto = ' '.join(palabras)
+            ruta = self.escribir(texto)
+            for tamano_tramo in (1, 5, 40, 1 << 20):
+                destino = io.StringIO()
+                ordenar_externo(ruta, destino, tamano_tramo=tamano_tramo, tamano_bloque=3)
+                self.assertEqual(destino.getvalue(), ordenar_alfabetico(texto))
+
+    def test_varios_procesos(self):
+        generador = random.Random(5)
+        texto = texto_aleatorio(generador, 300)
+        destino = io.StringIO()
+        ordenar_externo(self.escribir(texto), destino, tamano_tramo=50, procesos=2)
+        self.assertEqual(destino.getvalue(), ordenar_alfabetico(texto))
+
+    def test_procesar_archivo(self):
+        texto = texto_aleatorio(random.Random(6), 100)
+        self.assertEqual(self.procesar("Ordenar alfabéticamente", texto, 8), ordenar_alfabetico(texto))
+
+class PruebasEstadisticas(PruebaConArchivos):
+    def test_exactas_igual_que_en_memoria(self):
+        generador = random.Random(7)
+        for _ in range(10):
+            texto = texto_aleatorio(generador, generador.randint(0, 200))
+            ruta = self.escribir(texto)
+            esperadas = estadisticas_palabras(texto, top=5)
+            for procesos in (1, 3):
+                with self.subTest(procesos=procesos):
+                    self.assertEqual(estadisticas_archivo(ruta, top=5, procesos=procesos, tamano_bloque=7),
+                                     esperadas)
+
+    def test_aproximadas(self):
+        generador = random.Random(8)
+        palabras = [f"p{generador.randint(0, 3000)}" for _ in range(20_000)]
+        palabras += ["frecuente"] * 500
+        generador.shuffle(palabras)
+        texto = ' '.join(palabras)
+        exactas = estadisticas_palabras(texto)
+        aproximadas = estadisticas_archivo(self.escribir(texto), top=3, procesos=2, aproximado=True)
+        self.assertEqual(aproximadas['total'], exactas['total'])
+        self.assertAlmostEqual(aproximadas['distintas'], exactas['distintas'], delta=exactas['distintas'] * 0.05)
+        self.assertEqual(aproximadas['top'][0][0], "frecuente")
+        for palabra, veces in exactas['frecuencias'].items():
+            self.assertGreaterEqual(aproximadas['frecuencias'][palabra], veces)   # Nunca subestima
+
+    def test_empates_por_palabra(self):
+        # A igual frecuencia las palabras salen en orden alfabético, con o sin aproximación
+        texto = "d c b a z d c b a z z"
+        ruta = self.escribir(texto)
+        esperado = [("z", 3), ("a", 2), ("b", 2)]
+        self.assertEqual(estadisticas_palabras(texto, top=3)['top'], esperado)
+        for procesos in (1, 2):
+            for aproximado in (False, True):
+                with self.subTest(procesos=procesos, aproximado=aproximado):
+                    estadisticas = estadisticas_archivo(ruta, top=3, procesos=procesos, aproximado=aproximado,
+                                                        tamano_bloque=4)
+                    self.assertEqual(estadisticas['top'], esperado)
+
+    def test_top_cero(self):
+        ruta = self.escribir("a b a c")
+        for aproximado in (False, True):
+            self.assertEqual(estadisticas_archivo(ruta, top=0, aproximado=aproximado)['top'], [])
+
+    def test_combinar_estimadores(self):
+        sketch_a, sketch_b, sketch_total = CountMinSketch(), CountMinSketch(), CountMinSketch()
+        hll_a, hll_b, hll_total = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        for i in range(2000):
+            palabra = f"w{i % 700}"
+            sketch, hll = (sketch_a, hll_a) if i % 2 else (sketch_b, hll_b)
+            for destino_sketch, destino_hll in ((sketch, hll), (sketch_total, hll_total)):
+                destino_sketch.agregar(palabra)
+                destino_hll.agregar(palabra)
+        sketch_a.combinar(sketch_b)
+        hll_a.combinar(hll_b)
+        self.assertEqual(sketch_a.tabla, sketch_total.tabla)
+        self.assertEqual(hll_a.registros, hll_total.registros)
+
+if __name__ == "__main__":
+    unittest.main()